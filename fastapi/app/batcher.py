@@ -0,0 +1,127 @@
+# /predict 마이크로 배처: 같은 시나리오의 동시 요청을 짧은 시간 모아 추론 실행기 작업 하나로 한 번에 계산
+#
+# 요청은 이벤트 루프에서 검증(시나리오 결정)만 하고 시나리오별 대기 목록에 들어간다. 첫 요청 후 window가 지나거나
+# max_size건이 모이면 목록 전체를 추론 실행기로 넘겨 predict_proba를 한 번 호출하고(predictor.predict_group),
+# 결과를 각 요청에 돌려준다. 응답/지표는 요청별로 단건 처리와 같고, 실행기가 가득 차면 묶인 요청 모두 503.
+# window가 지났어도 추론 스레드가 모두 바쁘면 실행기 대기열에 작은 배치를 쌓지 않고 목록을 계속 키우다가,
+# 앞선 배치가 끝나 자리가 나면 넘긴다(배처가 넘긴 배치가 하나도 실행 중이 아니면 바로 넘김).
+# window만큼 지연이 더해지므로 동시 요청이 많을 때만 이득이다 (기본 꺼짐, DIABETES_BATCH_WINDOW_MS).
+from __future__ import annotations
+
+import asyncio
+
+from app import metrics, settings
+from app.executors import INFERENCE, BoundedExecutor
+from app.predictor import predict_group, resolve_prediction
+from app.schemas import PredictRequest, PredictResponse
+
+BATCH_SIZE = metrics.histogram(
+    "diabetes_predict_batch_size",
+    "마이크로 배처가 한 번에 추론한 /predict 요청 수",
+    ("scenario",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+_Entry = tuple[PredictRequest, dict[str, float], metrics.StageTimer, asyncio.Future]
+
+
+class MicroBatcher:
+    """시나리오별 대기 목록 + 타이머. 이벤트 루프 스레드에서만 사용"""
+
+    def __init__(self, executor: BoundedExecutor, window_ms: float, max_size: int):
+        self.executor = executor
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_size = max(1, max_size)
+        self._pending: dict[str, list[_Entry]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._ready: list[str] = []  # window가 지났지만 추론 스레드가 없어 기다리는 시나리오 (도착 순)
+        self._tasks: set[asyncio.Task] = set()
+        self._running = 0
+        self.batches = 0
+        self.rows = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_size > 1
+
+    async def predict(self, payload: PredictRequest) -> PredictResponse:
+        timer = metrics.StageTimer()
+        key, user_provided = resolve_prediction(payload)
+        timer.lap("validate")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        group = self._pending.setdefault(key, [])
+        group.append((payload, user_provided, timer, future))
+        if len(group) >= self.max_size:
+            self._dispatch(key)
+        elif len(group) == 1:
+            self._timers[key] = loop.call_later(self.window, self._window_expired, key)
+        return await future
+
+    def _has_capacity(self) -> bool:
+        if self._running == 0:
+            return True
+        stats = self.executor.stats()
+        return stats["running"] + stats["queued"] < stats["workers"]
+
+    def _window_expired(self, key: str) -> None:
+        self._timers.pop(key, None)
+        if self._has_capacity():
+            self._dispatch(key)
+        elif key not in self._ready:
+            self._ready.append(key)
+
+    def _dispatch(self, key: str) -> None:
+        handle = self._timers.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        if key in self._ready:
+            self._ready.remove(key)
+        group = self._pending.pop(key, None)
+        if group:
+            self._running += 1
+            task = asyncio.ensure_future(self._run(key, group))
+            self._tasks.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._running -= 1
+        while self._ready and self._has_capacity():
+            self._dispatch(self._ready[0])
+
+    async def _run(self, key: str, group: list[_Entry]) -> None:
+        for _, _, timer, _ in group:
+            timer.lap("batch_wait")
+        self.batches += 1
+        self.rows += len(group)
+        if metrics.enabled:
+            BATCH_SIZE.observe(len(group), key)
+        try:
+            responses = await self.executor.run(predict_group, key, [entry[:3] for entry in group])
+        except asyncio.CancelledError:
+            for *_, future in group:
+                future.cancel()
+            raise
+        except Exception as e:
+            for *_, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        # 연결이 끊겨 취소된 요청은 건너뜀
+        for (*_, future), response in zip(group, responses):
+            if not future.done():
+                future.set_result(response)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window * 1000.0,
+            "max_size": self.max_size,
+            "batches": self.batches,
+            "rows": self.rows,
+            "pending": sum(len(group) for group in self._pending.values()),
+        }
+
+
+BATCHER = MicroBatcher(INFERENCE, settings.BATCH_WINDOW_MS, settings.BATCH_MAX_SIZE)
@@ -0,0 +1,186 @@
+# 예측 결과 차트(PNG base64) 생성: 미리 띄운 차트 워커 프로세스 풀에 렌더링 위임 + 결과 캐시
+#
+# matplotlib은 스레드 안전하지 않고 렌더링은 CPU를 오래 쓰므로 API 프로세스(GIL)와 분리된 워커 프로세스에서 그린다.
+# 워커는 app.chart_render만 import하고(모델 로더 X), 시작할 때 글꼴 확정 + 피처 중요도 패널을 미리 그려 둔다.
+# 워커가 죽으면 그 요청만 실패(차트 None)하고 다음 요청에서 풀을 다시 만든다.
+# DIABETES_CHART_PROCESSES=0이면 API 프로세스 안에서 같은 코드로 그린다.
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from app import chart_render, metrics, settings
+from app.chart_render import ChartSpec
+from app.chart_svg import render_svg
+from app.model_loader import FEATURE_LABELS
+
+CHART_CACHE_SIZE = 512
+# 요청에서 고를 수 있는 차트 형식 → 응답 필드
+CHART_FIELDS = {"png": "chart_image_base64", "svg": "chart_svg", "spec": "chart_data"}
+
+CHART_FAILURES = metrics.counter(
+    "diabetes_chart_failures_total",
+    "차트 렌더링 실패 수 (timeout: 시간 초과, broken: 워커 프로세스 종료, error: 렌더링 예외)",
+    ("reason",),
+)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_warm_specs: tuple[ChartSpec, ...] = ()
+_in_process_ready = False
+
+
+@lru_cache(maxsize=16)
+def _importances(model) -> tuple[float, ...]:
+    return tuple(float(v) for v in model.feature_importances_)
+
+
+def chart_spec(
+    probability: float,
+    input_values: dict[str, float],
+    model,
+    feature_names: list[str],
+) -> ChartSpec:
+    """차트 입력값 → 워커에 넘길 ChartSpec (모델 객체 대신 라벨/중요도 값만 담음)"""
+    permille = int(round(max(0.0, min(1.0, probability)) * 1000))
+    labels = tuple(FEATURE_LABELS.get(k, k) for k in feature_names)
+    if hasattr(model, "feature_importances_"):
+        # 하단 패널이 입력값과 무관하므로 캐시 키에서 제외
+        return ChartSpec(permille, labels, "importance", _importances(model))
+    return ChartSpec(permille, labels, "input", tuple(float(input_values.get(k, 0.0)) for k in feature_names))
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    if settings.CHART_PROCESSES <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # fork는 API 프로세스의 스레드/락 상태를 복제하므로 spawn으로 깨끗한 프로세스를 띄운다
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.CHART_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=chart_render.init_worker,
+                initargs=(settings.CHART_FONT, _warm_specs),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_in_process(spec: ChartSpec) -> str:
+    global _in_process_ready
+    if not _in_process_ready:
+        chart_render.configure(settings.CHART_FONT)
+        _in_process_ready = True
+    return chart_render.render(spec)
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_chart(spec: ChartSpec) -> str:
+    pool = _get_pool()
+    if pool is None:
+        return _render_in_process(spec)
+    try:
+        return pool.submit(chart_render.render, spec).result(timeout=settings.CHART_TIMEOUT)
+    except FutureTimeoutError:
+        if metrics.enabled:
+            CHART_FAILURES.inc("timeout")
+        raise
+    except BrokenProcessPool:
+        if metrics.enabled:
+            CHART_FAILURES.inc("broken")
+        _discard_pool(pool)
+        raise
+    except Exception:
+        if metrics.enabled:
+            CHART_FAILURES.inc("error")
+        raise
+
+
+def create_chart_base64(
+    probability: float,
+    input_values: dict[str, float],
+    model,
+    feature_names: list[str],
+) -> str:
+    """당뇨/정상 확률 + 피처 중요도(또는 입력값) 차트"""
+    return _render_chart(chart_spec(probability, input_values, model, feature_names))
+
+
+def chart_data(spec: ChartSpec) -> dict:
+    """클라이언트가 직접 그릴 수 있는 차트 값 (chart_format="spec")"""
+    return {
+        "normal_probability": (1000 - spec.permille) / 1000,
+        "diabetes_probability": spec.permille / 1000,
+        "kind": spec.kind,
+        "labels": list(spec.labels),
+        "values": [round(v, 4) for v in spec.values],
+    }
+
+
+def create_chart(
+    chart_format: str,
+    probability: float,
+    input_values: dict[str, float],
+    model,
+    feature_names: list[str],
+) -> str | dict:
+    """chart_format별 차트: png(base64, 차트 워커) / svg(문자열) / spec(값만)"""
+    spec = chart_spec(probability, input_values, model, feature_names)
+    if chart_format == "svg":
+        return render_svg(spec)
+    if chart_format == "spec":
+        return chart_data(spec)
+    return _render_chart(spec)
+
+
+def clear_cache() -> None:
+    """API 프로세스의 결과 캐시 비우기 (워커의 패널 캐시는 유지)"""
+    _render_chart.cache_clear()
+    render_svg.cache_clear()
+
+
+def warm_up(models: list[tuple[object, list[str]]]) -> None:
+    """서버 시작 시 차트 워커를 모두 띄우고 모델별 정적 패널(피처 중요도)을 미리 렌더링"""
+    global _warm_specs
+    _warm_specs = tuple(
+        chart_spec(0.0, {}, model, feature_names)
+        for model, feature_names in models
+        if model is not None and hasattr(model, "feature_importances_")
+    )
+    pool = _get_pool()
+    if pool is None:
+        for spec in _warm_specs:
+            _render_in_process(spec)
+        return
+    # 워커 수만큼 작업을 보내 모두 띄움 (각 워커의 initializer가 글꼴 확정 + 정적 패널 렌더링).
+    # 모델 교체 전부터 떠 있던 워커는 새 모델의 패널을 처음 요청받을 때 그린다.
+    for future in [pool.submit(chart_render.ping) for _ in range(settings.CHART_PROCESSES)]:
+        future.result()
+
+
+def stats() -> dict:
+    pool = _pool
+    return {
+        "processes": settings.CHART_PROCESSES,
+        "running": pool is not None,
+        "cache_entries": _render_chart.cache_info().currsize,
+    }
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
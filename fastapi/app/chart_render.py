@@ -0,0 +1,220 @@
+# 차트 렌더링 (차트 워커 프로세스에서 실행): ChartSpec → PNG base64
+#
+# 워커는 matplotlib을 한 번만 import하고, 한글 글꼴을 한 번 찾아 고정하고, 패널마다 Figure/Canvas를
+# 하나씩 만들어 재사용한다(pyplot 전역 상태를 쓰지 않음). 모델 객체 대신 값만 담은 ChartSpec을 받으므로
+# 워커는 app의 다른 모듈(모델 로더 등)을 import하지 않는다. matplotlib은 처음 그릴 때 import하므로
+# 차트 워커를 쓰는 API 프로세스는 ChartSpec만 쓰고 matplotlib을 import하지 않는다.
+from __future__ import annotations
+
+import base64
+import io
+import os
+import threading
+import warnings
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+CHART_DPI = 150
+PANEL_FIGSIZE = (6, 3.5)  # 상/하단 패널 각각 (합치면 기존 6x7)
+
+# 확률 막대는 표시 정밀도(0.1%) 단위로 양자화해서 캐시 키로 사용
+PROBABILITY_PANEL_CACHE_SIZE = 1024
+INPUT_PANEL_CACHE_SIZE = 1024
+
+# 한글 글꼴 후보 (macOS / Windows / Linux 순). 하나도 없으면 matplotlib 기본 글꼴
+KOREAN_FONTS = (
+    "AppleGothic",
+    "Apple SD Gothic Neo",
+    "Malgun Gothic",
+    "NanumGothic",
+    "NanumBarunGothic",
+    "Noto Sans CJK KR",
+    "Noto Sans KR",
+    "Source Han Sans KR",
+    "UnDotum",
+    "Baekmuk Gulim",
+)
+FALLBACK_FONT = "DejaVu Sans"
+
+
+class ChartSpec(NamedTuple):
+    """차트 한 장을 그리는 데 필요한 값 (프로세스 간 전달 + 캐시 키)
+
+    kind: "importance"(하단에 피처 중요도) 또는 "input"(하단에 입력값)
+    """
+    permille: int
+    labels: tuple[str, ...]
+    kind: str
+    values: tuple[float, ...]
+
+
+@lru_cache(maxsize=None)
+def resolve_font(preferred: str = "") -> str:
+    """설치된 글꼴 중 preferred → KOREAN_FONTS 순으로 첫 번째 (프로세스당 한 번 검색)"""
+    from matplotlib import font_manager
+
+    available = {f.name for f in font_manager.fontManager.ttflist}
+    for name in ((preferred,) if preferred else ()) + KOREAN_FONTS:
+        if name in available:
+            return name
+    return FALLBACK_FONT
+
+
+def configure(preferred_font: str = "") -> str:
+    """글꼴 설정. 한글 글꼴이 없으면 글리프 누락 경고를 매번 내지 않도록 한 번만 알림"""
+    import matplotlib
+
+    font = resolve_font(preferred_font)
+    matplotlib.rcParams["font.family"] = font
+    matplotlib.rcParams["axes.unicode_minus"] = False
+    if font == FALLBACK_FONT:
+        warnings.filterwarnings("ignore", message=r"Glyph \d+ .* missing from font", category=UserWarning)
+    return font
+
+
+class _Panel:
+    """재사용하는 Figure + Agg Canvas (그릴 때마다 clear)"""
+
+    def __init__(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=PANEL_FIGSIZE, dpi=CHART_DPI)
+        FigureCanvasAgg(self.fig)
+
+    def axes(self):
+        self.fig.clear()
+        return self.fig.add_subplot()
+
+    def to_rgba(self) -> np.ndarray:
+        self.fig.tight_layout()
+        self.fig.canvas.draw()
+        rgba = np.asarray(self.fig.canvas.buffer_rgba()).copy()
+        rgba.setflags(write=False)  # 캐시 공유 배열
+        return rgba
+
+
+_panel: _Panel | None = None
+# 같은 프로세스에서 여러 스레드가 그리는 경우(차트 프로세스 0개 설정) Figure 재사용을 직렬화
+_lock = threading.RLock()
+
+
+def _get_panel() -> _Panel:
+    global _panel
+    if _panel is None:
+        _panel = _Panel()
+    return _panel
+
+
+@lru_cache(maxsize=PROBABILITY_PANEL_CACHE_SIZE)
+def _probability_panel(permille: int) -> np.ndarray:
+    """상단: 당뇨/정상 확률 바 차트"""
+    panel = _get_panel()
+    ax1 = panel.axes()
+    diabetes_prob = permille / 1000.0
+    normal_prob = 1.0 - diabetes_prob
+    labels = ["정상 가능성", "당뇨 가능성"]
+    values = [normal_prob, diabetes_prob]
+    colors = ["#4CAF50", "#E53935"]
+
+    bars = ax1.bar(labels, values, color=colors)
+    ax1.set_ylim(0, 1)
+    ax1.set_ylabel("확률")
+    ax1.set_title("당뇨 예측 결과 (ML 모델)")
+
+    for bar, value in zip(bars, values):
+        ax1.text(
+            bar.get_x() + bar.get_width() / 2,
+            value + 0.02,
+            f"{value * 100:.1f}%",
+            ha="center",
+            va="bottom",
+            fontsize=11,
+        )
+    return panel.to_rgba()
+
+
+@lru_cache(maxsize=16)
+def _importance_panel(chart_labels: tuple[str, ...], importances: tuple[float, ...]) -> np.ndarray:
+    """하단: 피처 중요도 (모델에만 의존하므로 모델당 1회 렌더링)"""
+    panel = _get_panel()
+    ax2 = panel.axes()
+    imp_colors = [
+        "#1976D2" if imp < 0.1 else "#FF9800" if imp < 0.2 else "#E53935"
+        for imp in importances
+    ]
+    bars2 = ax2.barh(chart_labels, importances, color=imp_colors)
+    ax2.set_xlim(0, max(importances) * 1.3)
+    ax2.set_xlabel("중요도")
+    ax2.set_title("피처 중요도 (Feature Importance)")
+    ax2.invert_yaxis()
+    for bar, imp in zip(bars2, importances):
+        ax2.text(
+            imp + 0.005,
+            bar.get_y() + bar.get_height() / 2,
+            f"{imp:.3f}",
+            ha="left",
+            va="center",
+            fontsize=9,
+        )
+    return panel.to_rgba()
+
+
+@lru_cache(maxsize=INPUT_PANEL_CACHE_SIZE)
+def _input_panel(chart_labels: tuple[str, ...], input_vals: tuple[float, ...]) -> np.ndarray:
+    """하단: 입력 항목별 수치 (피처 중요도가 없는 모델)"""
+    panel = _get_panel()
+    ax2 = panel.axes()
+    bar_colors = ["#1976D2" if v > 0 else "#9E9E9E" for v in input_vals]
+    bars2 = ax2.barh(chart_labels, input_vals, color=bar_colors)
+    ax2.set_xlabel("입력값")
+    ax2.set_title("입력 항목별 수치")
+    ax2.invert_yaxis()
+    for bar, val in zip(bars2, input_vals):
+        if val > 0:
+            ax2.text(
+                val + 0.5,
+                bar.get_y() + bar.get_height() / 2,
+                f"{val:.1f}",
+                ha="left",
+                va="center",
+                fontsize=9,
+            )
+    return panel.to_rgba()
+
+
+def render(spec: ChartSpec) -> str:
+    """ChartSpec → 상단(확률) + 하단(중요도/입력값) PNG base64"""
+    import matplotlib.image as mpimg
+
+    with _lock:
+        top = _probability_panel(spec.permille)
+        if spec.kind == "importance":
+            bottom = _importance_panel(spec.labels, spec.values)
+        else:
+            bottom = _input_panel(spec.labels, spec.values)
+
+    buf = io.BytesIO()
+    mpimg.imsave(buf, np.vstack([top, bottom]), format="png", dpi=CHART_DPI)
+    return base64.b64encode(buf.getvalue()).decode("utf-8")
+
+
+def clear_caches() -> None:
+    _probability_panel.cache_clear()
+    _importance_panel.cache_clear()
+    _input_panel.cache_clear()
+
+
+def init_worker(preferred_font: str = "", warm_specs: tuple[ChartSpec, ...] = ()) -> None:
+    """워커 프로세스 시작 시 1회: 글꼴 확정 + Figure 생성 + 정적 패널(피처 중요도) 미리 렌더링"""
+    configure(preferred_font)
+    _probability_panel(0)  # 글꼴 로드/텍스트 레이아웃 캐시 준비
+    for spec in warm_specs:
+        render(spec)
+
+
+def ping() -> int:
+    """워커 기동 확인용 (미리 띄우기)"""
+    return os.getpid()
@@ -0,0 +1,90 @@
+# 예측 결과 차트를 SVG 문자열로 생성 (matplotlib 없이 템플릿 채우기, PNG와 같은 배치/색상)
+#
+# 글자는 클라이언트가 가진 한글 글꼴로 그리므로 서버에 한글 글꼴이 없어도 된다.
+from __future__ import annotations
+
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from app.chart_render import ChartSpec
+
+SVG_CACHE_SIZE = 1024
+
+WIDTH = 600
+PANEL_HEIGHT = 350  # PNG 패널(6x3.5in)과 같은 비율
+FONT_FAMILY = "AppleGothic, 'Apple SD Gothic Neo', 'Malgun Gothic', NanumGothic, 'Noto Sans KR', sans-serif"
+
+# 상단 패널 막대 영역
+TOP_PLOT = (70, 40, 560, 300)  # left, top, right, bottom
+# 하단 패널 막대 영역 (왼쪽은 항목 이름)
+BOTTOM_PLOT = (130, PANEL_HEIGHT + 40, 560, PANEL_HEIGHT + 300)
+
+
+def _text(x: float, y: float, text: str, size: int = 12, anchor: str = "middle", extra: str = "") -> str:
+    return f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" text-anchor="{anchor}"{extra}>{escape(text)}</text>'
+
+
+def _importance_color(imp: float) -> str:
+    return "#1976D2" if imp < 0.1 else "#FF9800" if imp < 0.2 else "#E53935"
+
+
+def _probability_panel(permille: int) -> list[str]:
+    left, top, right, bottom = TOP_PLOT
+    height = bottom - top
+    diabetes_prob = permille / 1000.0
+    bars = (("정상 가능성", 1.0 - diabetes_prob, "#4CAF50"), ("당뇨 가능성", diabetes_prob, "#E53935"))
+    slot = (right - left) / len(bars)
+    parts = [
+        _text(WIDTH / 2, 24, "당뇨 예측 결과 (ML 모델)", 15),
+        _text(18, (top + bottom) / 2, "확률", 12, extra=f' transform="rotate(-90 18 {(top + bottom) / 2:.1f})"'),
+        f'<path d="M{left} {top}V{bottom}H{right}" fill="none" stroke="#000"/>',
+    ]
+    for tick in (0.0, 0.2, 0.4, 0.6, 0.8, 1.0):
+        y = bottom - tick * height
+        parts.append(_text(left - 6, y + 4, f"{tick:.1f}", 10, "end"))
+    for i, (label, value, color) in enumerate(bars):
+        x = left + slot * i + slot * 0.1
+        y = bottom - value * height
+        parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{slot * 0.8:.1f}" height="{value * height:.1f}" fill="{color}"/>')
+        parts.append(_text(x + slot * 0.4, y - 6, f"{value * 100:.1f}%", 13))
+        parts.append(_text(x + slot * 0.4, bottom + 18, label, 12))
+    return parts
+
+
+def _bar_panel(spec: ChartSpec) -> list[str]:
+    left, top, right, bottom = BOTTOM_PLOT
+    if spec.kind == "importance":
+        title, xlabel = "피처 중요도 (Feature Importance)", "중요도"
+        x_max = max(spec.values) * 1.3 if spec.values else 1.0
+        colors = [_importance_color(v) for v in spec.values]
+        texts = [f"{v:.3f}" for v in spec.values]
+    else:
+        title, xlabel = "입력 항목별 수치", "입력값"
+        x_max = max(max(spec.values, default=0.0) * 1.15, 1.0)
+        colors = ["#1976D2" if v > 0 else "#9E9E9E" for v in spec.values]
+        texts = [f"{v:.1f}" if v > 0 else "" for v in spec.values]
+    slot = (bottom - top) / max(len(spec.values), 1)
+    scale = (right - left) / x_max
+    parts = [
+        _text(WIDTH / 2, PANEL_HEIGHT + 24, title, 15),
+        _text((left + right) / 2, bottom + 30, xlabel, 12),
+        f'<path d="M{left} {top}V{bottom}H{right}" fill="none" stroke="#000"/>',
+    ]
+    for i, (label, value, color, text) in enumerate(zip(spec.labels, spec.values, colors, texts)):
+        y = top + slot * i + slot * 0.1
+        width = max(value, 0.0) * scale
+        parts.append(f'<rect x="{left}" y="{y:.1f}" width="{width:.1f}" height="{slot * 0.8:.1f}" fill="{color}"/>')
+        parts.append(_text(left - 6, y + slot * 0.4 + 4, label, 12, "end"))
+        if text:
+            parts.append(_text(left + width + 4, y + slot * 0.4 + 4, text, 10, "start"))
+    return parts
+
+
+@lru_cache(maxsize=SVG_CACHE_SIZE)
+def render_svg(spec: ChartSpec) -> str:
+    """ChartSpec → 상단(확률) + 하단(중요도/입력값) SVG"""
+    body = "".join(_probability_panel(spec.permille) + _bar_panel(spec))
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {PANEL_HEIGHT * 2}" '
+        f'font-family="{FONT_FAMILY}"><rect width="100%" height="100%" fill="#fff"/>{body}</svg>'
+    )
@@ -0,0 +1,149 @@
+# 학습/검증 공용 데이터셋 준비: 원본 CSV → 정리된 컬럼 배열 + 고정 split 인덱스 + 원본 해시를 무압축 npz 하나로 저장
+#
+# 학습(scripts/train_four_scenarios.py)과 검증(scripts/validate_four_scenarios.py, 핫 리로드)이 각자 CSV를 파싱하고
+# random_state=42 split을 다시 계산하는 대신 같은 파일의 같은 행 인덱스를 쓴다. npz는 메모리 매핑으로 읽으므로
+# 행 수가 커져도 로드는 ms 단위이고, 원본 CSV가 바뀌면(크기/수정 시각 → 내용 sha256 확인) 다시 준비한다.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+from app.model_loader import read_npz
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DATASET_FORMAT = 1
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "dataset"
+TARGET_COLUMN = "당뇨"
+# 0이 측정 누락을 뜻하는 컬럼 (NaN으로 바꿔 학습 시 KNN 보간 대상)
+ZERO_AS_MISSING = ("혈당", "혈압", "피부두께", "인슐린", "BMI")
+# 학습 스크립트의 split: test 20% → 나머지의 25%를 valid (train 60 / valid 20 / test 20), 타깃 층화
+SPLIT_SEED = 42
+TEST_SIZE = 0.2
+VALID_SIZE = 0.25
+SPLITS = ("train", "valid", "test")
+
+
+class PreparedDataset(NamedTuple):
+    frame: pd.DataFrame  # 타깃 포함 정리된 전체 데이터 (0 → NaN)
+    target: pd.Series
+    splits: dict[str, np.ndarray]  # train/valid/test 행 위치
+    source_sha256: str
+    path: Path
+
+    def rows(self, split: str) -> tuple[pd.DataFrame, pd.Series]:
+        positions = self.splits[split]
+        return self.frame.iloc[positions], self.target.iloc[positions]
+
+
+def default_cache_path(csv_path: Path) -> Path:
+    return DEFAULT_CACHE_DIR / f"{Path(csv_path).stem}.npz"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def split_indices(target: np.ndarray) -> dict[str, np.ndarray]:
+    """층화 split 행 위치. 피처 컬럼과 무관(stratify=타깃)하므로 모든 시나리오가 공유"""
+    from sklearn.model_selection import train_test_split
+
+    positions = np.arange(len(target))
+    temp, test, y_temp, _y_test = train_test_split(
+        positions, target, test_size=TEST_SIZE, stratify=target, random_state=SPLIT_SEED
+    )
+    train, valid = train_test_split(temp, test_size=VALID_SIZE, stratify=y_temp, random_state=SPLIT_SEED)
+    return {"train": train, "valid": valid, "test": test}
+
+
+def _source_stat(csv_path: Path) -> dict:
+    stat = csv_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def prepare_dataset(csv_path: Path, out: Path | None = None) -> Path:
+    """CSV를 파싱·정리하고 split을 계산해 npz로 저장(임시 파일 → 교체)하고 경로를 돌려준다"""
+    import pandas as pd
+
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV 파일이 없습니다: {csv_path}")
+    out = Path(out) if out is not None else default_cache_path(csv_path)
+    source = {"path": str(csv_path.resolve()), "sha256": file_sha256(csv_path), **_source_stat(csv_path)}
+    df = pd.read_csv(csv_path)
+    if TARGET_COLUMN not in df.columns:
+        raise ValueError(f"CSV에 타깃 컬럼 '{TARGET_COLUMN}'가 없습니다.")
+    for c in ZERO_AS_MISSING:
+        if c in df.columns:
+            df[c] = df[c].replace(0, np.nan)
+
+    target = df[TARGET_COLUMN].to_numpy()
+    columns = [c for c in df.columns if c != TARGET_COLUMN]
+    meta = {"format": DATASET_FORMAT, "columns": columns, "rows": len(df), "source": source}
+    arrays = {
+        "meta": np.array(json.dumps(meta, ensure_ascii=False)),
+        "target": target,
+        **{f"col{i}": df[c].to_numpy(dtype=float) for i, c in enumerate(columns)},
+        **{f"split/{name}": rows for name, rows in split_indices(target).items()},
+    }
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp.npz")
+    np.savez(tmp, **arrays)
+    os.replace(tmp, out)
+    return out
+
+
+def _is_current(meta: dict, csv_path: Path) -> bool:
+    """저장된 원본 정보와 CSV 비교: 크기/수정 시각이 같으면 그대로, 다르면 내용 해시로 판정"""
+    if meta.get("format") != DATASET_FORMAT:
+        return False
+    source = meta["source"]
+    if _source_stat(csv_path) == {"size": source["size"], "mtime_ns": source["mtime_ns"]}:
+        return True
+    return file_sha256(csv_path) == source["sha256"]
+
+
+def load_prepared(csv_path: Path | None, cache_path: Path | None = None, rebuild: bool = False) -> PreparedDataset:
+    """준비된 데이터셋 로드. 없거나 원본 CSV가 바뀌었으면 다시 준비 (CSV가 없으면 준비된 파일을 확인 없이 사용)"""
+    import pandas as pd
+
+    if cache_path is None:
+        if csv_path is None:
+            raise ValueError("CSV 경로 또는 준비된 데이터셋 경로가 필요합니다.")
+        cache_path = default_cache_path(csv_path)
+    cache_path = Path(cache_path)
+    has_csv = csv_path is not None and Path(csv_path).exists()
+    arrays = read_npz(cache_path, use_mmap=True) if cache_path.exists() and not rebuild else None
+    if arrays is not None and has_csv and not _is_current(json.loads(str(arrays["meta"])), Path(csv_path)):
+        print(f"[dataset] 원본 CSV가 바뀌어 다시 준비합니다: {csv_path}")
+        arrays = None
+    if arrays is None:
+        if not has_csv:
+            raise FileNotFoundError(f"CSV 파일이 없습니다: {csv_path}")
+        started = time.perf_counter()
+        prepare_dataset(Path(csv_path), cache_path)
+        print(f"[dataset] 준비 완료: {cache_path} ({time.perf_counter() - started:.2f}s)")
+        arrays = read_npz(cache_path, use_mmap=True)
+
+    meta = json.loads(str(arrays["meta"]))
+    frame = pd.DataFrame({c: arrays[f"col{i}"] for i, c in enumerate(meta["columns"])}, copy=False)
+    target = pd.Series(arrays["target"], name=TARGET_COLUMN, copy=False)
+    frame[TARGET_COLUMN] = target
+    return PreparedDataset(
+        frame=frame,
+        target=target,
+        splits={name: arrays[f"split/{name}"] for name in SPLITS},
+        source_sha256=meta["source"]["sha256"],
+        path=cache_path,
+    )
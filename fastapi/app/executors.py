@@ -0,0 +1,118 @@
+# 요청 스레드와 분리된 CPU 작업용 실행기 (추론 / 차트), 대기열 상한 + 초과 시 503 Retry-After
+#
+# async 핸들러는 이벤트 루프를 막지 않도록 작업을 여기로 넘긴다. 실행기마다 스레드 수와 대기열 크기를
+# 따로 두므로 차트 렌더링이 몰려도 추론 대기열은 영향을 받지 않고, 지오코딩은 이벤트 루프의 비동기 I/O로만 처리된다.
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
+
+from app import metrics, settings
+
+T = TypeVar("T")
+
+EXECUTOR_REJECTED = metrics.counter(
+    "diabetes_executor_rejected_total",
+    "대기열이 가득 차 503으로 거절한 작업 수",
+    ("executor",),
+)
+EXECUTOR_QUEUE_WAIT = metrics.histogram(
+    "diabetes_executor_queue_wait_seconds",
+    "작업이 대기열에서 실행을 기다린 시간",
+    ("executor",),
+)
+
+
+class BoundedExecutor:
+    """스레드 풀 + 진행 중(실행 + 대기) 작업 수 상한
+
+    상한(workers + queue_size)에 도달하면 대기열에 넣지 않고 바로 HTTPException(503, Retry-After)을 던진다.
+    요청이 취소되어도(클라이언트 연결 끊김) 이미 시작한 작업이 끝날 때 자리를 반환한다.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int, retry_after: int = settings.BUSY_RETRY_AFTER):
+        self.name = name
+        self.workers = max(1, workers)
+        self.limit = self.workers + max(0, queue_size)
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.limit:
+                if metrics.enabled:
+                    EXECUTOR_REJECTED.inc(self.name)
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"서버가 요청을 처리 중입니다({self.name}). 잠시 후 다시 시도해 주세요.",
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            self._pending += 1
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _call(self, submitted: float, fn: Callable[..., T], args: tuple) -> T:
+        if metrics.enabled:
+            EXECUTOR_QUEUE_WAIT.observe(time.perf_counter() - submitted, self.name)
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        self._acquire()
+        try:
+            future = self._pool.submit(self._call, time.perf_counter(), fn, args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "limit": self.limit,
+                "running": self._running,
+                "queued": self._pending - self._running,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+INFERENCE = BoundedExecutor("inference", settings.INFERENCE_WORKERS, settings.INFERENCE_QUEUE)
+# 실제 렌더링은 차트 워커 프로세스에서 하고, 이 스레드들은 결과를 기다리기만 한다 (기본: 워커 프로세스 수)
+CHARTS = BoundedExecutor("chart", settings.CHART_WORKERS, settings.CHART_QUEUE)
+
+metrics.gauge(
+    "diabetes_executor_running",
+    "실행 중인 작업 수",
+    lambda: {(e.name,): e.stats()["running"] for e in (INFERENCE, CHARTS)},
+    ("executor",),
+)
+metrics.gauge(
+    "diabetes_executor_queued",
+    "대기 중인 작업 수",
+    lambda: {(e.name,): e.stats()["queued"] for e in (INFERENCE, CHARTS)},
+    ("executor",),
+)
+
+
+def shutdown() -> None:
+    INFERENCE.shutdown()
+    CHARTS.shutdown()
@@ -0,0 +1,412 @@
+# 고속 추론 경로: 로드 시점에 sklearn 아티팩트의 학습 파라미터를 NumPy 배열로 추출하고,
+# 요청 시에는 DataFrame 생성/sklearn 입력검증 없이 순수 NumPy로 확률을 계산한다.
+#
+# 추출한 배열은 .npz 번들(scripts/compile_artifacts.py)로 저장해 두면 다음 기동 시 sklearn/joblib 없이
+# 바로 복원된다. sklearn은 아티팩트에서 직접 컴파일할 때만 import한다.
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+from scipy.special import expit
+
+from app.grading import N_GRADES, grade_matrix
+from app.imputation import KNNImputeIndex, supports
+from app.model_loader import FEATURE_LABELS, FEATURE_RANGES
+from app.result_cache import ResultCache
+
+
+def _is_binary(model) -> bool:
+    classes = getattr(model, "classes_", None)
+    return classes is not None and len(classes) == 2
+
+
+class CompiledLogisticRegression:
+    """이진 LR: expit(X @ coef + intercept)"""
+
+    def __init__(self, coef: np.ndarray, intercept: float):
+        self.coef = np.asarray(coef, dtype=float)
+        self.intercept = float(intercept)
+
+    @classmethod
+    def from_model(cls, model) -> CompiledLogisticRegression:
+        return cls(np.array(model.coef_[0], dtype=float), model.intercept_[0])
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return expit(X @ self.coef + self.intercept)
+
+
+class CompiledSVC:
+    """이진 SVC(probability=True): 커널 결정값 → libsvm Platt 확률"""
+
+    # libsvm predict_probability와 동일한 상수
+    MIN_PROB = 1e-7
+    MAX_ITER = 100
+    EPS = 0.005 / 2
+
+    # 번들에 저장하는 스칼라 파라미터
+    PARAMS = ("intercept", "gamma", "coef0", "degree", "prob_a", "prob_b")
+
+    def __init__(
+        self,
+        kernel: str,
+        support_vectors: np.ndarray,
+        dual_coef: np.ndarray,
+        intercept: float,
+        gamma: float,
+        coef0: float,
+        degree: int,
+        prob_a: float,
+        prob_b: float,
+    ):
+        self.kernel = str(kernel)
+        # 번들의 읽기 전용(메모리 매핑) 배열을 복사하지 않고 그대로 사용
+        self.support_vectors = np.asarray(support_vectors, dtype=float)
+        self.sv_sq_norms = (self.support_vectors ** 2).sum(axis=1)
+        self.dual_coef = np.asarray(dual_coef, dtype=float)
+        self.intercept = float(intercept)
+        self.gamma = float(gamma)
+        self.coef0 = float(coef0)
+        self.degree = int(degree)
+        self.prob_a = float(prob_a)
+        self.prob_b = float(prob_b)
+
+    @classmethod
+    def from_model(cls, model) -> CompiledSVC:
+        # libsvm 내부 부호(sklearn 공개 dual_coef_/intercept_의 반대)
+        return cls(
+            model.kernel,
+            np.array(model.support_vectors_, dtype=float),
+            -np.asarray(model.dual_coef_[0], dtype=float),
+            -float(model.intercept_[0]),
+            model._gamma,
+            model.coef0,
+            model.degree,
+            model.probA_[0],
+            model.probB_[0],
+        )
+
+    def _kernel(self, X: np.ndarray) -> np.ndarray:
+        dot = X @ self.support_vectors.T
+        if self.kernel == "linear":
+            return dot
+        if self.kernel == "poly":
+            return (self.gamma * dot + self.coef0) ** self.degree
+        # rbf
+        sq_dist = (X ** 2).sum(axis=1)[:, None] + self.sv_sq_norms[None, :] - 2.0 * dot
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        return np.exp(-self.gamma * sq_dist)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        dec = self._kernel(X) @ self.dual_coef + self.intercept
+
+        # sigmoid_predict: libsvm의 수치 안정 형태 그대로
+        f_ab = dec * self.prob_a + self.prob_b
+        e = np.exp(-np.abs(f_ab))
+        r01 = np.where(f_ab >= 0, e / (1.0 + e), 1.0 / (1.0 + e))
+        r01 = np.clip(r01, self.MIN_PROB, 1.0 - self.MIN_PROB)
+        r10 = 1.0 - r01
+
+        # multiclass_probability (k=2) 반복해를 행 단위로 벡터화
+        n = len(X)
+        q = np.empty((n, 2, 2))
+        q[:, 0, 0] = r10 * r10
+        q[:, 1, 1] = r01 * r01
+        q[:, 0, 1] = q[:, 1, 0] = -r10 * r01
+        p = np.full((n, 2), 0.5)
+        active = np.ones(n, dtype=bool)
+        for _ in range(self.MAX_ITER):
+            qp = np.einsum("nij,nj->ni", q, p)
+            pqp = (p * qp).sum(axis=1)
+            active &= np.abs(qp - pqp[:, None]).max(axis=1) >= self.EPS
+            if not active.any():
+                break
+            a = active
+            pa, qpa, pqpa, qa = p[a], qp[a], pqp[a], q[a]
+            for t in range(2):
+                diff = (-qpa[:, t] + pqpa) / qa[:, t, t]
+                pa[:, t] += diff
+                pqpa = (pqpa + diff * (diff * qa[:, t, t] + 2 * qpa[:, t])) / (1 + diff) / (1 + diff)
+                qpa = (qpa + diff[:, None] * qa[:, t, :]) / (1 + diff)[:, None]
+                pa /= (1 + diff)[:, None]
+            p[a] = pa
+        return p[:, 1]
+
+
+class CompiledSoftVoting:
+    """soft voting: 멤버 확률의 가중 평균"""
+
+    def __init__(self, members: list, weights):
+        self.members = members
+        self.weights = None if weights is None else np.asarray(weights, dtype=float)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        probas = np.stack([m.predict_proba(X) for m in self.members])
+        return np.average(probas, axis=0, weights=self.weights)
+
+
+def compile_estimator(model):
+    """지원하는 이진 분류기면 NumPy 버전으로 변환, 아니면 None"""
+    from sklearn.ensemble import VotingClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.svm import SVC
+
+    if not _is_binary(model):
+        return None
+    if isinstance(model, LogisticRegression):
+        return CompiledLogisticRegression.from_model(model)
+    if isinstance(model, SVC):
+        if not model.probability or model.kernel not in ("rbf", "linear", "poly"):
+            return None
+        return CompiledSVC.from_model(model)
+    if isinstance(model, VotingClassifier):
+        if model.voting != "soft":
+            return None
+        members = [compile_estimator(est) for est in model.estimators_]
+        if any(m is None for m in members):
+            return None
+        return CompiledSoftVoting(members, model._weights_not_none)
+    return None
+
+
+class CompiledDetailScenario:
+    """상세(A/B): 0→NaN → IQR clip → 표준화 → (결측 행만) KNN 보간 → 분류기
+
+    KNN 보간은 가능하면 KNNImputeIndex(패턴별 KD-tree)를 사용하고, 한 항목만 입력된 경우는
+    FEATURE_RANGES의 정수 입력 격자에 대한 결과표를 미리 계산해 둔다.
+    clip까지 적용한 행(= 모델 입력이 같은 요청)의 확률은 ResultCache에 보관해 다시 계산하지 않는다.
+    """
+
+    def __init__(
+        self,
+        low: np.ndarray,
+        up: np.ndarray,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        imputer,
+        estimator,
+        cache: ResultCache | None = None,
+    ):
+        self.low = np.asarray(low, dtype=float)
+        self.up = np.asarray(up, dtype=float)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+        self.imputer = imputer
+        self.estimator = estimator
+        self.cache = cache if cache is not None else ResultCache("", max_size=0)
+
+    @classmethod
+    def from_artifacts(
+        cls,
+        feature_names: list[str],
+        estimator,
+        scaler,
+        imputer,
+        clip_bounds,
+        cache: ResultCache | None = None,
+    ) -> CompiledDetailScenario:
+        cols_kor = [FEATURE_LABELS[f] for f in feature_names]
+        clip_bounds = clip_bounds if isinstance(clip_bounds, dict) else {}
+        low = np.array([clip_bounds.get(c, (-np.inf, np.inf))[0] for c in cols_kor], dtype=float)
+        up = np.array([clip_bounds.get(c, (-np.inf, np.inf))[1] for c in cols_kor], dtype=float)
+        n = len(feature_names)
+        mean = np.zeros(n) if scaler.mean_ is None else scaler.mean_
+        scale = np.ones(n) if scaler.scale_ is None else scaler.scale_
+        index = KNNImputeIndex.from_imputer(imputer) if supports(imputer) else imputer
+        compiled = cls(low, up, mean, scale, index, estimator, cache)
+        if isinstance(index, KNNImputeIndex):
+            for j, f in enumerate(feature_names):
+                low_f, high_f = FEATURE_RANGES[f]
+                grid = np.arange(np.ceil(low_f), np.floor(high_f) + 1.0)
+                grid = np.clip(grid[grid != 0.0], compiled.low[j], compiled.up[j])
+                grid -= compiled.mean[j]
+                grid /= compiled.scale[j]
+                index.precompute(j, grid)
+        return compiled
+
+    def predict_proba(self, raw: np.ndarray, cached: bool = True) -> np.ndarray:
+        x = np.array(raw, dtype=float)
+        # 0과 NaN(CSV 빈 칸 등)을 같은 결측 표현으로 맞춰 캐시 키를 정규화
+        x[np.isnan(x) | (x == 0.0)] = np.nan
+        np.clip(x, self.low, self.up, out=x)
+        if not (cached and self.cache.enabled):
+            return self._predict_clipped(x)
+
+        keys = [row.tobytes() for row in x]
+        found = self.cache.get_many(keys)
+        miss = [i for i, value in enumerate(found) if value is None]
+        probs = np.array([0.0 if value is None else value for value in found])
+        if miss:
+            computed = self._predict_clipped(x[miss])
+            probs[miss] = computed
+            self.cache.set_many([(keys[i], p) for i, p in zip(miss, computed.tolist())])
+        return probs
+
+    def _predict_clipped(self, x: np.ndarray) -> np.ndarray:
+        x -= self.mean
+        x /= self.scale
+        missing = np.isnan(x).any(axis=1)
+        if missing.any():
+            x[missing] = self.imputer.transform(x[missing])
+        return self.estimator.predict_proba(x)
+
+
+class CompiledSimpleScenario:
+    """간편(C/C_NS): 분위수 등급화 → 등급 조합 전체(4^n)를 미리 계산한 확률표 조회
+
+    입력 공간이 유한하므로 앙상블 구성과 무관하게 sklearn 결과와 정확히 일치한다.
+    """
+
+    def __init__(self, quantiles: np.ndarray, table: np.ndarray):
+        self.quantiles = np.asarray(quantiles, dtype=float)
+        self.table = np.asarray(table, dtype=float)
+        n = len(self.quantiles)
+        self.strides = N_GRADES ** np.arange(n - 1, -1, -1)
+
+    @classmethod
+    def from_model(cls, feature_names: list[str], model, quantiles: dict[str, list[float]]) -> CompiledSimpleScenario:
+        import pandas as pd
+
+        cols_kor = [FEATURE_LABELS[f] for f in feature_names]
+        n = len(cols_kor)
+        grid = np.indices((N_GRADES,) * n).reshape(n, -1).T + 1.0
+        table = model.predict_proba(pd.DataFrame(grid, columns=cols_kor))[:, 1]
+        return cls([quantiles[c] for c in cols_kor], table)
+
+    def predict_proba(self, raw: np.ndarray, cached: bool = True) -> np.ndarray:
+        # 확률표 자체가 전체 입력 공간의 결과이므로 cached는 무시
+        return self.table[(grade_matrix(raw, self.quantiles) - 1) @ self.strides]
+
+
+def compile_scenario(cfg: dict, name: str = ""):
+    """predictor의 시나리오 설정 → 고속 추론 객체. 지원하지 않으면 None (sklearn 경로 사용)
+
+    name은 결과 캐시 지표 레이블 (시나리오 키).
+    """
+    from sklearn.impute import KNNImputer
+    from sklearn.preprocessing import StandardScaler
+
+    feature_names = cfg["feature_names"]
+    model = cfg["model"]
+    if model is None:
+        return None
+    if cfg["mode"] == "simple":
+        if not cfg.get("quantiles"):
+            return None
+        return CompiledSimpleScenario.from_model(feature_names, model, cfg["quantiles"])
+
+    scaler = cfg.get("scaler")
+    imputer = cfg.get("imputer")
+    if not (isinstance(scaler, StandardScaler) and isinstance(imputer, KNNImputer)):
+        return None
+    estimator = compile_estimator(model)
+    if estimator is None:
+        return None
+    return CompiledDetailScenario.from_artifacts(
+        feature_names, estimator, scaler, imputer, cfg.get("clip_bounds"), cache=ResultCache(name)
+    )
+
+
+# ---------------------------------------------------------------------------
+# 컴파일 번들 (.npz): "시나리오/경로" 이름의 평평한 배열 모음. 문자열은 0차원 배열로 저장
+# ---------------------------------------------------------------------------
+
+def _estimator_arrays(estimator, prefix: str) -> dict[str, np.ndarray]:
+    if isinstance(estimator, CompiledLogisticRegression):
+        return {
+            f"{prefix}/type": np.array("lr"),
+            f"{prefix}/coef": estimator.coef,
+            f"{prefix}/intercept": np.array(estimator.intercept),
+        }
+    if isinstance(estimator, CompiledSVC):
+        arrays = {
+            f"{prefix}/type": np.array("svc"),
+            f"{prefix}/kernel": np.array(estimator.kernel),
+            f"{prefix}/support_vectors": estimator.support_vectors,
+            f"{prefix}/dual_coef": estimator.dual_coef,
+        }
+        arrays.update({f"{prefix}/{p}": np.array(getattr(estimator, p)) for p in CompiledSVC.PARAMS})
+        return arrays
+    arrays = {
+        f"{prefix}/type": np.array("voting"),
+        f"{prefix}/n_members": np.array(len(estimator.members)),
+    }
+    if estimator.weights is not None:
+        arrays[f"{prefix}/weights"] = estimator.weights
+    for i, member in enumerate(estimator.members):
+        arrays.update(_estimator_arrays(member, f"{prefix}/{i}"))
+    return arrays
+
+
+def _load_estimator(arrays: dict[str, np.ndarray], prefix: str):
+    kind = str(arrays[f"{prefix}/type"])
+    if kind == "lr":
+        return CompiledLogisticRegression(arrays[f"{prefix}/coef"], arrays[f"{prefix}/intercept"])
+    if kind == "svc":
+        return CompiledSVC(
+            arrays[f"{prefix}/kernel"],
+            arrays[f"{prefix}/support_vectors"],
+            arrays[f"{prefix}/dual_coef"],
+            *(arrays[f"{prefix}/{p}"] for p in CompiledSVC.PARAMS),
+        )
+    members = [_load_estimator(arrays, f"{prefix}/{i}") for i in range(int(arrays[f"{prefix}/n_members"]))]
+    return CompiledSoftVoting(members, arrays.get(f"{prefix}/weights"))
+
+
+def bundle_arrays(compiled, key: str) -> dict[str, np.ndarray] | None:
+    """고속 추론 객체 → 번들 배열. 배열로 표현할 수 없는 구성(sklearn 보간기 그대로 사용)이면 None"""
+    if isinstance(compiled, CompiledSimpleScenario):
+        return {
+            f"{key}/kind": np.array("simple"),
+            f"{key}/quantiles": compiled.quantiles,
+            f"{key}/table": compiled.table,
+        }
+    if not (isinstance(compiled, CompiledDetailScenario) and isinstance(compiled.imputer, KNNImputeIndex)):
+        return None
+    index = compiled.imputer
+    arrays = {
+        f"{key}/kind": np.array("detail"),
+        f"{key}/low": compiled.low,
+        f"{key}/up": compiled.up,
+        f"{key}/mean": compiled.mean,
+        f"{key}/scale": compiled.scale,
+        f"{key}/imputer/fit_x": index.fit_x,
+        f"{key}/imputer/k": np.array(index.k),
+    }
+    for col, table in index.tables.items():
+        arrays[f"{key}/imputer/table/{col}/values"] = np.array(list(table), dtype=float)
+        arrays[f"{key}/imputer/table/{col}/rows"] = np.array(list(table.values()), dtype=float)
+    arrays.update(_estimator_arrays(compiled.estimator, f"{key}/estimator"))
+    return arrays
+
+
+def load_bundled_scenario(
+    arrays: dict[str, np.ndarray],
+    key: str,
+    fallback_imputer: Callable[[], object],
+):
+    """번들 배열 → 고속 추론 객체 (sklearn 불필요). 번들에 없는 시나리오면 None
+
+    fallback_imputer는 KNN 보간 동률 행에 쓸 KNNImputer 아티팩트를 돌려주는 함수 (필요할 때만 호출).
+    """
+    kind = arrays.get(f"{key}/kind")
+    if kind is None:
+        return None
+    if str(kind) == "simple":
+        return CompiledSimpleScenario(arrays[f"{key}/quantiles"], arrays[f"{key}/table"])
+
+    index = KNNImputeIndex(arrays[f"{key}/imputer/fit_x"], int(arrays[f"{key}/imputer/k"]), fallback_imputer)
+    for col in range(index.n_features):
+        values = arrays.get(f"{key}/imputer/table/{col}/values")
+        if values is not None:
+            rows = arrays[f"{key}/imputer/table/{col}/rows"]
+            index.tables[col] = {float(v): row for v, row in zip(values, rows)}
+    return CompiledDetailScenario(
+        arrays[f"{key}/low"],
+        arrays[f"{key}/up"],
+        arrays[f"{key}/mean"],
+        arrays[f"{key}/scale"],
+        index,
+        _load_estimator(arrays, f"{key}/estimator"),
+        cache=ResultCache(key),
+    )
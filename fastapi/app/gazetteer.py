@@ -0,0 +1,151 @@
+# 오프라인 주소 사전(gazetteer): 정규화 주소 → lat/lng를 메모리 색인으로 조회 (네트워크 없이 µs 단위)
+#
+# 색인 구조: 정렬된 주소들을 UTF-8로 이어 붙인 바이트 배열 + 시작 위치(offsets) + 위도/경도 배열.
+# 파이썬 문자열 객체를 주소마다 만들지 않아 100만 건도 수십 MB로 유지되며, 조회는 이분 탐색이다.
+# UTF-8 바이트 순서는 코드 포인트 순서와 같으므로 바이트 비교만으로 접두사 범위를 구할 수 있다.
+from __future__ import annotations
+
+import bisect
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app import metrics
+from app.geocoding import Coordinates, GeocoderBackend, normalize_address
+
+# 입력 파일 컬럼명
+ADDRESS_COLUMN = "address"
+LAT_COLUMN = "lat"
+LNG_COLUMN = "lng"
+
+
+class _SortedKeys:
+    """bisect용 시퀀스: i번째 키를 바이트 배열에서 잘라 반환"""
+
+    def __init__(self, blob: bytes, offsets: memoryview):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return self.blob[self.offsets[i] : self.offsets[i + 1]]
+
+
+class Gazetteer:
+    """정규화 주소 색인
+
+    - exact: 정규화 주소가 그대로 있는 경우 그 좌표
+    - area: 질의가 여러 주소의 단어 단위 접두사인 경우(예: "서울특별시 송파구") 해당 주소들의 중심 좌표
+      (누적합으로 범위 크기와 무관하게 O(1))
+    """
+
+    def __init__(self, blob: bytes, offsets: np.ndarray, lat: np.ndarray, lng: np.ndarray):
+        self.blob = blob
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        # memoryview 인덱싱은 파이썬 int를 반환하면서 주소마다 int 객체를 만들어 두지 않는다
+        self._keys = _SortedKeys(self.blob, memoryview(self.offsets))
+        self._lat_cumsum = np.concatenate([[0.0], np.cumsum(self.lat)])
+        self._lng_cumsum = np.concatenate([[0.0], np.cumsum(self.lng)])
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def from_records(cls, addresses, lat, lng) -> Gazetteer:
+        """(주소, 위도, 경도) 목록 → 색인. 정규화 후 같은 주소가 여러 번 있으면 처음 값 사용"""
+        keys = [normalize_address(str(a)).encode("utf-8") for a in addresses]
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        sorted_keys, idx, previous = [], [], None
+        for i in order:
+            key = keys[i]
+            if key and key != previous and np.isfinite(lat[i]) and np.isfinite(lng[i]):
+                sorted_keys.append(key)
+                idx.append(i)
+                previous = key
+        lengths = np.fromiter((len(k) for k in sorted_keys), dtype=np.int64, count=len(sorted_keys))
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        return cls(b"".join(sorted_keys), offsets, lat[idx], lng[idx])
+
+    @classmethod
+    def load(cls, path: str | Path) -> Gazetteer:
+        """CSV/Parquet(address, lat, lng) 또는 save()로 저장한 .npz 파일에서 색인 생성"""
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"주소 사전 파일을 찾을 수 없습니다: {path}")
+        if path.suffix == ".npz":
+            with np.load(path) as data:
+                return cls(data["blob"].tobytes(), data["offsets"], data["lat"], data["lng"])
+        if path.suffix == ".parquet":
+            df = pd.read_parquet(path, columns=[ADDRESS_COLUMN, LAT_COLUMN, LNG_COLUMN])
+        else:
+            df = pd.read_csv(path, usecols=[ADDRESS_COLUMN, LAT_COLUMN, LNG_COLUMN], dtype={ADDRESS_COLUMN: str})
+        return cls.from_records(df[ADDRESS_COLUMN].fillna(""), df[LAT_COLUMN], df[LNG_COLUMN])
+
+    def save(self, path: str | Path) -> None:
+        """다음 시작 시 정렬 없이 바로 읽을 수 있도록 .npz로 저장"""
+        np.savez(
+            path,
+            blob=np.frombuffer(self.blob, dtype=np.uint8),
+            offsets=self.offsets,
+            lat=self.lat,
+            lng=self.lng,
+        )
+
+    def nbytes(self) -> int:
+        """색인이 차지하는 배열 메모리 (bytes)"""
+        arrays = (self.offsets, self.lat, self.lng, self._lat_cumsum, self._lng_cumsum)
+        return len(self.blob) + sum(a.nbytes for a in arrays)
+
+    def lookup(self, address: str) -> Coordinates | None:
+        key = normalize_address(address).encode("utf-8")
+        if not key:
+            return None
+
+        # 정확히 일치
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return str(float(self.lat[i])), str(float(self.lng[i]))
+
+        # 단어 단위 접두사 범위 ("<질의> "로 시작하는 주소들)의 중심 좌표
+        lo = bisect.bisect_left(self._keys, key + b" ", lo=i)
+        hi = bisect.bisect_left(self._keys, key + b"!", lo=lo)
+        if hi > lo:
+            n = hi - lo
+            lat = (self._lat_cumsum[hi] - self._lat_cumsum[lo]) / n
+            lng = (self._lng_cumsum[hi] - self._lng_cumsum[lo]) / n
+            return str(float(lat)), str(float(lng))
+        return None
+
+
+class LocalFirstGeocoder:
+    """주소 사전에서 먼저 찾고, 없을 때만 원격 지오코더(Nominatim) 호출"""
+
+    def __init__(self, gazetteer: Gazetteer, remote: GeocoderBackend | None = None):
+        self.gazetteer = gazetteer
+        self.remote = remote
+        self.local_hits = 0
+        self.remote_calls = 0
+
+    async def lookup(self, query: str) -> Coordinates | None:
+        started = time.perf_counter()
+        value = self.gazetteer.lookup(query)
+        metrics.record_geocode_backend("gazetteer", "not_found" if value is None else "ok", time.perf_counter() - started)
+        if value is not None:
+            self.local_hits += 1
+            return value
+        if self.remote is None:
+            return None
+        self.remote_calls += 1
+        return await self.remote.lookup(query)
+
+    async def aclose(self) -> None:
+        if self.remote is not None:
+            await self.remote.aclose()
@@ -1,35 +1,345 @@
 # 주소 → lat/lng 반환 (Nominatim, 가입 불필요)
+#
+# 비동기 서비스: 공유 HTTP 클라이언트(커넥션 풀) + 동일 주소 동시 요청 병합 + 정규화 주소 캐시(TTL/LRU,
+# 선택적 SQLite 영속화, 주소 없음 결과도 캐시) + Nominatim 사용 정책(초당 1회) 준수 스로틀.
+# 정규화 주소는 캐시/병합 키로만 쓰고, 백엔드에는 사용자가 입력한 주소를 보낸다. SQLite 입출력은 스레드에서 수행.
 from __future__ import annotations
 
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Protocol
 
+import httpx
+
+from app import metrics, settings
+
+USER_AGENT = "diabetes_app_kr"
+
+# 캐시 값: (lat, lng) 또는 None(주소 없음)
+Coordinates = tuple[str, str]
+
+
+class GeocoderUnavailable(Exception):
+    """지오코딩 서버 타임아웃/오류/요청 제한 (일시적이므로 캐시하지 않음)"""
+
+
+class GeocoderSaturated(GeocoderUnavailable):
+    """백엔드 조회 대기 중인 주소가 상한에 도달 (retry_after초 후 재시도 권장)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class GeocoderBackend(Protocol):
+    async def lookup(self, query: str) -> Coordinates | None: ...
+
+    async def aclose(self) -> None: ...
+
+
+def normalize_address(address: str | None) -> str:
+    """캐시/병합 키용 주소 정규화: 유니코드 NFC + 공백 정리 + casefold"""
+    if not address:
+        return ""
+    return " ".join(unicodedata.normalize("NFC", address).split()).casefold()
 
-def geocoding(address: str) -> dict[str, str] | None:
-    """주소 → {"lat":, "lng":} 또는 None"""
-    if not address or not address.strip():
-        return None
 
-    addr = address.strip()
-    geolocator = Nominatim(user_agent="diabetes_app_kr", timeout=10)
+class NominatimGeocoder:
+    """Nominatim 검색 API 클라이언트 (geopy Nominatim.geocode와 같은 질의: format=json, limit=1)"""
 
-    # 1차: 원본 주소
-    geo = _try_geocode(geolocator, addr)
-    if geo is not None:
-        return {"lat": str(geo.latitude), "lng": str(geo.longitude)}
+    def __init__(
+        self,
+        url: str = settings.GEOCODE_URL,
+        min_interval: float = settings.GEOCODE_MIN_INTERVAL,
+        timeout: float = settings.GEOCODE_TIMEOUT,
+    ):
+        self.url = url
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._throttle_lock = asyncio.Lock()
+        self._next_at = 0.0
 
-    # 2차: ", 대한민국" 붙여서 재시도
-    if "대한민국" not in addr and "South Korea" not in addr and "Korea" not in addr:
-        geo = _try_geocode(geolocator, f"{addr}, 대한민국")
-        if geo is not None:
-            return {"lat": str(geo.latitude), "lng": str(geo.longitude)}
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        return self._client
 
-    return None
+    async def _throttle(self) -> None:
+        # 요청 시작 간격을 min_interval 이상으로 유지 (대기 중인 요청은 순서대로 통과)
+        async with self._throttle_lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+                waited = time.monotonic() - now
+                now += waited
+                metrics.record_geocode_throttle(waited)
+            self._next_at = now + self.min_interval
 
+    def _back_off(self, retry_after: str | None) -> None:
+        try:
+            delay = float(retry_after) if retry_after else 0.0
+        except ValueError:
+            delay = 0.0
+        self._next_at = max(self._next_at, time.monotonic() + max(delay, self.min_interval))
 
-def _try_geocode(geolocator: Nominatim, query: str):
-    """타임아웃/에러 시 None"""
-    try:
-        return geolocator.geocode(query)
-    except (GeocoderTimedOut, GeocoderServiceError, AttributeError):
+    async def lookup(self, query: str) -> Coordinates | None:
+        await self._throttle()
+        # 지표의 백엔드 시간은 HTTP 왕복만 (스로틀 대기 제외)
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().get(self.url, params={"q": query, "format": "json", "limit": 1})
+        except httpx.TimeoutException as e:
+            metrics.record_geocode_backend("nominatim", "timeout", time.perf_counter() - started)
+            raise GeocoderUnavailable(f"지오코딩 요청 시간 초과: {type(e).__name__}") from e
+        except httpx.HTTPError as e:
+            metrics.record_geocode_backend("nominatim", "error", time.perf_counter() - started)
+            raise GeocoderUnavailable(f"지오코딩 요청 실패: {type(e).__name__}") from e
+        elapsed = time.perf_counter() - started
+        if response.status_code in (429, 503):
+            metrics.record_geocode_backend("nominatim", "rate_limited", elapsed)
+            self._back_off(response.headers.get("Retry-After"))
+            raise GeocoderUnavailable(f"지오코딩 요청 제한 ({response.status_code})")
+        if response.status_code >= 400:
+            metrics.record_geocode_backend("nominatim", "server_error", elapsed)
+            raise GeocoderUnavailable(f"지오코딩 서버 오류 ({response.status_code})")
+        try:
+            places = response.json()
+            if not places:
+                metrics.record_geocode_backend("nominatim", "not_found", elapsed)
+                return None
+            value = str(float(places[0]["lat"])), str(float(places[0]["lon"]))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            metrics.record_geocode_backend("nominatim", "bad_response", elapsed)
+            raise GeocoderUnavailable("지오코딩 응답 형식 오류") from e
+        metrics.record_geocode_backend("nominatim", "ok", elapsed)
+        return value
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class StubGeocoder:
+    """테스트용 로컬 지오코더: {질의: (lat, lng)} 표에서 조회 (네트워크 없음, 호출 기록)"""
+
+    def __init__(self, table: dict[str, Coordinates] | None = None, delay: float = 0.0):
+        self.table = {normalize_address(k): v for k, v in (table or {}).items()}
+        self.delay = delay
+        self.calls: list[str] = []
+
+    async def lookup(self, query: str) -> Coordinates | None:
+        self.calls.append(query)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.table.get(normalize_address(query))
+
+    async def aclose(self) -> None:
         return None
+
+
+class GeocodeCache:
+    """정규화 주소 → 좌표 캐시 (메모리 LRU + TTL, db_path를 주면 SQLite에도 저장해 재시작 후 재사용)
+
+    메모리 캐시는 이벤트 루프에서 바로 조회하고, SQLite 조회/저장만 asyncio.to_thread로 실행해 루프를 막지 않는다.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.GEOCODE_CACHE_SIZE,
+        ttl: float = settings.GEOCODE_CACHE_TTL,
+        negative_ttl: float = settings.GEOCODE_NEGATIVE_TTL,
+        db_path: str | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, tuple[float, Coordinates | None]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        # 연결 하나를 여러 to_thread 작업이 공유하므로 DB 접근은 직렬화
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS geocode "
+                    "(address TEXT PRIMARY KEY, lat TEXT, lng TEXT, expires_at REAL NOT NULL)"
+                )
+                self._db.execute("DELETE FROM geocode WHERE expires_at <= ?", (time.time(),))
+
+    async def get(self, key: str) -> tuple[bool, Coordinates | None]:
+        """(적중 여부, 값). 값 None은 '주소 없음' 캐시"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return True, entry[1]
+            del self._entries[key]
+        if self._db is not None:
+            row = await asyncio.to_thread(self._db_get, key, now)
+            if row is not None:
+                value = None if row[0] is None else (row[0], row[1])
+                self._remember(key, row[2], value)
+                return True, value
+        return False, None
+
+    async def set(self, key: str, value: Coordinates | None) -> None:
+        expires_at = time.time() + (self.ttl if value is not None else self.negative_ttl)
+        self._remember(key, expires_at, value)
+        if self._db is not None:
+            lat, lng = value if value is not None else (None, None)
+            await asyncio.to_thread(self._db_set, key, lat, lng, expires_at)
+
+    def _db_get(self, key: str, now: float) -> tuple | None:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            return self._db.execute(
+                "SELECT lat, lng, expires_at FROM geocode WHERE address = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+
+    def _db_set(self, key: str, lat: str | None, lng: str | None, expires_at: float) -> None:
+        with self._db_lock:
+            if self._db is None:
+                return
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode (address, lat, lng, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, lat, lng, expires_at),
+                )
+
+    def _remember(self, key: str, expires_at: float, value: Coordinates | None) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class GeocodingService:
+    """캐시 → 진행 중 요청 병합 → 백엔드 조회 순서로 주소를 좌표로 변환"""
+
+    def __init__(
+        self,
+        backend: GeocoderBackend,
+        cache: GeocodeCache | None = None,
+        max_pending: int = settings.GEOCODE_MAX_PENDING,
+    ):
+        self.backend = backend
+        self.cache = cache if cache is not None else GeocodeCache()
+        self.max_pending = max_pending
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def geocode(self, address: str | None) -> dict[str, str] | None:
+        """주소 → {"lat":, "lng":} 또는 None. 서버 오류/요청 제한은 GeocoderUnavailable"""
+        key = normalize_address(address)
+        if not key:
+            return None
+
+        started = time.perf_counter()
+        source = "cache"
+        hit, value = await self.cache.get(key)
+        if not hit:
+            future = self._inflight.get(key)
+            if future is None:
+                source = "backend"
+                if len(self._inflight) >= self.max_pending:
+                    metrics.record_geocode("backend", "saturated", time.perf_counter() - started)
+                    raise GeocoderSaturated("조회 대기 중인 주소가 많습니다", self._retry_after())
+                # 같은 키로 병합되는 요청들은 처음 들어온 요청의 원래 주소로 한 번만 조회
+                future = asyncio.ensure_future(self._resolve(key, address.strip()))
+                self._inflight[key] = future
+                future.add_done_callback(lambda f: self._finished(key, f))
+            else:
+                source = "coalesced"
+            # 한 요청이 취소되어도(클라이언트 연결 끊김) 같은 주소를 기다리는 다른 요청은 계속 진행
+            try:
+                value = await asyncio.shield(future)
+            except GeocoderUnavailable:
+                metrics.record_geocode(source, "unavailable", time.perf_counter() - started)
+                raise
+
+        metrics.record_geocode(source, "not_found" if value is None else "found", time.perf_counter() - started)
+        if value is None:
+            return None
+        return {"lat": value[0], "lng": value[1]}
+
+    def _retry_after(self) -> int:
+        # Nominatim은 대기 중인 주소 수 x 요청 간격만큼 밀려 있다
+        return max(1, math.ceil(len(self._inflight) * settings.GEOCODE_MIN_INTERVAL))
+
+    def _finished(self, key: str, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not future.cancelled():
+            future.exception()  # 기다리는 요청이 모두 취소된 경우의 미확인 예외 경고 방지
+
+    async def _resolve(self, key: str, query: str) -> Coordinates | None:
+        """key: 정규화 주소(캐시 키), query: 백엔드에 보낼 사용자 입력 주소"""
+        # 1차: 원본 주소
+        value = await self.backend.lookup(query)
+
+        # 2차: ", 대한민국" 붙여서 재시도 (판단은 casefold된 키 기준)
+        if value is None and "대한민국" not in key and "korea" not in key:
+            value = await self.backend.lookup(f"{query}, 대한민국")
+
+        await self.cache.set(key, value)
+        return value
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+        await asyncio.to_thread(self.cache.close)
+
+
+_service: GeocodingService | None = None
+
+metrics.gauge(
+    "diabetes_geocode_cache_entries",
+    "지오코딩 메모리 캐시 항목 수",
+    lambda: len(_service.cache) if _service is not None else None,
+)
+
+
+def get_geocoding_service() -> GeocodingService:
+    """앱 공용 지오코딩 서비스 (FastAPI 의존성, 첫 사용 시 생성)"""
+    global _service
+    if _service is None:
+        backend: GeocoderBackend = NominatimGeocoder()
+        if settings.GAZETTEER_PATH:
+            # 주소 사전이 설정되면 로컬 우선, 없을 때만 Nominatim (gazetteer가 이 모듈을 import하므로 지연 import)
+            from app.gazetteer import Gazetteer, LocalFirstGeocoder
+
+            backend = LocalFirstGeocoder(Gazetteer.load(settings.GAZETTEER_PATH), backend)
+        _service = GeocodingService(backend, GeocodeCache(db_path=settings.GEOCODE_CACHE_DB or None))
+    return _service
+
+
+def set_geocoding_service(service: GeocodingService | None) -> None:
+    """공용 서비스 교체 (테스트에서 StubGeocoder 주입 등). None이면 다음 사용 시 기본 서비스 재생성"""
+    global _service
+    _service = service
+
+
+async def close_geocoding_service() -> None:
+    global _service
+    if _service is not None:
+        await _service.aclose()
+        _service = None
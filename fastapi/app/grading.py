@@ -0,0 +1,35 @@
+# 간편(C/C-NS) 시나리오 분위수 등급화 (학습/검증/서빙 공용)
+#
+# 등급 경계는 기존 if-체인과 동일하다: v <= q1 → 1, v <= q2 → 2, v <= q3 → 3, 그 외(NaN 포함) → 4.
+# np.searchsorted(q, v, side="left")는 q 중 v보다 작은 값의 개수이고, NaN은 가장 큰 값으로 정렬되므로 4가 된다.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+N_GRADES = 4
+
+
+def grade(values, q) -> np.ndarray:
+    """값 배열(열 하나) → 등급(1~4) int64 배열"""
+    return np.searchsorted(np.asarray(q, dtype=float), np.asarray(values, dtype=float), side="left") + 1
+
+
+def grade_matrix(raw: np.ndarray, quantiles: list) -> np.ndarray:
+    """(행, 피처) 원시값 행렬 → 등급 행렬. quantiles[j]는 j번째 피처의 [q1, q2, q3]"""
+    raw = np.asarray(raw, dtype=float)
+    grades = np.empty(raw.shape, dtype=np.int64)
+    for j, q in enumerate(quantiles):
+        grades[:, j] = grade(raw[:, j], q)
+    return grades
+
+
+def grade_frame(df: pd.DataFrame, quantiles: dict[str, list[float]]) -> pd.DataFrame:
+    """quantiles에 있는 컬럼을 등급화한 DataFrame (인덱스/컬럼 순서 유지)"""
+    import pandas as pd
+
+    return pd.DataFrame({c: grade(df[c].to_numpy(), quantiles[c]) for c in df.columns}, index=df.index)
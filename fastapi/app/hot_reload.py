@@ -0,0 +1,108 @@
+# 모델 버전 핫 리로드: 백그라운드 로드 → 검증 → 원자적 교체 / 즉시 롤백 (서버 재시작 없이 배포)
+from __future__ import annotations
+
+import re
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from app import settings
+from app.model_loader import APP_DIR, MODELS, ModelSet, new_model_set
+from app.predictor import smoke_check, warm_up
+
+# 버전 이름은 MODEL_ROOT 바로 아래 디렉터리 이름만 허용 (경로 이동 방지)
+_VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+_state: dict = {"status": "idle"}
+_state_lock = threading.Lock()
+
+
+def resolve_model_dir(version: str | None) -> Path:
+    """버전 이름 → 아티팩트 디렉터리. 없거나 잘못된 이름이면 HTTPException(400/404)"""
+    if not version:
+        return Path(settings.MODEL_DIR or APP_DIR)
+    if not _VERSION_PATTERN.match(version):
+        raise HTTPException(status_code=400, detail="버전 이름은 영문/숫자/._- 만 사용할 수 있습니다.")
+    model_dir = Path(settings.MODEL_ROOT) / version
+    if not model_dir.is_dir():
+        raise HTTPException(status_code=404, detail=f"모델 버전 디렉터리를 찾을 수 없습니다: {version}")
+    return model_dir
+
+
+def _validate(models: ModelSet) -> dict:
+    """교체 전 검증: 예측 점검 + (DIABETES_VALIDATION_CSV 설정 시) 정확도 검증"""
+    report = {"smoke": smoke_check(models)}
+    passed = report["smoke"]["passed_all"]
+    if settings.VALIDATION_CSV and models.meta:
+        # pandas/sklearn은 검증할 때만 import
+        from app.dataset import load_prepared
+        from app.validation import validate_artifacts
+
+        data = load_prepared(Path(settings.VALIDATION_CSV))
+        report["accuracy"] = validate_artifacts(
+            data, models.meta, models.base_dir, pass_basis=settings.VALIDATION_PASS_BASIS
+        )
+        passed = passed and report["accuracy"]["passed_all"]
+    report["passed_all"] = passed
+    return report
+
+
+def _run(model_dir: Path) -> None:
+    try:
+        models = new_model_set(model_dir)
+        _update(version=models.version)
+        warm_up(models)
+        report = _validate(models)
+        if not report["passed_all"]:
+            _update(status="failed", report=report, finished_at=time.time())
+            return
+        MODELS.swap(models)
+        _update(status="swapped", report=report, finished_at=time.time())
+        print(f"[모델 교체 완료] version={models.version}, path={model_dir}")
+    except Exception as e:
+        traceback.print_exc()
+        _update(status="failed", error=f"{type(e).__name__}: {e}", finished_at=time.time())
+
+
+def _update(**kwargs) -> None:
+    with _state_lock:
+        _state.update(kwargs)
+
+
+def start_reload(version: str | None) -> dict:
+    """새 버전 로드를 백그라운드 스레드에서 시작. 이미 진행 중이면 HTTPException(409)"""
+    model_dir = resolve_model_dir(version)
+    with _state_lock:
+        if _state.get("status") == "loading":
+            raise HTTPException(status_code=409, detail="이미 모델 로드가 진행 중입니다.")
+        _state.clear()
+        _state.update(status="loading", path=str(model_dir), started_at=time.time())
+    threading.Thread(target=_run, args=(model_dir,), name="model-reload", daemon=True).start()
+    return reload_status()
+
+
+def rollback() -> ModelSet:
+    """직전 버전으로 즉시 되돌림. 직전 버전이 없으면 HTTPException(409)"""
+    try:
+        models = MODELS.rollback()
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    print(f"[모델 롤백 완료] version={models.version}")
+    return models
+
+
+def reload_status() -> dict:
+    with _state_lock:
+        return dict(_state)
+
+
+def models_status() -> dict:
+    previous = MODELS.previous
+    return {
+        "current": MODELS.current.info(),
+        "previous": previous.info() if previous is not None else None,
+        "reload": reload_status(),
+    }
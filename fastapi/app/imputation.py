@@ -0,0 +1,215 @@
+# KNNImputer(nan_euclidean, uniform)와 같은 결과를 내는 결측 패턴별 이웃 인덱스
+#
+# KNNImputer.transform은 결측이 있는 행마다 학습 행렬 전체와의 거리를 brute-force로 계산한다.
+# 여기서는 시작 시 (입력에 존재하는 컬럼 집합, 보간할 컬럼) 조합마다 KD-tree를 만들어 두고,
+# 0~1차원 패턴은 정해진 입력 격자에 대한 결과표까지 미리 계산한다.
+# 학습 행렬과 이웃 수만 있으면 만들 수 있으므로(컴파일 번들) sklearn은 동률 행 처리에 처음 필요할 때만 쓴다.
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from itertools import combinations
+from typing import Callable
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# k번째 이웃 경계에서 동률 여부를 판단할 때 추가로 조회하는 이웃 수 / 허용 오차(거리 제곱)
+TIE_MARGIN = 8
+TIE_ATOL = 1e-9
+# 동률 행의 행 단위 KNNImputer 결과 캐시 (같은 입력은 항상 같은 결과이므로 그대로 재사용)
+FALLBACK_CACHE_SIZE = 65536
+
+
+def supports(imputer) -> bool:
+    """이 인덱스로 정확히 재현 가능한 KNNImputer 설정인지"""
+    from sklearn.impute import KNNImputer
+
+    if not isinstance(imputer, KNNImputer):
+        return False
+    missing = imputer.missing_values
+    return (
+        imputer.weights == "uniform"
+        and imputer.metric == "nan_euclidean"
+        and not imputer.add_indicator
+        and isinstance(missing, float)
+        and np.isnan(missing)
+        and bool(np.all(imputer._valid_mask))
+    )
+
+
+class _PatternIndex:
+    """입력 존재 컬럼 집합 present, 보간 대상 컬럼 col에 대한 후보 이웃"""
+
+    def __init__(self, fit_x: np.ndarray, fit_mask: np.ndarray, present: tuple[int, ...], col: int):
+        n_features = fit_x.shape[1]
+        donors = ~fit_mask[:, col]
+        donor_present = ~fit_mask[:, list(present)]
+        full = donors & donor_present.all(axis=1)
+        partial = donors & ~donor_present.all(axis=1) & donor_present.any(axis=1)
+
+        self.n_potential = int(donors.sum())
+        # 모든 present 컬럼이 있는 이웃: KD-tree (가중치 n_features/|present| 는 상수라 순위 불변)
+        self.full_weight = n_features / len(present)
+        self.full_values = fit_x[full, col]
+        self.tree = cKDTree(fit_x[full][:, list(present)]) if full.any() else None
+        # 일부 컬럼만 있는 이웃(학습 데이터의 결측 행): 소수라 brute-force
+        partial_x = fit_x[partial][:, list(present)]
+        self.partial_mask = ~np.isnan(partial_x)
+        self.partial_x = np.where(self.partial_mask, partial_x, 0.0)
+        self.partial_weight = n_features / self.partial_mask.sum(axis=1)
+        self.partial_values = fit_x[partial, col]
+
+    def candidates(self, xq: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(행, 후보) 가중 거리 제곱, 후보 값, 조회하지 않은 이웃이 시작되는 거리(없으면 inf)"""
+        n = len(xq)
+        parts_d, parts_v = [], []
+        edge = np.full(n, np.inf)
+        if self.tree is not None:
+            kk = min(k + TIE_MARGIN, len(self.full_values))
+            dist, idx = self.tree.query(xq, k=kk)
+            dist, idx = dist.reshape(n, kk), idx.reshape(n, kk)
+            sq = dist * dist * self.full_weight
+            parts_d.append(sq)
+            parts_v.append(self.full_values[idx])
+            if kk < len(self.full_values):
+                edge = sq[:, -1]
+        if len(self.partial_values):
+            diff = (xq[:, None, :] - self.partial_x[None, :, :]) * self.partial_mask[None, :, :]
+            parts_d.append((diff * diff).sum(axis=2) * self.partial_weight[None, :])
+            parts_v.append(np.broadcast_to(self.partial_values, (n, len(self.partial_values))))
+        if not parts_d:
+            return np.full((n, 0), np.inf), np.zeros((n, 0)), edge
+        return np.hstack(parts_d), np.hstack(parts_v), edge
+
+
+class KNNImputeIndex:
+    """학습된 KNNImputer와 같은 보간 결과를 패턴별 KD-tree/결과표로 계산
+
+    fallback은 동률 행에 쓸 KNNImputer를 돌려주는 함수 (처음 필요할 때 한 번 호출).
+    """
+
+    def __init__(self, fit_x: np.ndarray, n_neighbors: int, fallback: Callable[[], object]):
+        self.fit_x = fit_x = np.asarray(fit_x, dtype=float)
+        self.k = int(n_neighbors)
+        self._fallback = fallback
+        self._fallback_imputer = None
+        fit_mask = np.isnan(fit_x)
+        self.n_features = fit_x.shape[1]
+        self.col_means = np.ma.array(fit_x, mask=fit_mask).mean(axis=0).filled(np.nan)
+
+        all_cols = range(self.n_features)
+        self.patterns: dict[tuple[int, ...], dict[int, _PatternIndex]] = {}
+        for r in range(1, self.n_features):
+            for present in combinations(all_cols, r):
+                self.patterns[present] = {
+                    col: _PatternIndex(fit_x, fit_mask, present, col)
+                    for col in all_cols if col not in present
+                }
+        # 1차원 패턴 결과표: present 컬럼 → {스케일된 입력값: 보간된 행}
+        self.tables: dict[int, dict[float, np.ndarray]] = {}
+        self._fallback_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._fallback_lock = threading.Lock()
+
+    @classmethod
+    def from_imputer(cls, imputer) -> KNNImputeIndex:
+        if not supports(imputer):
+            raise ValueError("지원하지 않는 KNNImputer 설정입니다.")
+        return cls(imputer._fit_X, imputer.n_neighbors, lambda: imputer)
+
+    def precompute(self, col: int, values: np.ndarray) -> None:
+        """col 하나만 입력된 경우의 보간 결과를 values 격자에 대해 미리 계산"""
+        values = np.unique(np.asarray(values, dtype=float))
+        values = values[~np.isnan(values)]
+        x = np.full((len(values), self.n_features), np.nan)
+        x[:, col] = values
+        imputed = self.transform(x)
+        self.tables[col] = {float(v): row for v, row in zip(values, imputed)}
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=float)
+        mask = np.isnan(X)
+        present_count = (~mask).sum(axis=1)
+
+        # 모든 컬럼 결측: 거리 정의 불가 → 학습 컬럼 평균 (KNNImputer와 동일)
+        empty = present_count == 0
+        if empty.any():
+            X[empty] = self.col_means
+
+        rows = np.flatnonzero((present_count > 0) & (present_count < self.n_features))
+        if not len(rows):
+            return X
+
+        fallback: list[np.ndarray] = []
+        codes = (~mask[rows]) @ (1 << np.arange(self.n_features))
+        for code in np.unique(codes):
+            group = rows[codes == code]
+            present = tuple(j for j in range(self.n_features) if code >> j & 1)
+            if len(present) == 1 and present[0] in self.tables:
+                table = self.tables[present[0]]
+                hits = np.array([float(v) in table for v in X[group, present[0]]])
+                for i in group[hits]:
+                    X[i] = table[float(X[i, present[0]])]
+                group = group[~hits]
+                if not len(group):
+                    continue
+            xq = X[np.ix_(group, present)]
+            ambiguous = np.zeros(len(group), dtype=bool)
+            for col, index in self.patterns[present].items():
+                values, amb = self._impute_column(index, xq, col)
+                X[group, col] = values
+                ambiguous |= amb
+            if ambiguous.any():
+                fallback.append(group[ambiguous])
+
+        # k번째 이웃 경계에 값이 다른 동률 후보가 있는 행은 KNNImputer 선택 규칙에 맡긴다.
+        # KNNImputer의 동률 선택은 배치 구성(거리 계산 반올림)에 따라 달라지므로 단건 요청과 같게 행 단위로 호출
+        for i in np.concatenate(fallback) if fallback else ():
+            X[i] = self._impute_row(np.where(mask[i], np.nan, X[i]))
+        return X
+
+    def _impute_row(self, row: np.ndarray) -> np.ndarray:
+        key = row.tobytes()
+        with self._fallback_lock:
+            cached = self._fallback_cache.get(key)
+            if cached is not None:
+                self._fallback_cache.move_to_end(key)
+                return cached
+        if self._fallback_imputer is None:
+            self._fallback_imputer = self._fallback()
+        imputed = self._fallback_imputer.transform(row[None, :])[0]
+        with self._fallback_lock:
+            self._fallback_cache[key] = imputed
+            if len(self._fallback_cache) > FALLBACK_CACHE_SIZE:
+                self._fallback_cache.popitem(last=False)
+        return imputed
+
+    def _impute_column(self, index: _PatternIndex, xq: np.ndarray, col: int) -> tuple[np.ndarray, np.ndarray]:
+        """col 보간값과, KNNImputer와 이웃 선택이 달라질 수 있는(동률) 행 표시"""
+        dist, vals, edge = index.candidates(xq, self.k)
+        order = np.argsort(dist, axis=1, kind="stable")
+        dist = np.take_along_axis(dist, order, axis=1)
+        vals = np.take_along_axis(vals, order, axis=1)
+        n_valid = np.isfinite(dist).sum(axis=1)
+        # KNNImputer: 이웃 수 = min(k, 후보 수), 거리 NaN 후보는 가중치 0
+        take = np.minimum(n_valid, min(self.k, index.n_potential))
+
+        selected = np.arange(dist.shape[1])[None, :] < take[:, None]
+        sums = np.where(selected, vals, 0.0).sum(axis=1)
+        out = np.full(len(xq), self.col_means[col])
+        has = take > 0  # 거리 정의 가능한 이웃이 없으면 컬럼 평균
+        out[has] = sums[has] / take[has]
+
+        # k번째 경계 거리와 동률인 후보가 경계 밖에도 있고 그 값들이 서로 다르면 결과가 선택에 좌우된다
+        ambiguous = np.zeros(len(xq), dtype=bool)
+        over = has & (n_valid > take)
+        if over.any():
+            rows = np.flatnonzero(over)
+            boundary = dist[rows, take[rows] - 1]
+            tied = np.abs(dist[rows] - boundary[:, None]) <= TIE_ATOL
+            crosses = tied[np.arange(len(rows)), take[rows]]
+            lo = np.where(tied, vals[rows], np.inf).min(axis=1)
+            hi = np.where(tied, vals[rows], -np.inf).max(axis=1)
+            unseen = np.abs(edge[rows] - boundary) <= TIE_ATOL
+            ambiguous[rows] = crosses & ((lo != hi) | unseen)
+        return out, ambiguous
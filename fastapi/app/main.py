@@ -1,17 +1,55 @@
-# 당뇨 예측 API 서버 (schemas, model_loader, predictor, geocoding)
+# 당뇨 예측 API 서버 (schemas, model_loader, predictor, executors, batcher, chart, hot_reload, geocoding, metrics)
 from __future__ import annotations
 
+import hmac
+import os
 import socket
+from contextlib import asynccontextmanager
 from typing import Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from app.geocoding import (
+    GeocoderSaturated,
+    GeocoderUnavailable,
+    GeocodingService,
+    close_geocoding_service,
+    get_geocoding_service,
+)
+from app import chart, executors, metrics, settings
+from app.batcher import BATCHER
+from app.executors import CHARTS, INFERENCE
+from app.hot_reload import models_status, rollback, start_reload
+from app.model_loader import MODELS, rss_bytes
+from app.predictor import chart_for_prediction, predict_batch, predict_with_model, result_cache_stats, warm_up
+from app.profiler import PROFILER
+from app.schemas import (
+    ChartFormat,
+    ChartResponse,
+    GeocodeRequest,
+    GeocodeResponse,
+    ModelReloadRequest,
+    PredictBatchRequest,
+    PredictBatchResponse,
+    PredictRequest,
+    PredictResponse,
+    ProfilerStartRequest,
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.MODEL_LOAD == "eager":
+        warm_up()
+    yield
+    await close_geocoding_service()
+    executors.shutdown()
+    chart.shutdown()
 
-from app.geocoding import geocoding
-from app.predictor import predict_with_model
-from app.schemas import GeocodeRequest, GeocodeResponse, PredictRequest, PredictResponse
 
-app = FastAPI(title="Diabetes Prediction API", version="2.0.0")
+app = FastAPI(title="Diabetes Prediction API", version="2.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -44,19 +82,173 @@ def health() -> dict[str, Any]:
         "model_no_sugar": "RandomForest (혈당 미포함: BMI, 나이, 임신횟수)",
         "local_ip": local_ip,
         "suggested_url": f"http://{local_ip}:8000",
+        "model_load": settings.MODEL_LOAD,
+        "model_version": MODELS.current.version,
+        "pid": os.getpid(),  # 멀티 워커(app.serve)에서 응답한 워커
+        "rss_bytes": rss_bytes(),
+        "artifacts": MODELS.current.registry.stats(),
+        "executors": {e.name: e.stats() for e in (INFERENCE, CHARTS)},
+        "batcher": BATCHER.stats(),
+        "charts": chart.stats(),
+        "result_cache": result_cache_stats(),
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint() -> PlainTextResponse:
+    """예측/지오코딩 지표 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+async def _charts_or_none(prediction_ids: list[str], endpoint: str) -> list[str | None]:
+    """예측에 딸린 PNG 차트를 차트 실행기에서 생성. 실행기가 가득 찼으면 차트 없이 응답
+    (예측 결과는 그대로 반환하고, 차트는 /predict/{prediction_id}/chart로 나중에 받을 수 있음)
+    """
+    try:
+        return await CHARTS.run(lambda: [chart_for_prediction(i, endpoint) for i in prediction_ids])
+    except HTTPException:
+        return [None] * len(prediction_ids)
+
+
 @app.post("/predict", response_model=PredictResponse)
-def predict(payload: PredictRequest) -> PredictResponse:
-    """ML 예측"""
-    return predict_with_model(payload)
+async def predict(payload: PredictRequest) -> PredictResponse:
+    """ML 예측 (추론은 추론 실행기, PNG 차트는 차트 실행기에서 처리)
+
+    svg/spec 차트는 렌더링 비용이 작아 추론과 함께 만든다.
+    마이크로 배처가 켜져 있으면 같은 시나리오의 동시 요청과 묶어 한 번에 추론한다.
+    """
+    png_chart = payload.include_chart and payload.chart_format == "png"
+    if png_chart:
+        payload = payload.model_copy(update={"include_chart": False})
+    if BATCHER.enabled:
+        response = await BATCHER.predict(payload)
+    else:
+        response = await INFERENCE.run(predict_with_model, payload)
+    if png_chart:
+        [response.chart_image_base64] = await _charts_or_none([response.prediction_id], "predict")
+    return response
+
+
+@app.get("/predict/{prediction_id}/chart", response_model=ChartResponse)
+async def predict_chart(prediction_id: str, chart_format: ChartFormat = Query("png", alias="format")) -> ChartResponse:
+    """이전 예측 결과의 차트 (지연 생성, format=png/svg/spec)
+
+    svg/spec도 템플릿 채우기와 피처 중요도 조회가 이벤트 루프를 막지 않도록 png와 같이 차트 실행기에서 처리한다.
+    """
+    chart_value = await CHARTS.run(chart_for_prediction, prediction_id, "chart", chart_format)
+    return ChartResponse(prediction_id=prediction_id, **{chart.CHART_FIELDS[chart_format]: chart_value})
+
+
+@app.post("/predict/batch", response_model=PredictBatchResponse)
+async def predict_many(payload: PredictBatchRequest | list[Any] = Body(...)) -> PredictBatchResponse:
+    """ML 일괄 예측 (시나리오별 벡터화, 행별 오류 보고)
+
+    본문은 {"items": [...], "차트포함": ...} 또는 항목 배열 그대로([...], 차트 없음). 항목 형식은 행별로 검증한다.
+    """
+    if isinstance(payload, list):
+        payload = PredictBatchRequest(items=payload)
+    if len(payload.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {settings.BATCH_MAX_ITEMS}건까지 예측할 수 있습니다 (요청 {len(payload.items)}건).",
+        )
+    png_chart = payload.include_chart and payload.chart_format == "png"
+    results = await INFERENCE.run(
+        predict_batch,
+        payload.items,
+        payload.include_chart and not png_chart,
+        payload.chart_format,
+        payload.include_chart,
+    )
+    if png_chart:
+        done = [r.result for r in results if r.result is not None]
+        charts = await _charts_or_none([r.prediction_id for r in done], "batch")
+        for result, chart_value in zip(done, charts):
+            result.chart_image_base64 = chart_value
+    failed = sum(1 for r in results if r.error is not None)
+    return PredictBatchResponse(count=len(results), failed=failed, results=results)
 
 
 @app.post("/geocode", response_model=GeocodeResponse)
-def geocode_address(payload: GeocodeRequest) -> GeocodeResponse:
-    """주소 → lat/lng"""
-    result = geocoding(payload.address)
+async def geocode_address(
+    payload: GeocodeRequest,
+    service: GeocodingService = Depends(get_geocoding_service),
+) -> GeocodeResponse:
+    """주소 → lat/lng (캐시/동시 요청 병합/초당 1회 제한, 이벤트 루프에서 비동기 I/O로만 처리)"""
+    try:
+        result = await service.geocode(payload.address)
+    except GeocoderSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"지오코딩 요청이 많습니다. 잠시 후 다시 시도해 주세요. ({e})",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except GeocoderUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"지오코딩 서비스를 일시적으로 사용할 수 없습니다. ({e})")
     if result is None:
         raise HTTPException(status_code=404, detail="주소를 찾을 수 없습니다.")
     return GeocodeResponse(lat=result["lat"], lng=result["lng"])
+
+
+def _check_admin(token: str | None) -> None:
+    """X-Admin-Token 헤더 확인. DIABETES_ADMIN_TOKEN이 없으면 관리자 API는 모두 거부 (0.0.0.0 + CORS * 로 열려 있으므로)"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다 (DIABETES_ADMIN_TOKEN 미설정).")
+    if not hmac.compare_digest(token or "", settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+@app.get("/admin/models")
+def admin_models(x_admin_token: str | None = Header(None)) -> dict[str, Any]:
+    """현재/직전 모델 버전 + 마지막 리로드 상태"""
+    _check_admin(x_admin_token)
+    return models_status()
+
+
+@app.post("/admin/models/reload", status_code=202)
+def admin_reload(payload: ModelReloadRequest, x_admin_token: str | None = Header(None)) -> dict[str, Any]:
+    """새 모델 버전을 백그라운드에서 로드/검증 후 교체 (진행 상황은 GET /admin/models)"""
+    _check_admin(x_admin_token)
+    return start_reload(payload.version)
+
+
+@app.post("/admin/models/rollback")
+def admin_rollback(x_admin_token: str | None = Header(None)) -> dict[str, Any]:
+    """직전 모델 버전으로 즉시 되돌림"""
+    _check_admin(x_admin_token)
+    rollback()
+    return models_status()
+
+
+# 프로파일러도 _check_admin으로 보호 (시작/중지는 워커 CPU를 쓰고, folded 덤프는 소스 경로·함수 이름을 드러냄)
+@app.get("/admin/profiler")
+def admin_profiler(x_admin_token: str | None = Header(None)) -> dict[str, Any]:
+    """샘플링 프로파일러 상태 + 샘플이 많은 함수 (가장 안쪽 프레임 기준)"""
+    _check_admin(x_admin_token)
+    return {**PROFILER.status(), "top_functions": PROFILER.top_functions()}
+
+
+@app.post("/admin/profiler/start", status_code=202)
+def admin_profiler_start(payload: ProfilerStartRequest, x_admin_token: str | None = Header(None)) -> dict[str, Any]:
+    """샘플링 프로파일러 시작 (이전 수집 결과는 지움)"""
+    _check_admin(x_admin_token)
+    try:
+        PROFILER.start(payload.interval_ms / 1000.0, payload.duration_s)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PROFILER.status()
+
+
+@app.post("/admin/profiler/stop")
+def admin_profiler_stop(x_admin_token: str | None = Header(None)) -> dict[str, Any]:
+    """샘플링 프로파일러 중지 (수집 결과는 유지)"""
+    _check_admin(x_admin_token)
+    PROFILER.stop()
+    return {**PROFILER.status(), "top_functions": PROFILER.top_functions()}
+
+
+@app.get("/admin/profiler/folded", response_class=PlainTextResponse)
+def admin_profiler_folded(limit: int | None = None, x_admin_token: str | None = Header(None)) -> str:
+    """수집한 스택 (folded 형식: flamegraph.pl / speedscope 입력)"""
+    _check_admin(x_admin_token)
+    return PROFILER.folded(limit)
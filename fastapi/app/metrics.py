@@ -0,0 +1,291 @@
+# 서버 지표 수집 + Prometheus 텍스트 형식 출력 (/metrics)
+#
+# 외부 의존성 없이 카운터/히스토그램/게이지만 구현한다. 값 갱신은 지표별 잠금 + dict 조회 한 번(약 0.6µs)이고
+# /predict 한 건당 약 5µs다: 고속 경로 예측(~0.2ms)의 약 3%, HTTP 요청 전체(~1ms)의 1% 미만
+# (python benchmarks/bench_metrics.py). DIABETES_METRICS=0이면 기록하지 않는다.
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from app import settings
+
+# 지연 시간 히스토그램 경계 (초): 50µs ~ 10s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+enabled = settings.METRICS
+
+
+def set_enabled(value: bool) -> None:
+    """지표 기록 on/off (오버헤드 측정용, 기존 값은 유지)"""
+    global enabled
+    enabled = bool(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    """레이블 조합별 구간 카운트 (구간별로 저장하고 출력 시 누적)"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # 레이블 → [구간별 개수(+Inf 포함)..., 합계]
+        self._series: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        # Prometheus 구간은 "le"(이하)이므로 value 이상인 첫 경계에 센다
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for labels, series in items:
+            cumulative = 0.0
+            for le, n in zip((*self.buckets, math.inf), series):
+                cumulative += n
+                bound = f'le="{_number(le)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, bound)} {_number(cumulative)}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {_number(cumulative)}"
+
+
+class Gauge:
+    """출력 시점에 callback으로 값을 읽는 게이지. callback은 숫자, {레이블 튜플: 값} 또는 None(생략)을 반환"""
+
+    def __init__(self, name: str, help: str, callback: Callable[[], object], labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def render(self) -> Iterable[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return
+        if value is None:
+            return
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for labels, v in items:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(float(v))}"
+
+
+_registry: dict[str, Counter | Histogram | Gauge] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, help, labelnames))
+
+
+def histogram(
+    name: str,
+    help: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = LATENCY_BUCKETS,
+) -> Histogram:
+    return _register(Histogram(name, help, labelnames, buckets))
+
+
+def gauge(name: str, help: str, callback: Callable[[], object], labelnames: tuple[str, ...] = ()) -> Gauge:
+    """같은 이름으로 다시 등록하면 callback만 교체"""
+    metric = _register(Gauge(name, help, callback, labelnames))
+    metric.callback = callback
+    return metric
+
+
+def render() -> str:
+    """등록된 모든 지표 → Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: list[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """단계별 소요 시간 기록: lap(단계)는 직전 lap(또는 생성) 이후 경과 시간을 그 단계로 기록"""
+
+    __slots__ = ("started", "stages", "_last")
+
+    def __init__(self):
+        self.started = self._last = time.perf_counter()
+        self.stages: list[tuple[str, float]] = []
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+
+# 예측 지표
+PREDICTIONS = counter(
+    "diabetes_predictions_total",
+    "예측 건수 (시나리오/입력모드/threshold 판정별)",
+    ("endpoint", "scenario", "input_mode", "outcome"),
+)
+PREDICTION_REJECTED = counter(
+    "diabetes_prediction_rejected_total",
+    "입력 검증 실패(400) 건수",
+    ("endpoint",),
+)
+PREDICT_STAGE_SECONDS = histogram(
+    "diabetes_predict_stage_seconds",
+    "예측 단계별 소요 시간 (validate/inference/chart/response)",
+    ("endpoint", "stage", "scenario"),
+)
+PREDICT_SECONDS = histogram(
+    "diabetes_predict_seconds",
+    "예측 요청 처리 시간 (검증~응답 생성, 직렬화 제외)",
+    ("endpoint", "scenario"),
+)
+
+
+def record_prediction(
+    endpoint: str,
+    scenario: str,
+    input_mode: str,
+    outcome: str,
+    timer: StageTimer | None = None,
+    count: int = 1,
+) -> None:
+    """예측 건수 + (timer가 있으면) 단계별/전체 소요 시간 기록"""
+    if not enabled:
+        return
+    if count:
+        PREDICTIONS.inc(endpoint, scenario, input_mode, outcome, amount=count)
+    if timer is not None:
+        for stage, seconds in timer.stages:
+            PREDICT_STAGE_SECONDS.observe(seconds, endpoint, stage, scenario)
+        PREDICT_SECONDS.observe(timer.total(), endpoint, scenario)
+
+
+def record_stage(endpoint: str, stage: str, scenario: str, seconds: float) -> None:
+    """요청 흐름 밖에서 따로 실행된 단계 (예: 차트 실행기에서 그린 차트)"""
+    if enabled:
+        PREDICT_STAGE_SECONDS.observe(seconds, endpoint, stage, scenario)
+
+
+def record_rejected(endpoint: str, count: int = 1) -> None:
+    if enabled and count:
+        PREDICTION_REJECTED.inc(endpoint, amount=count)
+
+
+# 지오코딩 지표
+GEOCODE_REQUESTS = counter(
+    "diabetes_geocode_requests_total",
+    "지오코딩 요청 수 (source: cache/coalesced/backend, outcome: found/not_found/unavailable/saturated)",
+    ("source", "outcome"),
+)
+GEOCODE_SECONDS = histogram(
+    "diabetes_geocode_seconds",
+    "지오코딩 요청 처리 시간",
+    ("source",),
+)
+GEOCODE_BACKEND_SECONDS = histogram(
+    "diabetes_geocode_backend_seconds",
+    "지오코딩 백엔드 호출 시간 (nominatim: 스로틀 대기 제외 HTTP 왕복, gazetteer: 로컬 색인 조회)",
+    ("backend", "status"),
+)
+GEOCODE_THROTTLE_SECONDS = histogram(
+    "diabetes_geocode_throttle_wait_seconds",
+    "Nominatim 요청 간격 제한으로 대기한 시간",
+)
+
+
+def record_geocode(source: str, outcome: str, seconds: float) -> None:
+    if enabled:
+        GEOCODE_REQUESTS.inc(source, outcome)
+        GEOCODE_SECONDS.observe(seconds, source)
+
+
+def record_geocode_backend(backend: str, status: str, seconds: float) -> None:
+    if enabled:
+        GEOCODE_BACKEND_SECONDS.observe(seconds, backend, status)
+
+
+def record_geocode_throttle(seconds: float) -> None:
+    if enabled:
+        GEOCODE_THROTTLE_SECONDS.observe(seconds)
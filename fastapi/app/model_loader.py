@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import json
+import mmap
+import os
+import struct
+import threading
+import zipfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import joblib
+import numpy as np
+
+from app import metrics, settings
+from app.grading import grade
 
 APP_DIR = Path(__file__).resolve().parent
 
@@ -37,49 +49,339 @@ FEATURE_RANGES = {
     "pregnancies": (0.0, 17.0),
 }
 
-def _load_required(path: Path, label: str):
+def _load_json(path: Path):
     if not path.exists():
-        raise FileNotFoundError(f"{label} 파일을 찾을 수 없습니다: {path}")
-    return joblib.load(path)
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _load_optional(path: Path):
-    if not path.exists():
+def rss_bytes() -> int | None:
+    """현재 프로세스 RSS (Linux /proc 기준, 그 외 None)"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
         return None
-    return joblib.load(path)
 
 
-def _load_json(path: Path):
-    if not path.exists():
-        return None
-    return json.loads(path.read_text(encoding="utf-8"))
+# 아티팩트 이름 → (파일명, 필수 여부)
+ARTIFACT_FILES: dict[str, tuple[str, bool]] = {
+    # 4-시나리오 아티팩트 (A/B/C/C-NS)
+    "MODEL_DETAIL_SUGAR": ("a_detail_sugar_model.joblib", False),
+    "SCALER_DETAIL_SUGAR": ("a_detail_sugar_scaler.joblib", False),
+    "IMPUTER_DETAIL_SUGAR": ("a_detail_sugar_imputer.joblib", False),
+    "CLIP_BOUNDS_DETAIL_SUGAR": ("a_detail_sugar_clip_bounds.joblib", False),
+    "MODEL_DETAIL_NO_SUGAR": ("b_detail_no_sugar_model.joblib", False),
+    "SCALER_DETAIL_NO_SUGAR": ("b_detail_no_sugar_scaler.joblib", False),
+    "IMPUTER_DETAIL_NO_SUGAR": ("b_detail_no_sugar_imputer.joblib", False),
+    "CLIP_BOUNDS_DETAIL_NO_SUGAR": ("b_detail_no_sugar_clip_bounds.joblib", False),
+    "MODEL_SIMPLE_SUGAR": ("c_simple_sugar_model.joblib", False),
+    "QUANTILES_SIMPLE_SUGAR": ("c_simple_sugar_quantiles.joblib", False),
+    "MODEL_SIMPLE_NO_SUGAR": ("cns_simple_no_sugar_model.joblib", False),
+    "QUANTILES_SIMPLE_NO_SUGAR": ("cns_simple_no_sugar_quantiles.joblib", False),
+    # 런타임 기본 모델 (기존 API 호환)
+    "MODEL_SUGAR": ("model_sugar.joblib", True),
+    "MODEL_NO_SUGAR": ("model_no_sugar.joblib", True),
+}
 
+_REQUIRED_LABELS = {
+    "MODEL_SUGAR": "혈당 포함 모델",
+    "MODEL_NO_SUGAR": "혈당 미포함 모델",
+}
 
-# ---------------------------------------------------------------------------
-# 4-시나리오 아티팩트 (A/B/C/C-NS)
-# ---------------------------------------------------------------------------
-MODEL_DETAIL_SUGAR = _load_optional(APP_DIR / "a_detail_sugar_model.joblib")
-SCALER_DETAIL_SUGAR = _load_optional(APP_DIR / "a_detail_sugar_scaler.joblib")
-IMPUTER_DETAIL_SUGAR = _load_optional(APP_DIR / "a_detail_sugar_imputer.joblib")
-CLIP_BOUNDS_DETAIL_SUGAR = _load_optional(APP_DIR / "a_detail_sugar_clip_bounds.joblib")
 
-MODEL_DETAIL_NO_SUGAR = _load_optional(APP_DIR / "b_detail_no_sugar_model.joblib")
-SCALER_DETAIL_NO_SUGAR = _load_optional(APP_DIR / "b_detail_no_sugar_scaler.joblib")
-IMPUTER_DETAIL_NO_SUGAR = _load_optional(APP_DIR / "b_detail_no_sugar_imputer.joblib")
-CLIP_BOUNDS_DETAIL_NO_SUGAR = _load_optional(APP_DIR / "b_detail_no_sugar_clip_bounds.joblib")
+class ArtifactRegistry:
+    """joblib 아티팩트 지연 로딩 레지스트리
 
-MODEL_SIMPLE_SUGAR = _load_optional(APP_DIR / "c_simple_sugar_model.joblib")
-QUANTILES_SIMPLE_SUGAR = _load_optional(APP_DIR / "c_simple_sugar_quantiles.joblib")
+    - get(name): 처음 사용할 때 로드 (아티팩트별 lock으로 중복 로드 방지)
+    - load_all(max_workers): 시작 시 스레드 풀에서 병렬로 미리 로드
+    - mmap_mode를 주면 피클 안의 큰 NumPy 배열(SVM 서포트 벡터, KNN 학습 행렬 등)을
+      파일 메모리 매핑으로 읽어, fork된 워커들이 같은 페이지를 공유한다.
+    """
 
-MODEL_SIMPLE_NO_SUGAR = _load_optional(APP_DIR / "cns_simple_no_sugar_model.joblib")
-QUANTILES_SIMPLE_NO_SUGAR = _load_optional(APP_DIR / "cns_simple_no_sugar_quantiles.joblib")
-SCENARIO_META = _load_json(APP_DIR / "model_scenarios_meta.json")
+    def __init__(
+        self,
+        base_dir: Path,
+        files: dict[str, tuple[str, bool]],
+        mmap_mode: str | None = "c",
+        check_required: bool = True,
+    ):
+        self.base_dir = base_dir
+        self.files = files
+        self.mmap_mode = mmap_mode
+        self._values: dict[str, object] = {}
+        self._stats: dict[str, dict] = {}
+        self._locks = {name: threading.Lock() for name in files}
+
+        # 필수 아티팩트는 로드 전에 존재 여부만 확인 (기존 import 시점 오류와 동일)
+        for name, (filename, required) in files.items():
+            path = base_dir / filename
+            if check_required and required and not path.exists():
+                label = _REQUIRED_LABELS.get(name, name)
+                raise FileNotFoundError(f"{label} 파일을 찾을 수 없습니다: {path}")
+
+    def get(self, name: str):
+        if name in self._values:
+            return self._values[name]
+        with self._locks[name]:
+            if name not in self._values:
+                self._values[name] = self._load(name)
+        return self._values[name]
+
+    def _load(self, name: str):
+        filename, _required = self.files[name]
+        path = self.base_dir / filename
+        if not path.exists():
+            self._stats[name] = {"file": filename, "loaded": False}
+            return None
+        rss_before = rss_bytes()
+        started = time.perf_counter()
+        import joblib  # 첫 아티팩트 로드 시 import (컴파일 번들만 쓰면 sklearn/joblib을 import하지 않음)
+
+        value = joblib.load(path, mmap_mode=self.mmap_mode)
+        elapsed = time.perf_counter() - started
+        rss_after = rss_bytes()
+        self._stats[name] = {
+            "file": filename,
+            "loaded": True,
+            "type": _typename(value),
+            "file_bytes": path.stat().st_size,
+            "load_seconds": round(elapsed, 6),
+            # 병렬 로드 중에는 다른 아티팩트의 증가분이 섞일 수 있는 근사값
+            "rss_delta_bytes": None if rss_before is None or rss_after is None else rss_after - rss_before,
+            "mmap_mode": self.mmap_mode,
+        }
+        return value
+
+    def load_all(self, max_workers: int = 4) -> None:
+        # 여러 스레드가 동시에 unpickle하면서 sklearn 하위 패키지를 처음 import하면 서로의 모듈 lock을 기다려
+        # _DeadlockError가 날 수 있으므로, 학습 스크립트가 저장하는 estimator 모듈을 먼저 한 스레드에서 import
+        if max_workers > 1:
+            import importlib
+
+            for module in _PICKLED_MODULES:
+                importlib.import_module(module)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            list(pool.map(self.get, self.files))
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._values
+
+    def stats(self) -> dict[str, dict]:
+        return {name: self._stats.get(name, {"file": self.files[name][0], "loaded": False}) for name in self.files}
+
+
+# 아티팩트 pickle이 참조하는 sklearn 모듈 (scripts/train_four_scenarios.py, model_selection.py 후보와 전처리기)
+_PICKLED_MODULES = (
+    "sklearn.ensemble",
+    "sklearn.impute",
+    "sklearn.linear_model",
+    "sklearn.neighbors",
+    "sklearn.neural_network",
+    "sklearn.preprocessing",
+    "sklearn.svm",
+    "sklearn.tree",
+)
+
+
+def _typename(obj) -> str:
+    return type(obj).__name__ if obj is not None else "None"
+
+
+META_FILENAME = "model_scenarios_meta.json"
+# scripts/compile_artifacts.py가 만드는 고속 추론 배열 번들 (버전 해시 계산에는 포함하지 않음)
+COMPILED_BUNDLE_FILENAME = "compiled_scenarios.npz"
+# 번들 배열 구성 버전 (app/fast_inference.py의 저장 형식이 바뀌면 올린다)
+COMPILED_BUNDLE_FORMAT = 1
+
+
+def read_npz(path: Path, use_mmap: bool) -> dict[str, np.ndarray]:
+    """npz 번들 → {이름: 배열}
+
+    use_mmap이면 파일을 읽기 전용으로 메모리 매핑하고 배열을 그 위의 view로 만든다(np.savez는 무압축 저장).
+    같은 파일을 매핑한 모든 워커 프로세스가 페이지 캐시를 그대로 공유하므로 워커 수만큼 복사본이 생기지 않는다.
+    """
+    if not use_mmap:
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    with open(path, "rb") as f, zipfile.ZipFile(f) as zf:
+        infos = zf.infolist()
+        if any(info.compress_type != zipfile.ZIP_STORED for info in infos):
+            return read_npz(path, use_mmap=False)
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    arrays = {}
+    for info in infos:
+        # 로컬 파일 헤더(30바이트 + 이름 + extra) 뒤가 .npy 데이터
+        name_len, extra_len = struct.unpack("<HH", buf[info.header_offset + 26 : info.header_offset + 30])
+        start = info.header_offset + 30 + name_len + extra_len
+        header = io.BytesIO(buf[start : start + min(info.file_size, 4096)])
+        version = np.lib.format.read_magic(header)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(header)
+        arrays[info.filename.removesuffix(".npy")] = np.ndarray(
+            shape, dtype=dtype, buffer=buf, offset=start + header.tell(), order="F" if fortran_order else "C"
+        )
+    return arrays
+
+
+def model_version(base_dir: Path, meta: dict | None) -> str:
+    """메타의 version 값, 없으면 메타+아티팩트 파일 내용 해시(sha256 앞 12자리)"""
+    if meta and meta.get("version"):
+        return str(meta["version"])
+    digest = hashlib.sha256()
+    for filename in sorted([META_FILENAME, *(f for f, _ in ARTIFACT_FILES.values())]):
+        path = base_dir / filename
+        if path.exists():
+            digest.update(filename.encode("utf-8"))
+            digest.update(path.read_bytes())
+    return f"sha-{digest.hexdigest()[:12]}"
+
+
+class ModelSet:
+    """한 디렉터리(= 한 버전)의 아티팩트 + model_scenarios_meta.json 묶음
+
+    요청은 처리 시작 시 현재 ModelSet 하나를 잡고 끝까지 그것만 사용하므로,
+    처리 도중 버전이 교체되어도 한 요청 안에서 버전이 섞이지 않는다.
+    """
+
+    def __init__(self, base_dir: Path, mmap_mode: str | None = "c", require_runtime: bool = True):
+        self.base_dir = Path(base_dir)
+        # require_runtime=False: 런타임 기본 모델(model_sugar/model_no_sugar) 없이 시나리오 아티팩트만 다룰 때 (번들 컴파일)
+        self.registry = ArtifactRegistry(
+            self.base_dir, ARTIFACT_FILES, mmap_mode=mmap_mode, check_required=require_runtime
+        )
+        self.meta = _load_json(self.base_dir / META_FILENAME)
+        self.version = model_version(self.base_dir, self.meta)
+        self.created_at = time.time()
+        # predictor가 채우는 시나리오별 고속 추론 객체 (버전마다 별도)
+        self.compiled: dict[str, object] = {}
+        self.compile_lock = threading.Lock()
+        self._bundle: dict[str, np.ndarray] | None = None
+        self._bundle_checked = False
+
+    def bundle(self) -> dict[str, np.ndarray] | None:
+        """이 버전용 컴파일 번들 배열 (없거나 다른 버전에서 만든 번들이면 None). compile_lock 안에서 호출
+
+        DIABETES_MODEL_MMAP이면 읽기 전용 메모리 매핑 view (워커 간 공유).
+        """
+        if not self._bundle_checked:
+            self._bundle_checked = True
+            path = self.base_dir / COMPILED_BUNDLE_FILENAME
+            if path.exists():
+                arrays = read_npz(path, use_mmap=self.registry.mmap_mode is not None)
+                built_for = (str(arrays.get("version")), int(arrays.get("format", -1)))
+                if built_for == (self.version, COMPILED_BUNDLE_FORMAT):
+                    self._bundle = arrays
+                else:
+                    print(f"[WARN] {path.name}: 다른 버전/형식용 번들이라 사용하지 않습니다 {built_for}")
+        return self._bundle
+
+    def get(self, name: str):
+        return self.registry.get(name)
+
+    def load_all(self, max_workers: int = 4) -> None:
+        self.registry.load_all(max_workers)
+
+    def threshold(self, key: str) -> float:
+        if not self.meta:
+            return 0.5
+        scenario = self.meta.get("scenarios", {}).get(key)
+        if not scenario:
+            return 0.5
+        try:
+            return float(scenario.get("threshold", 0.5))
+        except Exception:
+            return 0.5
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "path": str(self.base_dir),
+            "created_at": self.created_at,
+            "loaded": sum(1 for name in ARTIFACT_FILES if self.registry.is_loaded(name)),
+        }
+
+
+class ModelStore:
+    """현재/직전 버전 ModelSet 보관
+
+    교체(swap)와 롤백은 참조 대입으로 이뤄져 읽는 쪽(요청 스레드)은 lock 없이 current를 읽는다.
+    직전 버전은 메모리에 남겨 즉시 롤백할 수 있게 한다.
+    """
+
+    def __init__(self, initial: ModelSet):
+        self._current = initial
+        self._previous: ModelSet | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> ModelSet:
+        return self._current
+
+    @property
+    def previous(self) -> ModelSet | None:
+        return self._previous
+
+    def swap(self, new: ModelSet) -> ModelSet:
+        """new를 현재 버전으로 교체하고 기존 현재 버전을 직전 버전으로 보관"""
+        with self._lock:
+            self._previous, self._current = self._current, new
+        return new
+
+    def rollback(self) -> ModelSet:
+        """직전 버전으로 되돌림 (현재 버전은 직전 버전 자리로). 직전 버전이 없으면 LookupError"""
+        with self._lock:
+            if self._previous is None:
+                raise LookupError("롤백할 이전 모델 버전이 없습니다.")
+            self._previous, self._current = self._current, self._previous
+            return self._current
+
+
+def new_model_set(base_dir: Path) -> ModelSet:
+    return ModelSet(base_dir, mmap_mode="c" if settings.MODEL_MMAP else None)
+
+
+MODELS = ModelStore(new_model_set(settings.MODEL_DIR or APP_DIR))
+
+metrics.gauge(
+    "diabetes_model_info",
+    "현재 서빙 중인 모델 버전 (값은 항상 1)",
+    lambda: {(MODELS.current.version,): 1},
+    ("version",),
+)
+metrics.gauge("diabetes_process_rss_bytes", "프로세스 RSS (bytes)", rss_bytes)
+
+
+def get_artifact(name: str):
+    """현재 버전 아티팩트 조회 (첫 사용 시 로드). 파일이 없는 선택 아티팩트는 None"""
+    return MODELS.current.get(name)
+
+
+def load_all_artifacts(models: ModelSet | None = None) -> None:
+    """모든 아티팩트를 스레드 풀에서 미리 로드 (DIABETES_MODEL_LOAD=eager, 핫 리로드)"""
+    models = models or MODELS.current
+    models.load_all(settings.MODEL_LOAD_WORKERS)
+    print(
+        f"[모델 로드 완료] version={models.version}, "
+        f"default_sugar={_typename(models.get('MODEL_SUGAR'))}, "
+        f"default_no_sugar={_typename(models.get('MODEL_NO_SUGAR'))}, "
+        f"A={_typename(models.get('MODEL_DETAIL_SUGAR'))}, "
+        f"B={_typename(models.get('MODEL_DETAIL_NO_SUGAR'))}, "
+        f"C={_typename(models.get('MODEL_SIMPLE_SUGAR'))}, "
+        f"C_NS={_typename(models.get('MODEL_SIMPLE_NO_SUGAR'))}"
+    )
+
+
+def __getattr__(name: str):
+    # 구버전 호환: from app.model_loader import MODEL_SUGAR 등 모듈 속성 접근 시 현재 버전에서 지연 로드
+    if name in ARTIFACT_FILES:
+        return get_artifact(name)
+    if name == "REGISTRY":
+        return MODELS.current.registry
+    if name == "SCENARIO_META":
+        return MODELS.current.meta
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# ---------------------------------------------------------------------------
-# 런타임 기본 모델 (기존 API 호환)
-# ---------------------------------------------------------------------------
-MODEL_SUGAR = _load_required(APP_DIR / "model_sugar.joblib", "혈당 포함 모델")
-MODEL_NO_SUGAR = _load_required(APP_DIR / "model_no_sugar.joblib", "혈당 미포함 모델")
 
 # ---------------------------------------------------------------------------
 # Legacy 표준화 fallback (신규 scaler/imputer가 없을 때만 사용)
@@ -98,40 +400,9 @@ def standardize(feature: str, raw_value: float) -> float:
 
 
 def to_simple_grade(feature_eng: str, value: float, quantiles: dict[str, list[float]]) -> int:
-    """간편(C/C-NS) 시나리오용 분위수 등급화 (1~4)"""
-    feature_kor = FEATURE_LABELS[feature_eng]
-    q = quantiles[feature_kor]
-    if value <= q[0]:
-        return 1
-    if value <= q[1]:
-        return 2
-    if value <= q[2]:
-        return 3
-    return 4
+    """간편(C/C-NS) 시나리오용 분위수 등급화 (1~4). 여러 값은 app.grading.grade/grade_matrix 사용"""
+    return int(grade([value], quantiles[FEATURE_LABELS[feature_eng]])[0])
 
 
 def get_scenario_threshold(key: str) -> float:
-    if not SCENARIO_META:
-        return 0.5
-    scenario = SCENARIO_META.get("scenarios", {}).get(key)
-    if not scenario:
-        return 0.5
-    try:
-        return float(scenario.get("threshold", 0.5))
-    except Exception:
-        return 0.5
-
-
-def _typename(obj) -> str:
-    return type(obj).__name__ if obj is not None else "None"
-
-
-print(
-    "[모델 로드 완료] "
-    f"default_sugar={_typename(MODEL_SUGAR)}, "
-    f"default_no_sugar={_typename(MODEL_NO_SUGAR)}, "
-    f"A={_typename(MODEL_DETAIL_SUGAR)}, "
-    f"B={_typename(MODEL_DETAIL_NO_SUGAR)}, "
-    f"C={_typename(MODEL_SIMPLE_SUGAR)}, "
-    f"C_NS={_typename(MODEL_SIMPLE_NO_SUGAR)}"
-)
+    return MODELS.current.threshold(key)
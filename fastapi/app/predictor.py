@@ -1,134 +1,98 @@
-# 혈당 유무에 따라 모델을 분기하여 예측 + 차트 생성
+# 혈당 유무에 따라 모델을 분기하여 예측 (차트는 요청 시에만 생성)
 from __future__ import annotations
 
-import base64
-import io
+import threading
+import time
+import uuid
+from collections import OrderedDict
 
-import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 from fastapi import HTTPException
-from sklearn.impute import KNNImputer
-from sklearn.preprocessing import StandardScaler
+from pydantic import ValidationError
 
+from app import metrics, settings
+from app.chart import CHART_FIELDS, create_chart, warm_up as warm_up_charts
+from app.fast_inference import compile_scenario, load_bundled_scenario
+from app.grading import grade_matrix
 from app.model_loader import (
-    CLIP_BOUNDS_DETAIL_NO_SUGAR,
-    CLIP_BOUNDS_DETAIL_SUGAR,
     FEATURE_LABELS,
     FEATURE_RANGES,
     FEATURES_DETAIL_NO_SUGAR,
     FEATURES_DETAIL_SUGAR,
     FEATURES_SIMPLE_NO_SUGAR,
     FEATURES_SIMPLE_SUGAR,
-    IMPUTER_DETAIL_NO_SUGAR,
-    IMPUTER_DETAIL_SUGAR,
-    MODEL_DETAIL_NO_SUGAR,
-    MODEL_DETAIL_SUGAR,
-    MODEL_NO_SUGAR,
-    MODEL_SIMPLE_NO_SUGAR,
-    MODEL_SIMPLE_SUGAR,
-    MODEL_SUGAR,
-    QUANTILES_SIMPLE_NO_SUGAR,
-    QUANTILES_SIMPLE_SUGAR,
-    SCALER_DETAIL_NO_SUGAR,
-    SCALER_DETAIL_SUGAR,
-    get_scenario_threshold,
+    MODELS,
+    ModelSet,
+    load_all_artifacts,
     standardize,
-    to_simple_grade,
 )
-from app.schemas import PredictRequest, PredictResponse
+from app.schemas import ChartData, PredictBatchItem, PredictRequest, PredictResponse
 
-matplotlib.use("Agg")
-plt.rcParams["font.family"] = "AppleGothic"
-plt.rcParams["axes.unicode_minus"] = False
+# 차트 요청(/predict/{prediction_id}/chart)용 최근 예측 보관 (LRU)
+RECENT_PREDICTIONS_SIZE = 4096
+_recent_predictions: OrderedDict[str, tuple[str, float, dict[str, float], ModelSet]] = OrderedDict()
+_recent_lock = threading.Lock()
 
 
-def create_chart_base64(
-    probability: float,
-    input_values: dict[str, float],
-    model,
-    feature_names: list[str],
-) -> str:
-    """당뇨/정상 확률 + 피처 중요도(또는 입력값) 차트"""
-    fig, axes = plt.subplots(2, 1, figsize=(6, 7))
-
-    # 상단: 당뇨/정상 확률 바 차트
-    ax1 = axes[0]
-    diabetes_prob = max(0.0, min(1.0, probability))
-    normal_prob = 1.0 - diabetes_prob
-    labels = ["정상 가능성", "당뇨 가능성"]
-    values = [normal_prob, diabetes_prob]
-    colors = ["#4CAF50", "#E53935"]
-
-    bars = ax1.bar(labels, values, color=colors)
-    ax1.set_ylim(0, 1)
-    ax1.set_ylabel("확률")
-    ax1.set_title("당뇨 예측 결과 (ML 모델)")
-
-    for bar, value in zip(bars, values):
-        ax1.text(
-            bar.get_x() + bar.get_width() / 2,
-            value + 0.02,
-            f"{value * 100:.1f}%",
-            ha="center",
-            va="bottom",
-            fontsize=11,
-        )
+SCENARIO_NAMES = {
+    "A": "Scenario A (상세/수치형, 혈당 포함)",
+    "B": "Scenario B (상세/수치형, 혈당 미포함)",
+    "C": "Scenario C (간편/등급형, 혈당 포함)",
+    "C_NS": "Scenario C-NS (간편/등급형, 혈당 미포함)",
+}
+SCENARIO_INPUT_MODES = {"A": "detail", "B": "detail", "C": "simple", "C_NS": "simple"}
 
-    # 하단: 피처 중요도 또는 입력값
-    ax2 = axes[1]
-    chart_labels = [FEATURE_LABELS.get(k, k) for k in feature_names]
-
-    if hasattr(model, "feature_importances_"):
-        importances = model.feature_importances_
-        imp_colors = [
-            "#1976D2" if imp < 0.1 else "#FF9800" if imp < 0.2 else "#E53935"
-            for imp in importances
-        ]
-        bars2 = ax2.barh(chart_labels, importances, color=imp_colors)
-        ax2.set_xlim(0, max(importances) * 1.3)
-        ax2.set_xlabel("중요도")
-        ax2.set_title("피처 중요도 (Feature Importance)")
-        ax2.invert_yaxis()
-        for bar, imp in zip(bars2, importances):
-            ax2.text(
-                imp + 0.005,
-                bar.get_y() + bar.get_height() / 2,
-                f"{imp:.3f}",
-                ha="left",
-                va="center",
-                fontsize=9,
-            )
-    else:
-        input_vals = [input_values.get(k, 0.0) for k in feature_names]
-        bar_colors = ["#1976D2" if v > 0 else "#9E9E9E" for v in input_vals]
-        bars2 = ax2.barh(chart_labels, input_vals, color=bar_colors)
-        ax2.set_xlabel("입력값")
-        ax2.set_title("입력 항목별 수치")
-        ax2.invert_yaxis()
-        for bar, val in zip(bars2, input_vals):
-            if val > 0:
-                ax2.text(
-                    val + 0.5,
-                    bar.get_y() + bar.get_height() / 2,
-                    f"{val:.1f}",
-                    ha="left",
-                    va="center",
-                    fontsize=9,
-                )
 
-    fig.tight_layout()
+def _scenario_config(key: str, models: ModelSet | None = None) -> dict:
+    """시나리오 키 → 피처/모델/전처리 아티팩트 묶음 (아티팩트는 첫 사용 시 로드)
 
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("utf-8")
+    models를 주지 않으면 현재 버전(MODELS.current)을 사용한다.
+    """
+    get_artifact = (models or MODELS.current).get
+    if key == "A":
+        return {
+            "mode": "detail",
+            "feature_names": FEATURES_DETAIL_SUGAR,
+            "model": get_artifact("MODEL_DETAIL_SUGAR") or get_artifact("MODEL_SUGAR"),
+            "scaler": get_artifact("SCALER_DETAIL_SUGAR"),
+            "imputer": get_artifact("IMPUTER_DETAIL_SUGAR"),
+            "clip_bounds": get_artifact("CLIP_BOUNDS_DETAIL_SUGAR"),
+        }
+    if key == "B":
+        return {
+            "mode": "detail",
+            "feature_names": FEATURES_DETAIL_NO_SUGAR,
+            "model": get_artifact("MODEL_DETAIL_NO_SUGAR") or get_artifact("MODEL_NO_SUGAR"),
+            "scaler": get_artifact("SCALER_DETAIL_NO_SUGAR"),
+            "imputer": get_artifact("IMPUTER_DETAIL_NO_SUGAR"),
+            "clip_bounds": get_artifact("CLIP_BOUNDS_DETAIL_NO_SUGAR"),
+        }
+    if key == "C":
+        return {
+            "mode": "simple",
+            "feature_names": FEATURES_SIMPLE_SUGAR,
+            "model": get_artifact("MODEL_SIMPLE_SUGAR") or get_artifact("MODEL_SUGAR"),
+            "quantiles": get_artifact("QUANTILES_SIMPLE_SUGAR"),
+        }
+    return {
+        "mode": "simple",
+        "feature_names": FEATURES_SIMPLE_NO_SUGAR,
+        "model": get_artifact("MODEL_SIMPLE_NO_SUGAR") or get_artifact("MODEL_NO_SUGAR"),
+        "quantiles": get_artifact("QUANTILES_SIMPLE_NO_SUGAR"),
+    }
 
 
-def predict_with_model(payload: PredictRequest) -> PredictResponse:
-    """입력모드(detail/simple) + 혈당 유무에 따라 모델 분기 예측"""
+# 시나리오 → 피처 목록 (검증 단계에서 아티팩트를 로드하지 않도록 분리)
+SCENARIO_FEATURES = {
+    "A": FEATURES_DETAIL_SUGAR,
+    "B": FEATURES_DETAIL_NO_SUGAR,
+    "C": FEATURES_SIMPLE_SUGAR,
+    "C_NS": FEATURES_SIMPLE_NO_SUGAR,
+}
+
+
+def _resolve_scenario(payload: PredictRequest) -> tuple[str, dict[str, float]]:
+    """입력 검증 + 시나리오(A/B/C/C_NS) 결정. 잘못된 입력은 HTTPException(400)"""
 
     # 입력값 수집 (영문 키 기준)
     raw_input: dict[str, float | None] = {
@@ -160,109 +124,430 @@ def predict_with_model(payload: PredictRequest) -> PredictResponse:
     if mode not in ("detail", "simple"):
         raise HTTPException(status_code=400, detail="입력모드는 detail 또는 simple 이어야 합니다.")
 
-    # 피처에 해당하는 값이 최소 1개는 있어야 함
     if mode == "simple":
-        if has_glucose:
-            feature_names = FEATURES_SIMPLE_SUGAR
-            model = MODEL_SIMPLE_SUGAR or MODEL_SUGAR
-            quantiles = QUANTILES_SIMPLE_SUGAR
-            used_model_name = "Scenario C (간편/등급형, 혈당 포함)"
-            threshold = get_scenario_threshold("C")
-        else:
-            feature_names = FEATURES_SIMPLE_NO_SUGAR
-            model = MODEL_SIMPLE_NO_SUGAR or MODEL_NO_SUGAR
-            quantiles = QUANTILES_SIMPLE_NO_SUGAR
-            used_model_name = "Scenario C-NS (간편/등급형, 혈당 미포함)"
-            threshold = get_scenario_threshold("C_NS")
-
-        active_count = sum(1 for k in feature_names if k in user_provided)
-        if active_count == 0:
-            raise HTTPException(
-                status_code=400,
-                detail=f"현재 모델에서 사용하는 항목이 입력되지 않았습니다. 필요 항목: {', '.join(feature_names)}",
-            )
+        key = "C" if has_glucose else "C_NS"
+    else:
+        key = "A" if has_glucose else "B"
+
+    # 피처에 해당하는 값이 최소 1개는 있어야 함
+    feature_names = SCENARIO_FEATURES[key]
+    active_count = sum(1 for k in feature_names if k in user_provided)
+    if active_count == 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"현재 모델에서 사용하는 항목이 입력되지 않았습니다. 필요 항목: {', '.join(feature_names)}",
+        )
+
+    return key, user_provided
+
+
+# 일괄 입력(CLI 등) 값 행렬의 컬럼 순서
+INPUT_FEATURES = ["pregnancies", "glucose", "bmi", "age"]
+
+
+def resolve_scenarios(values: np.ndarray, modes) -> tuple[np.ndarray, np.ndarray]:
+    """_resolve_scenario의 벡터화 버전 (검증 순서/오류 메시지 동일)
+
+    values: (행, INPUT_FEATURES) 값 행렬, NaN은 미입력 / modes: 행별 입력모드 (None/빈 값은 detail)
+    반환: (시나리오 키 배열, 오류 메시지 배열). 오류 행의 키는 "", 정상 행의 메시지는 None
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    provided = ~np.isnan(values)
+    errors = np.full(n, None, dtype=object)
+    ok = np.ones(n, dtype=bool)
+
+    def fail(rows: np.ndarray, message: str) -> None:
+        rows = rows & ok
+        errors[rows] = message
+        ok[rows] = False
+
+    fail(~provided.any(axis=1), "최소 1개 이상의 입력 항목이 필요합니다.")
+    for j, f in enumerate(INPUT_FEATURES):
+        min_v, max_v = FEATURE_RANGES[f]
+        with np.errstate(invalid="ignore"):
+            out_of_range = provided[:, j] & ((values[:, j] < min_v) | (values[:, j] > max_v))
+        fail(out_of_range, f"{FEATURE_LABELS.get(f, f)}({f}) 값은 {min_v} ~ {max_v} 범위여야 합니다.")
+
+    modes = np.array([(m or "detail").lower().strip() if isinstance(m, str) else "detail" for m in modes], dtype=object)
+    fail(~np.isin(modes, ["detail", "simple"]), "입력모드는 detail 또는 simple 이어야 합니다.")
 
+    has_glucose = provided[:, INPUT_FEATURES.index("glucose")]
+    simple = modes == "simple"
+    keys = np.where(simple, np.where(has_glucose, "C", "C_NS"), np.where(has_glucose, "A", "B")).astype(object)
+    for key, feature_names in SCENARIO_FEATURES.items():
+        cols = [INPUT_FEATURES.index(f) for f in feature_names]
+        fail(
+            (keys == key) & ~provided[:, cols].any(axis=1),
+            f"현재 모델에서 사용하는 항목이 입력되지 않았습니다. 필요 항목: {', '.join(feature_names)}",
+        )
+    keys[~ok] = ""
+    return keys, errors
+
+
+def _raw_matrix(feature_names: list[str], rows: list[dict[str, float]]) -> np.ndarray:
+    """입력 dict 목록 → (행, 피처) 원시값 행렬. 미입력은 0.0"""
+    return np.array([[row.get(f, 0.0) for f in feature_names] for row in rows], dtype=float)
+
+
+def _build_features(key: str, raw: np.ndarray, models: ModelSet) -> tuple[object, float]:
+    """같은 시나리오 원시값 행렬을 한 번에 전처리 → (모델 입력 행렬, threshold)"""
+    # sklearn 경로에서만 필요 (고속 경로만 쓰는 동안에는 import하지 않음)
+    import pandas as pd
+    from sklearn.impute import KNNImputer
+    from sklearn.preprocessing import StandardScaler
+
+    cfg = _scenario_config(key, models)
+    feature_names = cfg["feature_names"]
+    threshold = models.threshold(key)
+
+    if cfg["mode"] == "simple":
+        quantiles = cfg["quantiles"]
         # quantiles가 있으면 노트북 방식(등급화) 적용, 없으면 fallback
         if quantiles:
-            row = {
-                FEATURE_LABELS[f]: float(
-                    to_simple_grade(f, user_provided.get(f, 0.0), quantiles)
-                )
-                for f in feature_names
-            }
-            X = pd.DataFrame([row])
-        else:
-            x_values = [standardize(f, user_provided.get(f, 0.0)) for f in feature_names]
-            X = np.array([x_values], dtype=float)
-    else:
-        if has_glucose:
-            feature_names = FEATURES_DETAIL_SUGAR
-            model = MODEL_DETAIL_SUGAR or MODEL_SUGAR
-            scaler = SCALER_DETAIL_SUGAR
-            imputer = IMPUTER_DETAIL_SUGAR
-            used_model_name = "Scenario A (상세/수치형, 혈당 포함)"
-            clip_bounds = CLIP_BOUNDS_DETAIL_SUGAR
-            threshold = get_scenario_threshold("A")
+            cols_kor = [FEATURE_LABELS[f] for f in feature_names]
+            grades = grade_matrix(raw, [quantiles[c] for c in cols_kor])
+            X = pd.DataFrame(grades.astype(float), columns=cols_kor)
         else:
-            feature_names = FEATURES_DETAIL_NO_SUGAR
-            model = MODEL_DETAIL_NO_SUGAR or MODEL_NO_SUGAR
-            scaler = SCALER_DETAIL_NO_SUGAR
-            imputer = IMPUTER_DETAIL_NO_SUGAR
-            used_model_name = "Scenario B (상세/수치형, 혈당 미포함)"
-            clip_bounds = CLIP_BOUNDS_DETAIL_NO_SUGAR
-            threshold = get_scenario_threshold("B")
-
-        active_count = sum(1 for k in feature_names if k in user_provided)
-        if active_count == 0:
-            raise HTTPException(
-                status_code=400,
-                detail=f"현재 모델에서 사용하는 항목이 입력되지 않았습니다. 필요 항목: {', '.join(feature_names)}",
+            X = np.array(
+                [[standardize(f, v) for f, v in zip(feature_names, row)] for row in raw],
+                dtype=float,
             )
+        return X, threshold
 
-        # 신규 상세 모델 전처리(Scaler + Imputer)가 존재하면 우선 사용
-        if isinstance(scaler, StandardScaler) and isinstance(imputer, KNNImputer):
-            raw_row = []
-            for f in feature_names:
-                v = user_provided.get(f)
-                if v is None or float(v) == 0.0:
-                    raw_row.append(np.nan)
-                else:
-                    raw_row.append(float(v))
-            cols_kor = [FEATURE_LABELS[f] for f in feature_names]
-            x_raw = pd.DataFrame([raw_row], columns=cols_kor)
-            if isinstance(clip_bounds, dict):
-                for c in cols_kor:
-                    if c in clip_bounds:
-                        low, up = clip_bounds[c]
-                        x_raw[c] = x_raw[c].clip(low, up)
-            x_scaled = scaler.transform(x_raw)
-            X = imputer.transform(x_scaled)
-        else:
-            # legacy fallback
-            x_values = [standardize(f, user_provided.get(f, 0.0)) for f in feature_names]
-            X = np.array([x_values], dtype=float)
-            threshold = 0.5
-
-    # 예측
-    proba = model.predict_proba(X)[0]
-    probability = float(proba[1])
-    prediction = int(probability >= threshold)
-    label = "당뇨 위험" if prediction == 1 else "정상 범위"
+    scaler = cfg["scaler"]
+    imputer = cfg["imputer"]
+    clip_bounds = cfg["clip_bounds"]
 
-    # 차트 생성
-    chart_image_base64: str | None = None
-    try:
-        chart_image_base64 = create_chart_base64(
-            probability, user_provided, model, feature_names,
+    # 신규 상세 모델 전처리(Scaler + Imputer)가 존재하면 우선 사용
+    if isinstance(scaler, StandardScaler) and isinstance(imputer, KNNImputer):
+        # 미입력/0 입력은 결측(NaN)으로 처리
+        x_raw = raw.copy()
+        x_raw[x_raw == 0.0] = np.nan
+        cols_kor = [FEATURE_LABELS[f] for f in feature_names]
+        if isinstance(clip_bounds, dict):
+            for j, c in enumerate(cols_kor):
+                if c in clip_bounds:
+                    low, up = clip_bounds[c]
+                    x_raw[:, j] = np.clip(x_raw[:, j], low, up)
+        x_scaled = scaler.transform(pd.DataFrame(x_raw, columns=cols_kor))
+        X = imputer.transform(x_scaled)
+    else:
+        # legacy fallback
+        X = np.array(
+            [[standardize(f, v) for f, v in zip(feature_names, row)] for row in raw],
+            dtype=float,
         )
+        threshold = 0.5
+    return X, threshold
+
+
+def predict_proba_raw(
+    key: str,
+    raw: np.ndarray,
+    fast: bool | None = None,
+    models: ModelSet | None = None,
+    cached: bool = True,
+) -> tuple[np.ndarray, float]:
+    """시나리오 원시값 행렬 → (당뇨 확률 배열, threshold)
+
+    fast가 None이면 settings.FAST_INFERENCE를 따른다. 고속 경로를 지원하지 않는
+    시나리오(legacy 아티팩트 등)는 항상 sklearn 경로로 계산한다.
+    models를 주지 않으면 현재 버전을 사용한다. cached=False면 결과 캐시를 거치지 않는다(대용량 일괄 처리).
+    """
+    models = models or MODELS.current
+    if fast is None:
+        fast = settings.FAST_INFERENCE
+    compiled = compiled_scenario(key, models) if fast else None
+    if compiled is not None:
+        return compiled.predict_proba(raw, cached=cached), models.threshold(key)
+    X, threshold = _build_features(key, raw, models)
+    return _scenario_config(key, models)["model"].predict_proba(X)[:, 1], threshold
+
+
+def _remember(key: str, probability: float, user_provided: dict[str, float], models: ModelSet) -> str:
+    prediction_id = uuid.uuid4().hex
+    with _recent_lock:
+        _recent_predictions[prediction_id] = (key, probability, user_provided, models)
+        if len(_recent_predictions) > RECENT_PREDICTIONS_SIZE:
+            _recent_predictions.popitem(last=False)
+    return prediction_id
+
+
+def _chart_or_none(
+    key: str,
+    probability: float,
+    user_provided: dict[str, float],
+    models: ModelSet,
+    chart_format: str = "png",
+) -> str | ChartData | None:
+    cfg = _scenario_config(key, models)
+    try:
+        chart = create_chart(chart_format, probability, user_provided, cfg["model"], cfg["feature_names"])
     except Exception:
-        chart_image_base64 = None
+        return None
+    return ChartData(**chart) if chart_format == "spec" else chart
+
+
+def _to_response(
+    key: str,
+    probability: float,
+    threshold: float,
+    user_provided: dict[str, float],
+    include_chart: bool,
+    models: ModelSet,
+    timer: metrics.StageTimer | None = None,
+    chart_format: str = "png",
+    remember: bool = True,
+) -> PredictResponse:
+    prediction = int(probability >= threshold)
+    label = "당뇨 위험" if prediction == 1 else "정상 범위"
+
+    # 차트 생성 (요청한 경우에만, 형식에 맞는 응답 필드에 담음)
+    chart = {}
+    if include_chart:
+        chart[CHART_FIELDS[chart_format]] = _chart_or_none(key, probability, user_provided, models, chart_format)
+        if timer is not None:
+            timer.lap("chart")
 
     return PredictResponse(
+        prediction_id=_remember(key, probability, user_provided, models) if remember else None,
         prediction=prediction,
         probability=round(probability, 4),
         label=label,
         input=user_provided,
-        used_model=used_model_name,
-        chart_image_base64=chart_image_base64,
+        used_model=SCENARIO_NAMES[key],
+        model_version=models.version,
+        **chart,
     )
+
+
+def chart_for_prediction(
+    prediction_id: str,
+    endpoint: str = "chart",
+    chart_format: str = "png",
+) -> str | ChartData | None:
+    """이전 예측 결과의 차트. 보관 기간이 지났거나 없는 id면 HTTPException(404)
+
+    endpoint는 지표 레이블 (예측 요청에 딸린 차트면 "predict"/"batch").
+    """
+    with _recent_lock:
+        entry = _recent_predictions.get(prediction_id)
+        if entry is not None:
+            _recent_predictions.move_to_end(prediction_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다.")
+    # 예측 당시 버전의 모델로 그림 (그 사이 교체되었어도 동일한 결과)
+    key, probability, user_provided, models = entry
+    started = time.perf_counter()
+    chart = _chart_or_none(key, probability, user_provided, models, chart_format)
+    metrics.record_stage(endpoint, "chart", key, time.perf_counter() - started)
+    return chart
+
+
+def compiled_scenario(key: str, models: ModelSet | None = None):
+    """시나리오별 고속 추론 객체 (버전별로 첫 사용 시 생성, 지원하지 않으면 None)
+
+    같은 버전용 컴파일 번들이 있으면 아티팩트(joblib/sklearn)를 로드하지 않고 번들에서 복원한다.
+    """
+    models = models or MODELS.current
+    if key not in models.compiled:
+        with models.compile_lock:
+            if key not in models.compiled:
+                bundle = models.bundle() if settings.COMPILED_BUNDLE else None
+                compiled = None
+                if bundle is not None:
+                    imputer_name = "IMPUTER_DETAIL_SUGAR" if key == "A" else "IMPUTER_DETAIL_NO_SUGAR"
+                    compiled = load_bundled_scenario(bundle, key, lambda: models.get(imputer_name))
+                if compiled is None:
+                    compiled = compile_scenario(_scenario_config(key, models), name=key)
+                models.compiled[key] = compiled
+    return models.compiled[key]
+
+
+def result_cache_stats(models: ModelSet | None = None) -> dict[str, dict]:
+    """시나리오별 예측 결과 캐시 상태 (고속 경로의 상세 시나리오만)"""
+    models = models or MODELS.current
+    return {key: c.cache.stats() for key, c in list(models.compiled.items()) if getattr(c, "cache", None) is not None}
+
+
+metrics.gauge(
+    "diabetes_result_cache_entries",
+    "현재 버전의 예측 결과 캐시 항목 수",
+    lambda: {(key,): stats["entries"] for key, stats in result_cache_stats().items()},
+    ("scenario",),
+)
+
+
+def preload(models: ModelSet | None = None) -> None:
+    """아티팩트 로드 + 고속 추론 객체 생성 (프로세스/스레드를 만들지 않으므로 fork 전 부모 프로세스에서도 호출 가능)"""
+    models = models or MODELS.current
+    load_all_artifacts(models)
+    for key in SCENARIO_NAMES:
+        compiled_scenario(key, models)
+
+
+def warm_up(models: ModelSet | None = None) -> None:
+    """preload + 정적 차트 패널 렌더링 (eager 모드, 핫 리로드)"""
+    models = models or MODELS.current
+    preload(models)
+    warm_up_charts([(_scenario_config(k, models)["model"], SCENARIO_FEATURES[k]) for k in SCENARIO_NAMES])
+
+
+# 버전 교체 전 점검용 입력: 시나리오별 고정 시드 임의값 + 항목 하나만 입력한 경우
+SMOKE_ROWS = 64
+SMOKE_TOL = 1e-6
+
+
+def _smoke_raw(feature_names: list[str]) -> np.ndarray:
+    rs = np.random.RandomState(0)
+    raw = np.column_stack([rs.uniform(*FEATURE_RANGES[f], SMOKE_ROWS) for f in feature_names]).round(1)
+    raw[rs.rand(*raw.shape) < 0.2] = 0.0
+    single = np.zeros((len(feature_names), len(feature_names)))
+    for j, f in enumerate(feature_names):
+        single[j, j] = FEATURE_RANGES[f][1]
+    return np.vstack([raw, single])
+
+
+def smoke_check(models: ModelSet) -> dict:
+    """새 버전을 교체하기 전 모든 시나리오가 예측 가능한지 점검
+
+    확률이 [0, 1] 범위의 유한값인지, 고속 경로가 있으면 행 단위 sklearn 경로와 일치하는지 확인한다.
+    결과: {"passed_all", "results": {시나리오: {...}}}
+    """
+    results: dict[str, dict] = {}
+    for key in SCENARIO_NAMES:
+        try:
+            raw = _smoke_raw(SCENARIO_FEATURES[key])
+            slow = np.concatenate(
+                [predict_proba_raw(key, raw[i : i + 1], fast=False, models=models)[0] for i in range(len(raw))]
+            )
+            result = {"rows": len(raw), "valid_range": bool(np.all(np.isfinite(slow) & (slow >= 0) & (slow <= 1)))}
+            if compiled_scenario(key, models) is not None:
+                fast, _ = predict_proba_raw(key, raw, fast=True, models=models)
+                result["fast_max_abs_diff"] = float(np.max(np.abs(fast - slow)))
+                result["passed"] = result["valid_range"] and result["fast_max_abs_diff"] <= SMOKE_TOL
+            else:
+                result["passed"] = result["valid_range"]
+        except Exception as e:
+            result = {"passed": False, "error": f"{type(e).__name__}: {e}"}
+        results[key] = result
+    return {"passed_all": all(r["passed"] for r in results.values()), "results": results}
+
+
+def _outcome(prediction: int) -> str:
+    return "risk" if prediction else "normal"
+
+
+def resolve_prediction(payload: PredictRequest, endpoint: str = "predict") -> tuple[str, dict[str, float]]:
+    """입력 검증 + 시나리오 결정. 실패하면 거절 지표를 남기고 HTTPException(400)"""
+    try:
+        return _resolve_scenario(payload)
+    except HTTPException:
+        metrics.record_rejected(endpoint)
+        raise
+
+
+def predict_group(
+    key: str,
+    requests: list[tuple[PredictRequest, dict[str, float], metrics.StageTimer]],
+) -> list[PredictResponse]:
+    """같은 시나리오로 검증된 /predict 요청들을 predict_proba 한 번으로 처리 (단건 요청, 마이크로 배처 공용)
+
+    requests: (요청, 사용자 입력값, 요청별 단계 타이머). 응답과 지표는 요청마다 단건 처리와 같게 만든다.
+    """
+    raw = _raw_matrix(SCENARIO_FEATURES[key], [user_provided for _, user_provided, _ in requests])
+
+    # 예측 (요청 처리 중 버전이 교체되어도 같은 버전으로 끝까지 처리)
+    models = MODELS.current
+    probs, threshold = predict_proba_raw(key, raw, models=models)
+    for _, _, timer in requests:
+        timer.lap("inference")
+    responses = []
+    for (payload, user_provided, timer), probability in zip(requests, probs):
+        response = _to_response(
+            key, float(probability), threshold, user_provided, payload.include_chart, models, timer, payload.chart_format
+        )
+        timer.lap("response")
+        metrics.record_prediction("predict", key, SCENARIO_INPUT_MODES[key], _outcome(response.prediction), timer)
+        responses.append(response)
+    return responses
+
+
+def predict_with_model(payload: PredictRequest) -> PredictResponse:
+    """입력모드(detail/simple) + 혈당 유무에 따라 모델 분기 예측"""
+    timer = metrics.StageTimer()
+    key, user_provided = resolve_prediction(payload)
+    timer.lap("validate")
+    return predict_group(key, [(payload, user_provided, timer)])[0]
+
+
+def _validation_message(error: ValidationError) -> str:
+    """pydantic 검증 오류 → 한 줄 메시지 (/predict 422 응답의 loc/msg와 같은 내용)"""
+    details = [
+        f"{'.'.join(str(part) for part in e['loc']) or '항목'}: {e['msg']}" for e in error.errors(include_url=False)
+    ]
+    return "입력 형식 오류 - " + "; ".join(details)
+
+
+def predict_batch(
+    payloads: list[PredictRequest | dict],
+    include_chart: bool = False,
+    chart_format: str = "png",
+    remember: bool = False,
+) -> list[PredictBatchItem]:
+    """여러 건 일괄 예측. 시나리오별로 묶어 전처리/predict_proba를 한 번에 수행
+
+    항목은 PredictRequest 또는 검증 전 dict(요청 JSON 그대로). 형식 오류(422)와 값 검증 오류(400)는
+    해당 행의 error로만 보고하고 나머지는 정상 처리한다. 결과는 입력 순서를 유지한다.
+    prediction_id는 차트를 요청한 경우(include_chart 또는 remember)에만 발급해 최근 예측 LRU에 넣는다
+    (차트 없는 큰 배치가 다른 요청의 차트 조회용 id를 밀어내지 않도록).
+    """
+    items: list[PredictBatchItem | None] = [None] * len(payloads)
+    groups: dict[str, list[tuple[int, dict[str, float]]]] = {}
+
+    timer = metrics.StageTimer()
+    for idx, payload in enumerate(payloads):
+        try:
+            key, user_provided = _resolve_scenario(PredictRequest.model_validate(payload))
+        except ValidationError as e:
+            items[idx] = PredictBatchItem(index=idx, status_code=422, error=_validation_message(e))
+            continue
+        except HTTPException as e:
+            items[idx] = PredictBatchItem(index=idx, status_code=e.status_code, error=str(e.detail))
+            continue
+        groups.setdefault(key, []).append((idx, user_provided))
+    timer.lap("validate")
+    metrics.record_rejected("batch", len(payloads) - sum(len(m) for m in groups.values()))
+
+    remember = remember or include_chart
+    models = MODELS.current
+    for key, members in groups.items():
+        # 시나리오별 단계 시간은 그룹 전체(행 수와 무관하게 한 번) 기준
+        group_timer = metrics.StageTimer()
+        raw = _raw_matrix(SCENARIO_FEATURES[key], [row for _, row in members])
+        probs, threshold = predict_proba_raw(key, raw, models=models)
+        group_timer.lap("inference")
+        for (idx, user_provided), probability in zip(members, probs):
+            items[idx] = PredictBatchItem(
+                index=idx,
+                result=_to_response(
+                    key,
+                    float(probability),
+                    threshold,
+                    user_provided,
+                    include_chart,
+                    models,
+                    chart_format=chart_format,
+                    remember=remember,
+                ),
+            )
+        group_timer.lap("response")
+        positive = int(np.count_nonzero(probs >= threshold))
+        mode = SCENARIO_INPUT_MODES[key]
+        metrics.record_prediction("batch", key, mode, "risk", group_timer, count=positive)
+        metrics.record_prediction("batch", key, mode, "normal", count=len(members) - positive)
+
+    # 요청 전체 시간은 scenario="all"로 기록 (건수는 위에서 시나리오별로 기록)
+    metrics.record_prediction("batch", "all", "all", "all", timer, count=0)
+    return items
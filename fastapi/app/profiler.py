@@ -0,0 +1,116 @@
+# 운영 중 켜고 끌 수 있는 샘플링 프로파일러 (표준 라이브러리만 사용)
+#
+# 백그라운드 스레드가 interval마다 sys._current_frames()로 다른 스레드들의 호출 스택을 읽어
+# 함수 단위 스택별 횟수를 모은다. 결과는 flamegraph.pl / speedscope가 읽는 folded 형식
+# ("바깥;...;안쪽 횟수")으로 내보낸다. 꺼져 있을 때는 비용이 없다.
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# 이 모듈들에서 멈춰 있는 스택(스레드 풀 대기, 이벤트 루프 select 등)은 유휴로 따로 센다
+IDLE_MODULES = ("threading.py", "queue.py", "selectors.py")
+MAX_DEPTH = 64
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._stacks: Counter[str] = Counter()
+        self.interval = 0.0
+        self.duration: float | None = None
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self.samples = 0
+        self.idle_samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = 0.005, duration: float | None = None) -> None:
+        """수집 시작 (이전 결과는 지움). duration(초)이 지나면 자동 종료. 이미 실행 중이면 RuntimeError"""
+        with self._lock:
+            if self.running:
+                raise RuntimeError("프로파일러가 이미 실행 중입니다.")
+            with self._data_lock:
+                self._stacks = Counter()
+                self.samples = self.idle_samples = 0
+            self.interval = interval
+            self.duration = duration
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        deadline = time.monotonic() + self.duration if self.duration else None
+        while not self._stop.wait(self.interval):
+            sampled, idle = [], 0
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if Path(frame.f_code.co_filename).name in IDLE_MODULES:
+                    idle += 1
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                sampled.append(";".join(reversed(stack)))
+            with self._data_lock:
+                self._stacks.update(sampled)
+                self.samples += len(sampled)
+                self.idle_samples += idle
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        self.stopped_at = time.time()
+
+    def folded(self, limit: int | None = None) -> str:
+        """스택별 횟수 (많은 순). flamegraph.pl / speedscope 입력 형식"""
+        with self._data_lock:
+            stacks = self._stacks.most_common(limit)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def top_functions(self, limit: int = 20) -> list[dict]:
+        """가장 안쪽(실제 실행 중) 함수별 샘플 비율"""
+        leaf: Counter[str] = Counter()
+        with self._data_lock:
+            stacks = list(self._stacks.items())
+        for stack, count in stacks:
+            leaf[stack.rsplit(";", 1)[-1]] += count
+        total = max(self.samples, 1)
+        return [{"function": f, "samples": n, "ratio": round(n / total, 4)} for f, n in leaf.most_common(limit)]
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 3),
+            "duration_s": self.duration,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "stacks": len(self._stacks),
+        }
+
+
+PROFILER = SamplingProfiler()
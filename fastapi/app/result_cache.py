@@ -0,0 +1,83 @@
+# 예측 결과(확률) 캐시: 정규화된 입력 행 → 확률 (메모리 LRU + TTL)
+#
+# 고속 추론 객체(버전별 ModelSet.compiled)마다 하나씩 두므로 키에 모델 버전이 암묵적으로 포함되고,
+# 새 버전으로 교체되면 이전 버전의 캐시는 그 ModelSet과 함께 버려진다.
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from app import metrics, settings
+
+RESULT_CACHE_REQUESTS = metrics.counter(
+    "diabetes_result_cache_requests_total",
+    "예측 결과 캐시 조회 수 (행 단위)",
+    ("scenario", "result"),
+)
+
+
+class ResultCache:
+    """bytes 키 → float 값. max_size가 0 이하이면 아무것도 저장하지 않음"""
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int = settings.RESULT_CACHE_SIZE,
+        ttl: float = settings.RESULT_CACHE_TTL,
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_many(self, keys: list[bytes]) -> list[float | None]:
+        now = time.monotonic()
+        found: list[float | None] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._entries[key]
+                    entry = None
+                if entry is None:
+                    found.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    found.append(entry[1])
+            hits = sum(1 for v in found if v is not None)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        if metrics.enabled:
+            if hits:
+                RESULT_CACHE_REQUESTS.inc(self.name, "hit", amount=hits)
+            if len(keys) - hits:
+                RESULT_CACHE_REQUESTS.inc(self.name, "miss", amount=len(keys) - hits)
+        return found
+
+    def set_many(self, items: list[tuple[bytes, float]]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,8 +1,13 @@
 # 요청/응답 스키마 (한글 alias 지원)
 from __future__ import annotations
 
+from typing import Any, Literal
+
 from pydantic import BaseModel, ConfigDict, Field
 
+# png: base64 PNG(chart_image_base64) / svg: SVG 문자열(chart_svg) / spec: 차트 값만(chart_data, 앱에서 직접 그림)
+ChartFormat = Literal["png", "svg", "spec"]
+
 
 class PredictRequest(BaseModel):
     """예측 입력 (한글 키 가능)"""
@@ -11,18 +16,71 @@ class PredictRequest(BaseModel):
     bmi: float | None = Field(None, alias="BMI")
     age: float | None = Field(None, alias="나이")
     input_mode: str | None = Field(None, alias="입력모드")
+    include_chart: bool = Field(False, alias="차트포함")
+    chart_format: ChartFormat = Field("png", alias="차트형식")
 
     model_config = ConfigDict(populate_by_name=True)
 
 
+class ChartData(BaseModel):
+    """앱에서 직접 그리는 차트 값 (확률은 0.1% 단위)"""
+    normal_probability: float
+    diabetes_probability: float
+    kind: Literal["importance", "input"]  # 하단 패널: 피처 중요도 / 입력값
+    labels: list[str]
+    values: list[float]
+
+
 class PredictResponse(BaseModel):
     """예측 결과"""
+    prediction_id: str | None = None  # 차트 조회용 id (일괄 예측은 차트를 요청한 경우만)
     prediction: int
     probability: float
     label: str
     input: dict[str, float]
     used_model: str
     chart_image_base64: str | None = None
+    chart_svg: str | None = None
+    chart_data: ChartData | None = None
+    model_version: str  # 예측에 사용한 모델 아티팩트 버전
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
+class ChartResponse(BaseModel):
+    """예측 결과 차트"""
+    prediction_id: str
+    chart_image_base64: str | None = None
+    chart_svg: str | None = None
+    chart_data: ChartData | None = None
+
+
+class PredictBatchRequest(BaseModel):
+    """일괄 예측 입력
+
+    items의 각 항목은 PredictRequest 형식이지만, 한 행의 형식 오류가 요청 전체를 422로 만들지 않도록
+    여기서는 그대로 받고 predictor.predict_batch에서 행별로 검증한다.
+    """
+    items: list[Any] = Field(..., description="예측 입력 목록 (각 항목은 /predict 요청 본문과 같은 형식)")
+    include_chart: bool = Field(False, alias="차트포함", description="행별 차트 생성 여부")
+    chart_format: ChartFormat = Field("png", alias="차트형식", description="차트 형식 (png / svg / spec)")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class PredictBatchItem(BaseModel):
+    """일괄 예측 행별 결과 (성공 시 result, 실패 시 error)"""
+    index: int
+    status_code: int = 200
+    result: PredictResponse | None = None
+    error: str | None = None
+
+
+class PredictBatchResponse(BaseModel):
+    """일괄 예측 결과 (입력 순서 유지)"""
+    count: int
+    failed: int
+    results: list[PredictBatchItem]
 
 
 class GeocodeRequest(BaseModel):
@@ -34,3 +92,18 @@ class GeocodeResponse(BaseModel):
     """lat/lng 반환"""
     lat: str
     lng: str
+
+
+class ModelReloadRequest(BaseModel):
+    """새 모델 버전 로드 요청 (version 생략 시 기본 모델 디렉터리를 다시 읽음)"""
+    version: str | None = Field(None, alias="버전")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ProfilerStartRequest(BaseModel):
+    """샘플링 프로파일러 시작 요청"""
+    interval_ms: float = Field(5.0, alias="샘플간격ms", gt=0, le=1000, description="스택 샘플 간격 (ms)")
+    duration_s: float | None = Field(30.0, alias="기간초", gt=0, description="자동 종료까지 시간 (초, null이면 stop까지)")
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -0,0 +1,113 @@
+# 멀티 워커 운영 실행: 부모 프로세스가 모델을 한 번 로드한 뒤 uvicorn 워커들을 fork (python -m app.serve --workers 4)
+#
+# uvicorn --workers는 워커마다 새 인터프리터(spawn)에서 모델을 따로 로드하므로 메모리가 워커 수에 비례한다.
+# 여기서는 부모가 아티팩트와 고속 추론 객체를 만든 다음 fork하므로 워커는 그 페이지를 copy-on-write로 공유한다.
+# 컴파일 번들과 joblib 배열은 읽기 전용/copy-on-write 메모리 매핑(DIABETES_MODEL_MMAP)이라 페이지 캐시를 그대로 쓰고,
+# gc.freeze()로 부모가 만든 객체를 GC 대상에서 빼서 워커의 GC가 공유 페이지를 건드려 복사되지 않게 한다.
+# 워커들은 같은 listen 소켓을 받아 커널이 연결을 나눠 주고, 비정상 종료된 워커는 부모가 다시 fork한다.
+# 부모는 fork 전에 스레드/프로세스 풀을 만들지 않는다 (차트 워커 풀, 실행기 스레드는 워커가 처음 쓸 때 생성).
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+import traceback
+
+import uvicorn
+
+from app import settings
+from app.main import app
+from app.model_loader import MODELS, rss_bytes
+from app.predictor import preload
+
+# 워커가 시작 직후 계속 죽는 경우 fork를 반복하지 않도록 재시작 전 대기(초)
+RESTART_DELAY = 1.0
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn_worker(sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 0
+    try:
+        # 부모의 종료 핸들러 대신 uvicorn의 graceful shutdown(SIGINT/SIGTERM)을 사용
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        uvicorn.Server(uvicorn.Config(app, log_level=log_level)).run(sockets=[sock])
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="모델을 한 번 로드하고 워커를 fork하는 멀티 워커 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.SERVE_WORKERS, help="워커 프로세스 수 (DIABETES_WORKERS)")
+    parser.add_argument(
+        "--preload",
+        action=argparse.BooleanOptionalAction,
+        default=settings.SERVE_PRELOAD,
+        help="fork 전에 부모에서 모델 로드 (DIABETES_PRELOAD, --no-preload면 워커마다 따로 로드)",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    if args.preload:
+        started = time.perf_counter()
+        preload()
+        gc.collect()
+        gc.freeze()
+        print(
+            f"[serve] 모델 preload 완료: version={MODELS.current.version}, "
+            f"{time.perf_counter() - started:.2f}s, 부모 RSS {(rss_bytes() or 0) / 1e6:.1f}MB"
+        )
+
+    sock = _bind(args.host, args.port)
+    workers = {_spawn_worker(sock, args.log_level) for _ in range(max(1, args.workers))}
+    print(f"[serve] http://{args.host}:{args.port} 워커 {len(workers)}개: {sorted(workers)}")
+
+    stopping = False
+
+    def stop(_signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if stopping:
+            continue
+        print(f"[serve] 워커 {pid} 종료(status={status}) → {RESTART_DELAY:.0f}초 후 다시 시작")
+        time.sleep(RESTART_DELAY)
+        if not stopping:
+            workers.add(_spawn_worker(sock, args.log_level))
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# 서버 동작 설정 (환경변수로 조정)
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    try:
+        return int(value) if value is not None and value.strip() else default
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    try:
+        return float(value) if value is not None and value.strip() else default
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+# True면 NumPy 고속 추론 경로 사용, False면 sklearn predict_proba 경로로 fallback
+FAST_INFERENCE = _env_bool("DIABETES_FAST_INFERENCE", True)
+# True면 모델 디렉터리의 컴파일 번들(scripts/compile_artifacts.py)이 같은 버전용일 때 sklearn 없이 고속 추론 객체를 복원
+COMPILED_BUNDLE = _env_bool("DIABETES_COMPILED_BUNDLE", True)
+
+# lazy: 아티팩트를 처음 사용할 때 로드 / eager: 서버 시작 시 스레드 풀에서 모두 로드
+MODEL_LOAD = os.environ.get("DIABETES_MODEL_LOAD", "lazy").strip().lower() or "lazy"
+MODEL_LOAD_WORKERS = _env_int("DIABETES_MODEL_LOAD_WORKERS", 4)
+# True면 joblib.load(mmap_mode="c")로 큰 배열을 copy-on-write 메모리 매핑 (fork된 워커 간 페이지 공유)
+MODEL_MMAP = _env_bool("DIABETES_MODEL_MMAP", True)
+
+# 상세(A/B) 시나리오 예측 결과 캐시: 버전·시나리오별 항목 수(0이면 끔), 유지 시간(초). 모델 교체 시 새 버전은 빈 캐시로 시작
+RESULT_CACHE_SIZE = _env_int("DIABETES_RESULT_CACHE_SIZE", 8192)
+RESULT_CACHE_TTL = _env_float("DIABETES_RESULT_CACHE_TTL", 3600.0)
+
+# 서버 시작 시 사용할 모델 디렉터리 (기본: app/)
+MODEL_DIR = os.environ.get("DIABETES_MODEL_DIR", "").strip()
+# 핫 리로드로 배포할 버전 디렉터리들의 루트 (<루트>/<버전>/*.joblib)
+MODEL_ROOT = os.environ.get("DIABETES_MODEL_ROOT", "").strip() or str(Path(__file__).resolve().parent / "models")
+# 설정하면 새 버전 교체 전에 이 CSV로 scripts/validate_four_scenarios.py와 같은 정확도 검증을 수행
+VALIDATION_CSV = os.environ.get("DIABETES_VALIDATION_CSV", "").strip()
+# 정확도 검증 PASS 판정 기준: ci_lower(부트스트랩 신뢰구간 하한, 기본) 또는 point(test 정확도 점추정)
+VALIDATION_PASS_BASIS = os.environ.get("DIABETES_VALIDATION_PASS_BASIS", "").strip() or "ci_lower"
+# /admin/* 요청의 X-Admin-Token 헤더가 이 값과 같아야 함 (설정하지 않으면 관리자 API는 403으로 모두 거부)
+ADMIN_TOKEN = os.environ.get("DIABETES_ADMIN_TOKEN", "").strip()
+
+# 지오코딩: Nominatim 검색 URL (자체 호스팅 서버로 교체 가능), 요청 간 최소 간격(초, 공개 서버 정책: 초당 1회)
+GEOCODE_URL = os.environ.get("DIABETES_GEOCODE_URL", "").strip() or "https://nominatim.openstreetmap.org/search"
+GEOCODE_MIN_INTERVAL = _env_float("DIABETES_GEOCODE_MIN_INTERVAL", 1.0)
+GEOCODE_TIMEOUT = _env_float("DIABETES_GEOCODE_TIMEOUT", 10.0)
+# 지오코딩 결과 캐시: 메모리 LRU 크기, 성공/실패(주소 없음) TTL(초), 설정 시 SQLite 파일에 영속화
+GEOCODE_CACHE_SIZE = _env_int("DIABETES_GEOCODE_CACHE_SIZE", 4096)
+GEOCODE_CACHE_TTL = _env_float("DIABETES_GEOCODE_CACHE_TTL", 30 * 24 * 3600.0)
+GEOCODE_NEGATIVE_TTL = _env_float("DIABETES_GEOCODE_NEGATIVE_TTL", 3600.0)
+GEOCODE_CACHE_DB = os.environ.get("DIABETES_GEOCODE_CACHE_DB", "").strip()
+# 설정하면 이 주소 사전(CSV/Parquet: address, lat, lng 또는 .npz)에서 먼저 찾고 없을 때만 Nominatim 호출
+GAZETTEER_PATH = os.environ.get("DIABETES_GAZETTEER_PATH", "").strip()
+
+# False면 /metrics용 예측/지오코딩 지표를 기록하지 않음
+METRICS = _env_bool("DIABETES_METRICS", True)
+
+# async 핸들러가 작업을 넘기는 실행기: 스레드 수 + 대기열 크기. 가득 차면 503 + Retry-After(초)
+INFERENCE_WORKERS = _env_int("DIABETES_INFERENCE_WORKERS", min(4, os.cpu_count() or 1))
+INFERENCE_QUEUE = _env_int("DIABETES_INFERENCE_QUEUE", 64)
+# /predict 마이크로 배처: 같은 시나리오 요청을 모으는 최대 시간(ms, 0이면 끔), 한 번에 묶는 최대 요청 수
+BATCH_WINDOW_MS = _env_float("DIABETES_BATCH_WINDOW_MS", 0.0)
+BATCH_MAX_SIZE = _env_int("DIABETES_BATCH_MAX_SIZE", 32)
+# /predict/batch 한 요청의 최대 항목 수 (초과 시 413, 한 요청이 추론 실행기를 오래 점유하지 않도록)
+BATCH_MAX_ITEMS = _env_int("DIABETES_BATCH_MAX_ITEMS", 1000)
+# 차트 렌더링 워커 프로세스 수 (0이면 API 프로세스 안에서 렌더링), 렌더링 1건 최대 대기(초), 우선 사용할 글꼴 이름
+CHART_PROCESSES = _env_int("DIABETES_CHART_PROCESSES", min(2, os.cpu_count() or 1))
+CHART_TIMEOUT = _env_float("DIABETES_CHART_TIMEOUT", 10.0)
+CHART_FONT = os.environ.get("DIABETES_CHART_FONT", "").strip()
+CHART_WORKERS = _env_int("DIABETES_CHART_WORKERS", max(1, CHART_PROCESSES))
+CHART_QUEUE = _env_int("DIABETES_CHART_QUEUE", 16)
+BUSY_RETRY_AFTER = _env_int("DIABETES_BUSY_RETRY_AFTER", 1)
+# 동시에 백엔드(Nominatim) 조회를 기다리는 서로 다른 주소 수 상한 (초과 시 503, 캐시 적중/병합 요청은 제외)
+GEOCODE_MAX_PENDING = _env_int("DIABETES_GEOCODE_MAX_PENDING", 32)
+
+# python -m app.serve 멀티 워커 실행: 워커 프로세스 수, 부모 프로세스에서 모델을 미리 로드한 뒤 fork할지(워커 간 메모리 공유)
+SERVE_WORKERS = _env_int("DIABETES_WORKERS", os.cpu_count() or 1)
+SERVE_PRELOAD = _env_bool("DIABETES_PRELOAD", True)
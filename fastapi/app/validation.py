@@ -0,0 +1,180 @@
+# 4개 시나리오 아티팩트 정확도 검증 (scripts/validate_four_scenarios.py와 서버 핫 리로드가 공유)
+#
+# 데이터와 split은 학습과 같은 준비된 데이터셋(app/dataset.py)을 쓰고, 시나리오별 전처리 + train/test 확률 계산을 스레드 풀에서 동시에 수행한다.
+# test 확률은 한 번만 구하고, (재표본 수 × test 행 수) 인덱스 행렬 하나로 모든 시나리오를 부트스트랩해
+# accuracy/precision/recall/f1 신뢰구간을 낸다. PASS는 test 정확도 신뢰구간 하한이 PASS_CI_LOWER_CRITERIA 이상일 때
+# (기본, 분할 하나의 우연한 점수로 통과하지 않도록). pass_basis="point"는 점추정을 PASS_CRITERIA와 비교한다.
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.dataset import PreparedDataset
+from app.grading import grade_frame
+
+PASS_CRITERIA = {
+    "A": 0.70,
+    "B": 0.65,
+    "C": 0.70,
+    "C_NS": 0.65,
+}
+# 신뢰구간 하한 기준: 점추정 기준에서 test 154행 95% 구간 반폭(정규근사 1.96·sqrt(p(1-p)/n) ≈ 0.07)을 뺀 값
+PASS_CI_LOWER_CRITERIA = {
+    "A": 0.63,
+    "B": 0.58,
+    "C": 0.63,
+    "C_NS": 0.58,
+}
+SCENARIO_KEYS = ("A", "B", "C", "C_NS")
+
+# 부트스트랩 재표본 수, 신뢰수준(양측 백분위수 구간), 재현용 seed
+BOOTSTRAP_RESAMPLES = 5000
+CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 42
+METRIC_NAMES = ("accuracy", "precision", "recall", "f1")
+# PASS 판정에 쓰는 test 정확도: 부트스트랩 신뢰구간 하한(기본) 또는 점추정
+PASS_BASES = ("ci_lower", "point")
+PASS_BASIS = "ci_lower"
+
+
+def load_scenario(meta_s: dict, artifact_dir: Path) -> dict:
+    """artifact_dir의 시나리오 아티팩트 (상세: model/scaler/imputer/clip_bounds, 간편: model/quantiles)"""
+    name = meta_s["artifact_name"]
+    parts = ("model", "scaler", "imputer", "clip_bounds") if meta_s["mode"] == "detailed" else ("model", "quantiles")
+    return {part: joblib.load(artifact_dir / f"{name}_{part}.joblib") for part in parts}
+
+
+def scenario_probabilities(
+    df: pd.DataFrame, meta_s: dict, artifacts: dict, train_rows: np.ndarray, test_rows: np.ndarray
+) -> dict[str, np.ndarray]:
+    """시나리오 아티팩트로 train/test 당뇨 확률 계산"""
+    cols = meta_s["features_kor"]
+    x_train = df[cols].iloc[train_rows].copy()
+    x_test = df[cols].iloc[test_rows].copy()
+
+    if meta_s["mode"] == "detailed":
+        for c in cols:
+            low, up = artifacts["clip_bounds"][c]
+            x_train[c] = x_train[c].clip(low, up)
+            x_test[c] = x_test[c].clip(low, up)
+        x_train_pre = artifacts["imputer"].transform(artifacts["scaler"].transform(x_train))
+        x_test_pre = artifacts["imputer"].transform(artifacts["scaler"].transform(x_test))
+    else:
+        x_train_pre = grade_frame(x_train, artifacts["quantiles"])
+        x_test_pre = grade_frame(x_test, artifacts["quantiles"])
+
+    model = artifacts["model"]
+    return {
+        "train": model.predict_proba(x_train_pre)[:, 1],
+        "test": model.predict_proba(x_test_pre)[:, 1],
+    }
+
+
+def _scores(tp: np.ndarray, predicted: np.ndarray, actual: np.ndarray, correct: np.ndarray, n: int) -> dict:
+    """재표본별 혼동행렬 합계 → 지표 (분모가 0이면 0, sklearn zero_division=0과 같음)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "accuracy": correct / n,
+            "precision": np.where(predicted > 0, tp / predicted, 0.0),
+            "recall": np.where(actual > 0, tp / actual, 0.0),
+            "f1": np.where(tp > 0, 2 * tp / (predicted + actual), 0.0),
+        }
+
+
+def point_metrics(y_true: np.ndarray, pred: np.ndarray) -> dict[str, float]:
+    """재표본 없이 전체 행 기준 지표 (점추정)"""
+    return {name: float(v[0]) for name, v in bootstrap_scores(y_true, pred, np.arange(len(y_true))[None, :]).items()}
+
+
+def bootstrap_scores(y_true: np.ndarray, pred: np.ndarray, resample_rows: np.ndarray) -> dict[str, np.ndarray]:
+    """resample_rows(재표본 수 × n) 인덱스 행렬 → 재표본별 지표 배열 (한 번의 gather + 행 합계)"""
+    y_true = y_true.astype(bool)
+    pred = pred.astype(bool)
+    tp = (y_true & pred)[resample_rows].sum(axis=1)
+    predicted = pred[resample_rows].sum(axis=1)
+    actual = y_true[resample_rows].sum(axis=1)
+    correct = (y_true == pred)[resample_rows].sum(axis=1)
+    return _scores(tp, predicted, actual, correct, resample_rows.shape[1])
+
+
+def bootstrap_intervals(
+    y_true: np.ndarray, pred: np.ndarray, resample_rows: np.ndarray, confidence: float
+) -> dict[str, list[float]]:
+    """재표본별 지표 분포의 양측 백분위수 구간 → 지표별 [하한, 상한]"""
+    scores = bootstrap_scores(y_true, pred, resample_rows)
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    return {
+        name: [float(v) for v in np.percentile(scores[name], [tail, 100.0 - tail])] for name in METRIC_NAMES
+    }
+
+
+def validate_artifacts(
+    data: PreparedDataset,
+    meta: dict,
+    artifact_dir: Path,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = CONFIDENCE,
+    seed: int = BOOTSTRAP_SEED,
+    pass_basis: str = PASS_BASIS,
+) -> dict:
+    """모든 시나리오를 검증해 {"passed_all", "pass_basis", "bootstrap", "results"} 리포트 반환
+    (PASS 기준: ci_lower는 test 정확도 하한 ≥ PASS_CI_LOWER_CRITERIA, point는 점추정 ≥ PASS_CRITERIA)"""
+    if pass_basis not in PASS_BASES:
+        raise ValueError(f"pass_basis는 {PASS_BASES} 중 하나여야 합니다: {pass_basis}")
+    started = time.perf_counter()
+    df = data.frame
+    train_rows, test_rows = data.splits["train"], data.splits["test"]
+    labels = data.target.to_numpy()
+    y_train, y_test = labels[train_rows], labels[test_rows]
+    # 로드는 순서대로: 여러 스레드가 동시에 unpickle하면 sklearn 모듈 첫 import가 겹쳐 순환 import 오류가 날 수 있음
+    artifacts = {key: load_scenario(meta["scenarios"][key], artifact_dir) for key in SCENARIO_KEYS}
+
+    def probabilities(key: str) -> dict[str, np.ndarray]:
+        return scenario_probabilities(df, meta["scenarios"][key], artifacts[key], train_rows, test_rows)
+
+    with ThreadPoolExecutor(max_workers=len(SCENARIO_KEYS), thread_name_prefix="validate") as pool:
+        probs = dict(zip(SCENARIO_KEYS, pool.map(probabilities, SCENARIO_KEYS)))
+    probs_seconds = time.perf_counter() - started
+
+    # 모든 시나리오가 같은 test 행을 쓰므로 재표본 인덱스 행렬 하나를 공유
+    resample_rows = np.random.RandomState(seed).randint(0, len(test_rows), size=(max(1, resamples), len(test_rows)))
+    results: dict[str, dict] = {}
+    passed_all = True
+    for key in SCENARIO_KEYS:
+        th = float(meta["scenarios"][key]["threshold"])
+        train_pred = probs[key]["train"] >= th
+        test_pred = probs[key]["test"] >= th
+        test_m = point_metrics(y_test, test_pred)
+        intervals = bootstrap_intervals(y_test, test_pred, resample_rows, confidence)
+        if pass_basis == "ci_lower":
+            crit, judged = PASS_CI_LOWER_CRITERIA[key], intervals["accuracy"][0]
+        else:
+            crit, judged = PASS_CRITERIA[key], test_m["accuracy"]
+        passed = judged >= crit
+        passed_all = passed_all and passed
+        results[key] = {
+            "train_accuracy": point_metrics(y_train, train_pred)["accuracy"],
+            **{f"test_{name}": test_m[name] for name in METRIC_NAMES},
+            "test_ci": intervals,
+            "pass_accuracy_threshold": crit,
+            "passed": passed,
+        }
+    return {
+        "passed_all": passed_all,
+        "pass_basis": pass_basis,
+        "bootstrap": {
+            "resamples": int(resample_rows.shape[0]),
+            "confidence": confidence,
+            "seed": seed,
+            "test_rows": int(len(test_rows)),
+            "dataset_sha256": data.source_sha256,
+            "probabilities_seconds": round(probs_seconds, 4),
+            "total_seconds": round(time.perf_counter() - started, 4),
+        },
+        "results": results,
+    }
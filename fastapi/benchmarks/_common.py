@@ -0,0 +1,78 @@
+# 벤치마크 공용 도우미: 지연 시간 요약(p50/p95/p99), 실행 환경 기록, 결과 JSON 저장
+from __future__ import annotations
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+PERCENTILES = (50, 95, 99)
+
+
+def latency_summary(seconds) -> dict[str, float]:
+    """호출별 소요 시간(초) 목록 → ms 단위 p50/p95/p99/평균/최대"""
+    ms = np.asarray(seconds, dtype=float) * 1000.0
+    if not len(ms):
+        return {"n": 0}
+    summary = {f"p{p}_ms": round(float(np.percentile(ms, p)), 4) for p in PERCENTILES}
+    summary["mean_ms"] = round(float(ms.mean()), 4)
+    summary["max_ms"] = round(float(ms.max()), 4)
+    summary["n"] = int(len(ms))
+    return summary
+
+
+def time_calls(fn, inputs: list, warmup: int = 0) -> list[float]:
+    """inputs 각각에 대해 fn(x) 한 번씩 호출한 소요 시간(초). 앞의 warmup개는 측정에서 제외"""
+    for x in inputs[:warmup]:
+        fn(x)
+    samples = []
+    for x in inputs:
+        started = time.perf_counter()
+        fn(x)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> dict:
+    """결과 비교 시 참고할 실행 환경 (같은 장비/버전끼리 비교해야 의미가 있음)"""
+    import sklearn
+
+    from app import settings
+    from app.model_loader import MODELS
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "git_commit": _git_commit(),
+        "model_version": MODELS.current.version,
+        "fast_inference": settings.FAST_INFERENCE,
+    }
+
+
+def write_result(result: dict, out: str | None) -> None:
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if out:
+        Path(out).write_text(text, encoding="utf-8")
@@ -0,0 +1,82 @@
+# /predict 마이크로 배처 켜기/끄기에 따른 처리량-지연 곡선 (동시 요청 수별 초당 요청 수 + p50/p95/p99)
+#
+# 앱을 프로세스 안에서 ASGI로 호출하고, 설정마다 app.batcher.BATCHER의 window/max_size를 바꿔 같은 요청을 보낸다.
+# 경로(--paths): fast = NumPy 고속 경로, sklearn = predict_proba 경로(DIABETES_FAST_INFERENCE=0과 같음).
+# 고속 경로는 결과 캐시를 끄고(DIABETES_RESULT_CACHE_SIZE=0) 매번 계산한 값을 잰다.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+
+os.environ.setdefault("DIABETES_RESULT_CACHE_SIZE", "0")
+
+import httpx  # noqa: E402
+
+from _common import environment, write_result  # noqa: E402
+
+from app import settings  # noqa: E402
+from app.batcher import BATCHER  # noqa: E402
+from bench_load import request_bodies, run_level  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    from app.main import app
+    from app.predictor import warm_up
+
+    warm_up()
+    bodies = request_bodies(args.payloads, args.seed)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    windows = [float(w) for w in args.windows.split(",")]
+    results: dict[str, dict] = {}
+    offset = 0
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=args.timeout)
+    async with client:
+        for path in args.paths.split(","):
+            settings.FAST_INFERENCE = path == "fast"
+            for window_ms in windows:
+                BATCHER.window = window_ms / 1000.0
+                BATCHER.max_size = args.max_size
+                config = "off" if not BATCHER.enabled else f"w{window_ms:g}ms"
+                await run_level(client, bodies, args.warmup, max(levels), False, offset)
+                for concurrency in levels:
+                    batches, rows = BATCHER.batches, BATCHER.rows
+                    summary = await run_level(client, bodies, args.requests, concurrency, False, offset)
+                    if BATCHER.enabled:
+                        summary["mean_batch"] = round((BATCHER.rows - rows) / max(1, BATCHER.batches - batches), 2)
+                    results[f"{path}.{config}.c{concurrency}"] = summary
+                    offset += args.requests
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/predict 마이크로 배처 처리량-지연 곡선")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument("--windows", default="0,1,2,5", help="배처 window(ms) 목록, 0이면 배처 끔")
+    parser.add_argument("--max-size", type=int, default=32, help="배치 최대 요청 수")
+    parser.add_argument("--paths", default="fast,sklearn", help="추론 경로 (fast / sklearn)")
+    parser.add_argument("--requests", type=int, default=1000, help="단계별 요청 수")
+    parser.add_argument("--payloads", type=int, default=1000, help="순환 사용할 서로 다른 입력 수")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    curves = asyncio.run(run(args))
+    result = {
+        "benchmark": "batcher",
+        "environment": environment(),
+        "config": vars(args),
+        "curves": curves,
+        "metrics": {
+            f"{point}.{stat}": summary[stat]
+            for point, summary in curves.items()
+            for stat in ("p50_ms", "p95_ms", "p99_ms", "rps")
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
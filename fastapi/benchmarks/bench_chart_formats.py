@@ -0,0 +1,80 @@
+# 차트 형식별(png / svg / spec) 응답 크기와 서버 CPU 시간 비교
+#
+# CPU 시간을 API 프로세스 안에서 잴 수 있도록 차트 워커 프로세스 없이(DIABETES_CHART_PROCESSES=0) 렌더링한다.
+# 매 호출 전에 차트 캐시를 비우므로 처음 그리는 차트 기준이다. 응답 크기는 /predict 응답 JSON 전체(원본 / gzip).
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import time
+
+os.environ.setdefault("DIABETES_CHART_PROCESSES", "0")
+
+import numpy as np  # noqa: E402
+
+from _common import environment, latency_summary, write_result  # noqa: E402
+
+from app import chart, chart_render  # noqa: E402
+from app.predictor import predict_with_model, warm_up  # noqa: E402
+from bench_stages import sample_requests  # noqa: E402
+
+FORMATS = ("png", "svg", "spec")
+
+
+def _clear_caches() -> None:
+    chart.clear_cache()
+    chart_render.clear_caches()
+
+
+def bench_format(chart_format: str, requests: list) -> dict:
+    wall, cpu, sizes, gzip_sizes = [], [], [], []
+    for req in requests:
+        payload = req.model_copy(update={"include_chart": True, "chart_format": chart_format})
+        _clear_caches()
+        started_wall, started_cpu = time.perf_counter(), time.process_time()
+        response = predict_with_model(payload)
+        wall.append(time.perf_counter() - started_wall)
+        cpu.append(time.process_time() - started_cpu)
+        body = response.model_dump_json().encode("utf-8")
+        sizes.append(len(body))
+        gzip_sizes.append(len(gzip.compress(body)))
+    return {
+        **latency_summary(wall),
+        "cpu_ms": round(float(np.mean(cpu)) * 1000, 4),
+        "response_bytes": round(float(np.mean(sizes)), 1),
+        "response_gzip_bytes": round(float(np.mean(gzip_sizes)), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="차트 형식별 응답 크기 / 서버 CPU 시간 비교")
+    parser.add_argument("--requests", type=int, default=20, help="시나리오별 요청 수 (png는 건당 수십~수백 ms)")
+    parser.add_argument("--scenarios", default="A,B,C,C_NS")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    warm_up()
+    rs = np.random.RandomState(args.seed)
+    requests = [r for key in args.scenarios.split(",") for r in sample_requests(key, args.requests, rs)]
+    for chart_format in FORMATS:
+        bench_format(chart_format, requests[:2])
+
+    formats = {chart_format: bench_format(chart_format, requests) for chart_format in FORMATS}
+    result = {
+        "benchmark": "chart_formats",
+        "environment": environment(),
+        "config": vars(args),
+        "formats": formats,
+        "metrics": {
+            f"{chart_format}.{stat}": summary[stat]
+            for chart_format, summary in formats.items()
+            for stat in ("p50_ms", "p95_ms", "cpu_ms", "response_bytes", "response_gzip_bytes")
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# 오프라인 주소 사전(app/gazetteer.py) 벤치마크: N건(기본 100만) 합성 주소로 색인 생성 시간, 메모리, 조회 지연 측정
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.gazetteer import Gazetteer  # noqa: E402
+from app.model_loader import rss_bytes  # noqa: E402
+
+SIDO = [
+    "서울특별시", "부산광역시", "대구광역시", "인천광역시", "광주광역시", "대전광역시", "울산광역시", "세종특별자치시",
+    "경기도", "강원특별자치도", "충청북도", "충청남도", "전북특별자치도", "전라남도", "경상북도", "경상남도", "제주특별자치도",
+]
+
+
+def synthetic_records(n: int, seed: int) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """시도 > 시군구 > 도로명 > 건물번호 형태의 합성 주소 n건"""
+    rs = np.random.RandomState(seed)
+    sido = rs.randint(len(SIDO), size=n)
+    gu = rs.randint(40, size=n)
+    road = rs.randint(400, size=n)
+    number = rs.randint(1, 400, size=n)
+    addresses = [
+        f"{SIDO[s]} 제{g}구 {r}번길 {b}" for s, g, r, b in zip(sido, gu, road, number)
+    ]
+    lat = 33.0 + sido * 0.3 + gu * 0.005 + rs.uniform(0, 0.005, n)
+    lng = 126.0 + sido * 0.2 + road * 0.0001 + rs.uniform(0, 0.005, n)
+    return addresses, lat, lng
+
+
+def _latency(fn, queries: list[str]) -> dict[str, float]:
+    samples = np.empty(len(queries))
+    for i, q in enumerate(queries):
+        started = time.perf_counter()
+        fn(q)
+        samples[i] = time.perf_counter() - started
+    us = samples * 1e6
+    return {
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p95_us": round(float(np.percentile(us, 95)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+        "mean_us": round(float(us.mean()), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="오프라인 주소 사전 색인 벤치마크")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    addresses, lat, lng = synthetic_records(args.entries, args.seed)
+
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    gazetteer = Gazetteer.from_records(addresses, lat, lng)
+    build_seconds = time.perf_counter() - started
+    rss_after = rss_bytes()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        npz = Path(tmp) / "gazetteer.npz"
+        gazetteer.save(npz)
+        started = time.perf_counter()
+        Gazetteer.load(npz)
+        npz_load_seconds = time.perf_counter() - started
+        npz_bytes = npz.stat().st_size
+
+    rs = np.random.RandomState(args.seed + 1)
+    exact = [addresses[i] for i in rs.randint(len(addresses), size=args.queries)]
+    area = [" ".join(a.split()[:2]) for a in exact]
+    miss = [f"{a} 없는동" for a in exact]
+
+    result = {
+        "entries": len(gazetteer),
+        "build_seconds": round(build_seconds, 3),
+        "npz_load_seconds": round(npz_load_seconds, 3),
+        "npz_bytes": npz_bytes,
+        "index_bytes": gazetteer.nbytes(),
+        "bytes_per_entry": round(gazetteer.nbytes() / max(1, len(gazetteer)), 1),
+        "rss_delta_bytes": None if rss_before is None or rss_after is None else rss_after - rss_before,
+        "lookup_exact": _latency(gazetteer.lookup, exact),
+        "lookup_area": _latency(gazetteer.lookup, area),
+        "lookup_miss": _latency(gazetteer.lookup, miss),
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# 간편 시나리오 등급화 벤치마크: 기존 방식(Series.apply / 값마다 if-체인)과 app/grading.py(np.searchsorted) 비교
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.grading import grade, grade_frame, grade_matrix  # noqa: E402
+
+# 학습 데이터와 비슷한 분포의 합성 컬럼 (결측 비율 포함)
+COLUMNS = {
+    "임신횟수": (3.8, 3.4, [1.0, 3.0, 6.0]),
+    "혈당": (121.7, 30.5, [99.0, 117.0, 141.0]),
+    "BMI": (32.4, 6.7, [27.5, 32.3, 36.6]),
+    "나이": (33.2, 11.6, [24.0, 29.0, 41.0]),
+}
+
+
+def _to_grade(v: float, q1: float, q2: float, q3: float) -> int:
+    # 기존 학습/검증 스크립트의 if-체인
+    if v <= q1:
+        return 1
+    if v <= q2:
+        return 2
+    if v <= q3:
+        return 3
+    return 4
+
+
+def _legacy_apply(df: pd.DataFrame, quantiles: dict[str, list[float]]) -> pd.DataFrame:
+    out = pd.DataFrame(index=df.index)
+    for c in df.columns:
+        q1, q2, q3 = quantiles[c]
+        out[c] = df[c].apply(lambda v: _to_grade(v, q1, q2, q3))
+    return out
+
+
+def _legacy_rows(raw: np.ndarray, quantiles: list[list[float]]) -> np.ndarray:
+    # 기존 predictor._build_features: 행마다, 피처마다 to_simple_grade 호출
+    return np.array([[_to_grade(float(v), *q) for v, q in zip(row, quantiles)] for row in raw])
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="분위수 등급화 벤치마크")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--missing", type=float, default=0.05, help="결측(NaN) 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    rs = np.random.RandomState(args.seed)
+    data = {c: rs.normal(mean, std, args.rows).round(1) for c, (mean, std, _q) in COLUMNS.items()}
+    df = pd.DataFrame(data)
+    df[rs.rand(*df.shape) < args.missing] = np.nan
+    # 경계값과 정확히 같은 값도 섞어 <= 경계 의미를 함께 확인
+    for c, (_m, _s, q) in COLUMNS.items():
+        df.loc[df.index[: len(q)], c] = q
+    quantiles = {c: q for c, (_m, _s, q) in COLUMNS.items()}
+    q_rows = [quantiles[c] for c in df.columns]
+    raw = df.to_numpy()
+
+    legacy_df, legacy_df_s = _timed(_legacy_apply, df, quantiles)
+    new_df, new_df_s = _timed(grade_frame, df, quantiles)
+    legacy_rows, legacy_rows_s = _timed(_legacy_rows, raw, q_rows)
+    new_rows, new_rows_s = _timed(grade_matrix, raw, q_rows)
+    _col, new_col_s = _timed(grade, raw[:, 0], q_rows[0])
+
+    result = {
+        "rows": args.rows,
+        "features": len(COLUMNS),
+        "missing_ratio": args.missing,
+        "identical_frame": bool(legacy_df.equals(new_df)),
+        "identical_rows": bool(np.array_equal(legacy_rows, new_rows)),
+        "series_apply_seconds": round(legacy_df_s, 4),
+        "grade_frame_seconds": round(new_df_s, 4),
+        "frame_speedup": round(legacy_df_s / new_df_s, 1),
+        "row_if_chain_seconds": round(legacy_rows_s, 4),
+        "grade_matrix_seconds": round(new_rows_s, 4),
+        "matrix_speedup": round(legacy_rows_s / new_rows_s, 1),
+        "grade_single_column_seconds": round(new_col_s, 4),
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if not (result["identical_frame"] and result["identical_rows"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# 부하 격리 측정: 차트 요청 폭주 / 느린 지오코딩 폭주 중에도 /predict(차트 미포함) 지연이 유지되는지 확인
+#
+# 지오코딩은 네트워크 없이 응답이 느린 StubGeocoder(--geocode-delay)로 대체한다.
+# 각 조건에서 /predict 지연 분포와 폭주 요청의 응답 코드(200/200_no_chart/404/503) 분포를 기록한다.
+# 폭주 클라이언트는 거절(503)이나 차트 없는 응답을 받으면 --backoff초 쉬고 다시 보낸다.
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+
+import httpx
+
+from _common import environment, write_result
+
+from app.geocoding import GeocodeCache, GeocodingService, StubGeocoder, set_geocoding_service
+from app.main import app
+from app.predictor import warm_up
+from bench_load import request_bodies, run_level
+
+
+async def _flood(
+    client: httpx.AsyncClient, kind: str, workers: int, backoff: float, stop: asyncio.Event, codes: Counter
+) -> None:
+    counter = 0
+
+    async def worker(w: int) -> None:
+        nonlocal counter
+        while not stop.is_set():
+            counter += 1
+            if kind == "chart":
+                body = {"혈당": 80 + counter % 100, "BMI": 20 + counter % 20, "차트포함": True}
+                response = await client.post("/predict", json=body)
+                # 차트 실행기가 가득 차면 예측만 200으로 응답
+                if response.status_code == 200 and response.json()["chart_image_base64"] is None:
+                    codes["200_no_chart"] += 1
+                    await asyncio.sleep(backoff)
+                    continue
+            else:
+                response = await client.post("/geocode", json={"address": f"없는 주소 {w}-{counter}"})
+            codes[str(response.status_code)] += 1
+            if response.status_code == 503:
+                await asyncio.sleep(backoff)
+
+    await asyncio.gather(*(worker(w) for w in range(workers)))
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    warm_up()
+    set_geocoding_service(GeocodingService(StubGeocoder(delay=args.geocode_delay), GeocodeCache()))
+    bodies = request_bodies(args.payloads, args.seed)
+    results: dict[str, dict] = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+        await run_level(client, bodies, args.warmup, args.concurrency, False)
+        for condition in ("baseline", "chart_flood", "geocode_flood"):
+            stop = asyncio.Event()
+            codes: Counter = Counter()
+            flood = None
+            if condition != "baseline":
+                flood = asyncio.create_task(_flood(client, condition.split("_")[0], args.flood_workers, args.backoff, stop, codes))
+                await asyncio.sleep(0.2)
+            level = await run_level(client, bodies, args.requests, args.concurrency, False)
+            stop.set()
+            if flood is not None:
+                await flood
+            results[condition] = {**level, "flood_status_codes": dict(sorted(codes.items()))}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="차트/지오코딩 폭주 중 /predict 지연 격리 측정")
+    parser.add_argument("--requests", type=int, default=1000, help="조건별 /predict 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--flood-workers", type=int, default=64, help="폭주 요청 동시 수")
+    parser.add_argument("--backoff", type=float, default=0.1, help="폭주 클라이언트가 503/차트 없음 응답 후 쉬는 시간(초)")
+    parser.add_argument("--geocode-delay", type=float, default=2.0, help="지오코딩 백엔드 응답 지연(초)")
+    parser.add_argument("--payloads", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    conditions = asyncio.run(run(args))
+    result = {
+        "benchmark": "isolation",
+        "environment": environment(),
+        "config": vars(args),
+        "conditions": conditions,
+        "metrics": {
+            f"{condition}.{stat}": summary[stat]
+            for condition, summary in conditions.items()
+            for stat in ("p50_ms", "p95_ms", "p99_ms", "rps")
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# /predict 종단 부하 테스트: 동시 요청 수별 p50/p95/p99 지연 + 초당 요청 수 (차트 포함/미포함)
+#
+# 기본은 FastAPI 앱을 프로세스 안에서 ASGI로 직접 호출(네트워크/서버 프로세스 영향 없음).
+# --url을 주면 로컬 uvicorn 등 실행 중인 서버에 HTTP로 요청한다.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from _common import environment, latency_summary, write_result
+
+from bench_stages import sample_requests
+
+SCENARIOS = ("A", "B", "C", "C_NS")
+
+
+def request_bodies(n: int, seed: int) -> list[dict]:
+    """시나리오를 고르게 섞은 /predict 요청 본문 (한글 키)"""
+    rs = np.random.RandomState(seed)
+    per_scenario = [sample_requests(key, n // len(SCENARIOS) + 1, rs) for key in SCENARIOS]
+    mixed = [req for group in zip(*per_scenario) for req in group][:n]
+    return [req.model_dump(by_alias=True, exclude_none=True) for req in mixed]
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    bodies: list[dict],
+    total: int,
+    concurrency: int,
+    include_chart: bool,
+    offset: int = 0,
+) -> dict:
+    """concurrency개 작업이 요청을 나눠 보내 total건 처리. 응답 실패(비 200)는 errors로 집계
+
+    입력은 bodies[offset:]부터 순환 사용한다. 단계마다 offset을 옮겨 이전 단계의 차트 캐시를 재사용하지 않게 한다.
+    """
+    latencies: list[float] = []
+    errors = 0
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued, errors
+        while issued < total:
+            body = {**bodies[(offset + issued) % len(bodies)], "차트포함": include_chart}
+            issued += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post("/predict", json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        **latency_summary(latencies),
+        "rps": round(total / elapsed, 1),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from app.main import app
+        from app.predictor import warm_up
+
+        warm_up()  # ASGITransport는 lifespan을 실행하지 않으므로 eager 로드를 직접 수행
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=args.timeout
+        )
+
+    bodies = request_bodies(args.payloads, args.seed)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    modes = {"no_chart": (False, args.requests)}
+    if args.chart_requests > 0:
+        modes["chart"] = (True, args.chart_requests)
+
+    results: dict[str, dict] = {}
+    offset = 0
+    async with client:
+        for mode, (include_chart, total) in modes.items():
+            warmup = min(args.warmup, total)
+            await run_level(client, bodies, warmup, max(levels), include_chart, offset)
+            offset += warmup
+            for concurrency in levels:
+                results[f"{mode}.c{concurrency}"] = await run_level(
+                    client, bodies, total, concurrency, include_chart, offset
+                )
+                offset += total
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/predict 종단 부하 테스트")
+    parser.add_argument("--url", default=None, help="실행 중인 서버 주소 (예: http://127.0.0.1:8000). 생략 시 프로세스 내 ASGI 호출")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=2000, help="동시성 단계별 요청 수 (차트 미포함)")
+    parser.add_argument("--chart-requests", type=int, default=200, help="동시성 단계별 요청 수 (차트 포함, 0이면 생략)")
+    parser.add_argument("--payloads", type=int, default=1000, help="순환 사용할 서로 다른 입력 수")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    levels = asyncio.run(run(args))
+    result = {
+        "benchmark": "load",
+        "environment": environment(),
+        "config": vars(args),
+        "levels": levels,
+        "metrics": {
+            f"{level}.{stat}": value
+            for level, summary in levels.items()
+            for stat, value in summary.items()
+            if stat in ("p50_ms", "p95_ms", "p99_ms", "rps")
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# 지표 수집/프로파일러 오버헤드 측정: predict_with_model 지연을 지표 off / on / on+프로파일러로 번갈아 비교
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from _common import environment, write_result
+
+from app import metrics
+from app.predictor import predict_with_model, warm_up
+from app.profiler import PROFILER
+from bench_stages import sample_requests
+
+
+def _block_mean_us(requests: list) -> float:
+    started = time.perf_counter()
+    for req in requests:
+        predict_with_model(req)
+    return (time.perf_counter() - started) / len(requests) * 1e6
+
+
+def _record_cost_us(n: int) -> float:
+    # predict_with_model이 요청마다 추가로 하는 일: StageTimer + lap 3회 + record_prediction
+    started = time.perf_counter()
+    for _ in range(n):
+        timer = metrics.StageTimer()
+        timer.lap("validate")
+        timer.lap("inference")
+        timer.lap("response")
+        metrics.record_prediction("bench", "A", "detail", "normal", timer)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="지표 수집/프로파일러 오버헤드 측정")
+    parser.add_argument("--rounds", type=int, default=20, help="모드별 측정 블록 수 (블록을 번갈아 실행해 잡음 상쇄)")
+    parser.add_argument("--block", type=int, default=500, help="블록당 요청 수")
+    parser.add_argument("--profiler-interval-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    warm_up()
+    rs = np.random.RandomState(args.seed)
+    requests = [r for key in ("A", "B", "C", "C_NS") for r in sample_requests(key, args.block // 4, rs)]
+    _block_mean_us(requests)
+
+    modes = ("metrics_off", "metrics_on", "metrics_on_profiler")
+    blocks: dict[str, list[float]] = {m: [] for m in modes}
+    for _ in range(args.rounds):
+        for mode in modes:
+            metrics.set_enabled(mode != "metrics_off")
+            if mode == "metrics_on_profiler":
+                PROFILER.start(args.profiler_interval_ms / 1000.0)
+            try:
+                blocks[mode].append(_block_mean_us(requests))
+            finally:
+                PROFILER.stop()
+    metrics.set_enabled(True)
+
+    per_call = {m: float(np.median(v)) for m, v in blocks.items()}
+    base = per_call["metrics_off"]
+    render_started = time.perf_counter()
+    text = metrics.render()
+    render_ms = (time.perf_counter() - render_started) * 1000
+    record_us = _record_cost_us(100_000)
+
+    result = {
+        "benchmark": "metrics_overhead",
+        "environment": environment(),
+        "config": vars(args),
+        "predict_us": {m: round(v, 2) for m, v in per_call.items()},
+        "metrics_overhead_us": round(per_call["metrics_on"] - base, 2),
+        "metrics_overhead_ratio": round((per_call["metrics_on"] - base) / base, 4),
+        "profiler_overhead_ratio": round((per_call["metrics_on_profiler"] - base) / base, 4),
+        "record_cost_us": round(record_us, 3),
+        "render_ms": round(render_ms, 3),
+        "render_lines": text.count("\n"),
+        "profiler_samples": PROFILER.samples,
+        "metrics": {
+            "predict_metrics_off_ms": round(per_call["metrics_off"] / 1000, 4),
+            "predict_metrics_on_ms": round(per_call["metrics_on"] / 1000, 4),
+            "record_cost_ms": round(record_us / 1000, 5),
+            "render_ms": round(render_ms, 3),
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
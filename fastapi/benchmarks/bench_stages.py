@@ -0,0 +1,190 @@
+# predict_with_model 단계별 마이크로 벤치마크 (시나리오 A/B/C/C_NS, 단건 요청 기준)
+#
+# sklearn 경로: 검증 → 원시값 행렬 → clip → 표준화 → KNN 보간 → predict_proba (간편: 등급화 → predict_proba)
+# 고속 경로: compiled predict_proba 전체 / 종단: predict_with_model (결과 캐시가 있으면 *_cached로 적중 비용 별도) / 차트: 캐시 적중(warm)과 처음 그리는 차트(cold, 차트 워커 왕복 포함)
+from __future__ import annotations
+
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from _common import environment, latency_summary, time_calls, write_result
+
+from app import chart
+from app.grading import grade_matrix
+from app.model_loader import FEATURE_LABELS, FEATURE_RANGES
+from app.predictor import (
+    SCENARIO_FEATURES,
+    SCENARIO_INPUT_MODES,
+    _raw_matrix,
+    _resolve_scenario,
+    _scenario_config,
+    compiled_scenario,
+    predict_proba_raw,
+    predict_with_model,
+    warm_up,
+)
+from app.schemas import PredictRequest
+
+# 상세 시나리오에서 항목을 비워 KNN 보간이 일어나게 하는 비율
+MISSING_RATIO = 0.3
+
+
+def sample_requests(key: str, n: int, rs: np.random.RandomState) -> list[PredictRequest]:
+    """시나리오 key로 분기되는 임의 입력 n건 (혈당 외 항목은 MISSING_RATIO로 비움, 최소 1개는 입력)"""
+    features = SCENARIO_FEATURES[key]
+    requests = []
+    for _ in range(n):
+        values = {f: round(float(rs.uniform(*FEATURE_RANGES[f])), 1) for f in features}
+        optional = [f for f in features if f != "glucose"]
+        for f in optional:
+            if rs.rand() < MISSING_RATIO:
+                values.pop(f)
+        if not values:
+            values[optional[0]] = round(float(rs.uniform(*FEATURE_RANGES[optional[0]])), 1)
+        requests.append(PredictRequest(**values, input_mode=SCENARIO_INPUT_MODES[key]))
+    return requests
+
+
+def _detail_stages(cfg: dict, raws: list[np.ndarray]) -> dict[str, tuple]:
+    # predictor._build_features(상세)와 같은 순서로 단계별 입력을 미리 만들어 둔다
+    cols_kor = [FEATURE_LABELS[f] for f in cfg["feature_names"]]
+    clip_bounds = cfg["clip_bounds"] if isinstance(cfg["clip_bounds"], dict) else {}
+    scaler, imputer, model = cfg["scaler"], cfg["imputer"], cfg["model"]
+
+    def clip(raw: np.ndarray) -> np.ndarray:
+        x = raw.copy()
+        x[x == 0.0] = np.nan
+        for j, c in enumerate(cols_kor):
+            if c in clip_bounds:
+                low, up = clip_bounds[c]
+                x[:, j] = np.clip(x[:, j], low, up)
+        return x
+
+    def scale(x: np.ndarray) -> np.ndarray:
+        return scaler.transform(pd.DataFrame(x, columns=cols_kor))
+
+    def proba(x: np.ndarray) -> np.ndarray:
+        return model.predict_proba(x)[:, 1]
+
+    clipped = [clip(r) for r in raws]
+    scaled = [scale(x) for x in clipped]
+    imputed = [imputer.transform(x) for x in scaled]
+    return {
+        "clip": (clip, raws),
+        "scale": (scale, clipped),
+        "impute": (imputer.transform, scaled),
+        "predict_proba": (proba, imputed),
+    }
+
+
+def _simple_stages(cfg: dict, raws: list[np.ndarray]) -> dict[str, tuple]:
+    cols_kor = [FEATURE_LABELS[f] for f in cfg["feature_names"]]
+    quantiles = [cfg["quantiles"][c] for c in cols_kor]
+    model = cfg["model"]
+
+    def grade(raw: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(grade_matrix(raw, quantiles).astype(float), columns=cols_kor)
+
+    def proba(x: pd.DataFrame) -> np.ndarray:
+        return model.predict_proba(x)[:, 1]
+
+    graded = [grade(r) for r in raws]
+    return {"grade": (grade, raws), "predict_proba": (proba, graded)}
+
+
+# 차트 워커의 패널 캐시는 API 프로세스에서 비울 수 없으므로, cold 측정은 아직 그린 적 없는 확률(0.1% 단위)을 쓴다.
+# 피처 중요도 패널은 서버 시작 시 미리 그려 두므로(warm_up) 운영과 같이 캐시된 상태로 측정한다.
+_cold_permilles = itertools.count(1)
+
+
+def bench_scenario(key: str, requests: list[PredictRequest], chart_n: int, warmup: int) -> dict[str, dict]:
+    cfg = _scenario_config(key)
+    resolved = [_resolve_scenario(r) for r in requests]
+    raws = [_raw_matrix(SCENARIO_FEATURES[key], [provided]) for _, provided in resolved]
+
+    stages = {
+        "validate": (_resolve_scenario, requests),
+        "raw_matrix": (lambda p: _raw_matrix(SCENARIO_FEATURES[key], [p]), [p for _, p in resolved]),
+    }
+    if cfg["mode"] == "detail":
+        stages.update(_detail_stages(cfg, raws))
+    elif cfg.get("quantiles"):
+        stages.update(_simple_stages(cfg, raws))
+    stages["sklearn_total"] = (lambda r: predict_proba_raw(key, r, fast=False), raws)
+    compiled = compiled_scenario(key)
+    cache = getattr(compiled, "cache", None)
+    if cache is not None and cache.enabled:
+        # 결과 캐시가 있는 시나리오: 계산 비용(캐시 미사용)과 캐시 적중 비용을 따로 측정
+        def uncached(req: PredictRequest):
+            cache.clear()
+            return predict_with_model(req)
+
+        stages["fast_predict"] = (lambda r: compiled.predict_proba(r, cached=False), raws)
+        stages["predict_with_model"] = (uncached, requests)
+    else:
+        if compiled is not None:
+            stages["fast_predict"] = (compiled.predict_proba, raws)
+        stages["predict_with_model"] = (predict_with_model, requests)
+
+    results = {name: latency_summary(time_calls(fn, inputs, warmup)) for name, (fn, inputs) in stages.items()}
+    if cache is not None and cache.enabled:
+        for r in raws:
+            compiled.predict_proba(r)
+        results["fast_predict_cached"] = latency_summary(time_calls(compiled.predict_proba, raws))
+        results["predict_with_model_cached"] = latency_summary(time_calls(predict_with_model, requests))
+
+    probs = [float(predict_proba_raw(key, r)[0][0]) for r in raws[:chart_n]]
+    chart_args = [(p, provided) for p, (_, provided) in zip(probs, resolved)]
+
+    def draw(args: tuple[float, dict[str, float]]) -> str:
+        return chart.create_chart_base64(args[0], args[1], cfg["model"], cfg["feature_names"])
+
+    def draw_cold(args: tuple[float, dict[str, float]]) -> str:
+        chart.clear_cache()
+        return draw((next(_cold_permilles) / 1000.0, args[1]))
+
+    results["chart_cold"] = latency_summary(time_calls(draw_cold, chart_args, min(warmup, 1)))
+    for args in chart_args:
+        draw(args)
+    results["chart_warm"] = latency_summary(time_calls(draw, chart_args))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="예측 단계별 마이크로 벤치마크")
+    parser.add_argument("--requests", type=int, default=2000, help="시나리오별 측정 요청 수")
+    parser.add_argument("--chart-requests", type=int, default=30, help="시나리오별 차트 측정 수 (cold는 건당 수십 ms)")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--scenarios", default="A,B,C,C_NS")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    warm_up()
+    rs = np.random.RandomState(args.seed)
+    stages: dict[str, dict] = {}
+    for key in args.scenarios.split(","):
+        requests = sample_requests(key, args.requests, rs)
+        stages[key] = bench_scenario(key, requests, args.chart_requests, args.warmup)
+
+    result = {
+        "benchmark": "stages",
+        "environment": environment(),
+        "config": vars(args),
+        "stages": stages,
+        "metrics": {
+            f"{key}.{stage}.{stat}": value
+            for key, by_stage in stages.items()
+            for stage, summary in by_stage.items()
+            for stat, value in summary.items()
+            if stat.endswith("_ms") and stat != "max_ms"
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# 기동 시간 벤치마크: 새 인터프리터에서 import app.main 시간(-X importtime 내역 포함)과 첫 예측까지 걸리는 시간
+#
+# 모드별로 자식 프로세스를 --runs번 띄워 측정한다.
+#   bundle    : lazy 로드 + 컴파일 번들 (sklearn/joblib 없이 첫 예측)
+#   no_bundle : lazy 로드 + 아티팩트에서 직접 컴파일 (DIABETES_COMPILED_BUNDLE=0)
+#   eager     : 서버 시작 시 warm_up() (DIABETES_MODEL_LOAD=eager와 같은 경로)
+# 번들이 없으면 먼저 scripts/compile_artifacts.py를 실행할 것.
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from _common import ROOT, environment, write_result
+
+MODES = {
+    "bundle": {"DIABETES_COMPILED_BUNDLE": "1"},
+    "no_bundle": {"DIABETES_COMPILED_BUNDLE": "0"},
+    "eager": {"DIABETES_COMPILED_BUNDLE": "1", "BENCH_EAGER": "1"},
+}
+
+# 자식 프로세스: 시나리오마다 첫 예측 1건 (차트 없음). KNN 보간 동률 행(sklearn fallback)이 아닌 입력
+CHILD = """
+import json, os, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.model_loader import rss_bytes
+from app.predictor import predict_with_model, warm_up
+from app.schemas import PredictRequest
+if os.environ.get("BENCH_EAGER"):
+    warm_up()
+for body in (
+    {"혈당": 120, "BMI": 30, "나이": 40, "임신횟수": 2},
+    {"BMI": 27.3, "나이": 35},
+    {"혈당": 120, "BMI": 30, "나이": 40, "임신횟수": 2, "입력모드": "simple"},
+    {"BMI": 30, "나이": 40, "입력모드": "simple"},
+):
+    predict_with_model(PredictRequest(**body))
+ready = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "first_predict_s": ready - imported,
+    "rss_mb": (rss_bytes() or 0) / 1e6,
+    "loaded": {m: m in sys.modules for m in ("sklearn", "pandas", "joblib", "matplotlib")},
+}))
+"""
+
+
+def _child_env(extra: dict[str, str]) -> dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("BENCH_")}
+    env.update(extra)
+    env["PYTHONPATH"] = str(ROOT)
+    env.setdefault("DIABETES_CHART_PROCESSES", "0")
+    return env
+
+
+def import_profile(top: int) -> dict:
+    """python -X importtime -c "import app.main" → 전체 시간과 누적 시간 상위 모듈 (ms)"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", "import app.main"],
+        cwd=ROOT, env=_child_env({}), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us), depth, name.strip()))
+    total_ms = sum(c for c, depth, _ in rows if depth == 0) / 1000
+    modules = sorted((r for r in rows if r[1] <= 2), reverse=True)[:top]
+    return {"total_ms": round(total_ms, 1), "top": {name: round(c / 1000, 1) for c, _, name in modules}}
+
+
+def bench_mode(env: dict[str, str], runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", CHILD],
+            cwd=ROOT, env=_child_env(env), capture_output=True, text=True, check=True,
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    import_ms = np.array([s["import_s"] for s in samples]) * 1000
+    predict_ms = np.array([s["first_predict_s"] for s in samples]) * 1000
+    return {
+        "import_ms": round(float(np.median(import_ms)), 1),
+        "first_predict_ms": round(float(np.median(predict_ms)), 1),
+        "ready_ms": round(float(np.median(import_ms + predict_ms)), 1),
+        "rss_mb": round(float(np.median([s["rss_mb"] for s in samples])), 1),
+        "loaded": samples[-1]["loaded"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="import 시간 / 첫 예측까지 시간 (모드별 새 프로세스)")
+    parser.add_argument("--runs", type=int, default=5, help="모드별 프로세스 실행 횟수 (중앙값 보고)")
+    parser.add_argument("--top", type=int, default=15, help="importtime 상위 모듈 수")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    modes = {mode: bench_mode(MODES[mode], args.runs) for mode in args.modes.split(",")}
+    profile = import_profile(args.top)
+    result = {
+        "benchmark": "startup",
+        "environment": environment(),
+        "config": vars(args),
+        "import_profile": profile,
+        "modes": modes,
+        "metrics": {
+            "import_total_ms": profile["total_ms"],
+            **{f"{mode}.{stat}": summary[stat] for mode, summary in modes.items()
+               for stat in ("import_ms", "first_predict_ms", "ready_ms", "rss_mb")},
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
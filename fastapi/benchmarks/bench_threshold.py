@@ -0,0 +1,82 @@
+# threshold 최적화 벤치마크: 기존 격자 탐색(0.30~0.70, 0.01 간격 40개 × accuracy_score)과 scripts/thresholds.py 비교
+#
+# 큰 합성 검증 셋에서 소요 시간과 고른 threshold / 검증 정확도를 비교한다. 정렬 스윕은 범위 안 모든 구분점을 보므로
+# 정확도가 격자 결과 이상이어야 하며(아니면 종료 코드 1), 다른 목표(f1, youden, recall_at_precision)의 시간과 결과도 함께 기록한다.
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics import accuracy_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from thresholds import DEFAULT_BOUNDS, OBJECTIVES, optimize_threshold  # noqa: E402
+
+
+def _legacy_grid(probs: np.ndarray, y: np.ndarray) -> tuple[float, float]:
+    # 기존 train_four_scenarios._optimize_threshold
+    best_th, best_acc = 0.5, -1.0
+    for th in np.arange(0.3, 0.7, 0.01):
+        preds = (probs >= th).astype(int)
+        acc = accuracy_score(y, preds)
+        if acc > best_acc:
+            best_acc = acc
+            best_th = float(th)
+    return best_th, best_acc
+
+
+def _synthetic(rows: int, rs: np.random.RandomState) -> tuple[np.ndarray, np.ndarray]:
+    """양성 35%, 두 클래스 확률 분포가 겹치는 보정된 분류기 출력 흉내 (소수 6자리 → 같은 확률 다수)"""
+    y = (rs.rand(rows) < 0.35).astype(int)
+    logits = rs.normal(np.where(y == 1, 0.9, -0.9), 1.1)
+    return np.round(1.0 / (1.0 + np.exp(-logits)), 6), y
+
+
+def _timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="threshold 격자 탐색 vs 정렬 스윕")
+    parser.add_argument("--rows", default="1000,100000,1000000", help="합성 검증 셋 크기 목록 (쉼표 구분)")
+    parser.add_argument("--min-precision", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    rs = np.random.RandomState(args.seed)
+    result: dict = {"bounds": list(DEFAULT_BOUNDS), "sizes": {}}
+    ok = True
+    for rows in (int(r) for r in args.rows.split(",")):
+        probs, y = _synthetic(rows, rs)
+        (grid_th, grid_acc), grid_s = _timed(_legacy_grid, probs, y)
+        entry = {
+            "distinct_probs": int(len(np.unique(probs))),
+            "grid": {"threshold": round(grid_th, 6), "accuracy": grid_acc, "seconds": round(grid_s, 4)},
+        }
+        for objective in OBJECTIVES:
+            (th, score, _curve), sweep_s = _timed(
+                optimize_threshold, probs, y, objective=objective, min_precision=args.min_precision
+            )
+            entry[objective] = {"threshold": th, "score": score, "seconds": round(sweep_s, 4)}
+        entry["accuracy"]["valid_accuracy"] = float(accuracy_score(y, (probs >= entry["accuracy"]["threshold"])))
+        entry["speedup_accuracy"] = round(grid_s / entry["accuracy"]["seconds"], 1)
+        ok &= entry["accuracy"]["score"] >= grid_acc
+        result["sizes"][str(rows)] = entry
+    result["sweep_not_worse_than_grid"] = bool(ok)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# 멀티 워커 메모리 벤치마크: python -m app.serve를 워커 N개로 띄우고 워커별 RSS / PSS / USS 측정 (Linux /proc)
+#
+#   preload    : 부모가 모델을 로드한 뒤 fork (워커 간 copy-on-write 공유, 기본 실행 방식)
+#   per_worker : --no-preload + eager 로드 (워커마다 따로 로드, uvicorn --workers와 같은 메모리 구조)
+# RSS는 공유 페이지를 워커마다 중복해 세므로, 실제 총 사용량은 PSS 합(부모 포함)으로 비교한다.
+# USS(Private_Clean + Private_Dirty)는 워커 하나를 더 띄울 때 늘어나는 양이다.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from _common import ROOT, environment, write_result
+from bench_stages import sample_requests
+
+MODES = {
+    "preload": (["--preload"], {"DIABETES_MODEL_LOAD": "lazy"}),
+    "per_worker": (["--no-preload"], {"DIABETES_MODEL_LOAD": "eager"}),
+}
+SMAPS_FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def _memory(pid: int) -> dict[str, float]:
+    """/proc/<pid>/smaps_rollup → MB 단위 rss / pss / uss"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in SMAPS_FIELDS:
+                values[key] = int(rest.split()[0]) / 1024
+    return {
+        "rss_mb": round(values["Rss"], 1),
+        "pss_mb": round(values["Pss"], 1),
+        "uss_mb": round(values["Private_Clean"] + values["Private_Dirty"], 1),
+    }
+
+
+def _children(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children", encoding="ascii") as f:
+        return [int(p) for p in f.read().split()]
+
+
+async def _wait_ready(url: str, workers: int, timeout: float) -> None:
+    """모든 워커가 /health에 응답할 때까지 대기 (연결은 커널이 임의 워커에 배정)"""
+    seen: set[int] = set()
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=5.0) as client:
+        while len(seen) < workers:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"준비된 워커 {len(seen)}/{workers}")
+            try:
+                seen.add((await client.get("/health", headers={"Connection": "close"})).json()["pid"])
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+
+
+async def _drive(url: str, bodies: list[dict], concurrency: int) -> None:
+    queue = list(bodies)
+    async with httpx.AsyncClient(base_url=url, timeout=30.0) as client:
+        async def worker() -> None:
+            while queue:
+                response = await client.post("/predict", json=queue.pop(), headers={"Connection": "close"})
+                response.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def bench_mode(mode: str, workers: int, port: int, bodies: list[dict], settle: float) -> dict:
+    flags, env = MODES[mode]
+    env = {**os.environ, **env, "PYTHONPATH": str(ROOT)}
+    env.setdefault("DIABETES_CHART_PROCESSES", "0")
+    proc = subprocess.Popen(
+        [sys.executable, "-W", "ignore", "-m", "app.serve", "--workers", str(workers), "--port", str(port),
+         "--host", "127.0.0.1", "--log-level", "warning", *flags],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        started = time.perf_counter()
+        asyncio.run(_wait_ready(url, workers, timeout=120.0))
+        ready_s = time.perf_counter() - started
+        # 연결마다 새 워커가 배정되므로 모든 워커가 전 시나리오를 처리하게 됨
+        asyncio.run(_drive(url, bodies, concurrency=workers * 2))
+        time.sleep(settle)
+        parent = _memory(proc.pid)
+        per_worker = [_memory(pid) for pid in _children(proc.pid)]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return {
+        "ready_s": round(ready_s, 2),
+        "parent": parent,
+        "workers": per_worker,
+        **{f"worker_{k}": round(float(np.mean([w[k] for w in per_worker])), 1) for k in ("rss_mb", "pss_mb", "uss_mb")},
+        "total_pss_mb": round(parent["pss_mb"] + sum(w["pss_mb"] for w in per_worker), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="멀티 워커(app.serve) 워커별 RSS/PSS/USS")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--requests", type=int, default=400, help="측정 전 보낼 /predict 요청 수 (전 시나리오)")
+    parser.add_argument("--settle", type=float, default=1.0, help="요청 후 측정까지 대기(초)")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로 (benchmarks/compare.py로 비교)")
+    args = parser.parse_args()
+
+    rs = np.random.RandomState(args.seed)
+    per_scenario = max(1, args.requests // 4)
+    bodies = [
+        r.model_dump(by_alias=True, exclude_none=True)
+        for key in ("A", "B", "C", "C_NS")
+        for r in sample_requests(key, per_scenario, rs)
+    ]
+    modes = {mode: bench_mode(mode, args.workers, args.port, bodies, args.settle) for mode in args.modes.split(",")}
+    result = {
+        "benchmark": "workers",
+        "environment": environment(),
+        "config": vars(args),
+        "modes": modes,
+        "metrics": {
+            f"{mode}.{stat}": summary[stat]
+            for mode, summary in modes.items()
+            for stat in ("worker_rss_mb", "worker_pss_mb", "worker_uss_mb", "total_pss_mb")
+        },
+    }
+    write_result(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# 벤치마크 결과 JSON 두 개 비교: 기준 대비 임계값 이상 나빠진 지표가 있으면 종료 코드 1
+#
+# 비교 대상은 결과의 "metrics"(없으면 최상위 숫자 값)이다.
+# *_ms / *_seconds 는 낮을수록, rps / *_per_second / *speedup 은 높을수록 좋은 지표로 본다.
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+LOWER_IS_BETTER = ("_ms", "_seconds")
+HIGHER_IS_BETTER = ("rps", "_per_second", "speedup")
+
+
+def load_metrics(path: Path) -> dict[str, float]:
+    result = json.loads(path.read_text(encoding="utf-8"))
+    metrics = result.get("metrics", result)
+    return {k: float(v) for k, v in metrics.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+
+
+def direction(name: str) -> int:
+    """1: 높을수록 좋음, -1: 낮을수록 좋음, 0: 비교하지 않음"""
+    if name.endswith(HIGHER_IS_BETTER):
+        return 1
+    if name.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(
+    baseline: dict[str, float],
+    current: dict[str, float],
+    threshold: float,
+    min_delta_ms: float,
+) -> list[dict]:
+    """공통 지표별 변화율. 나빠진 방향으로 threshold(비율)를 넘으면 regression
+
+    µs 단위 단계는 잡음이 상대적으로 크므로 ms 지표는 절대 차이가 min_delta_ms 미만이면 regression으로 보지 않는다.
+    """
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        sign = direction(name)
+        base, cur = baseline[name], current[name]
+        if sign == 0 or base == 0:
+            continue
+        change = (cur - base) / abs(base)
+        worse = -change * sign
+        regression = worse > threshold
+        if regression and name.endswith("_ms") and abs(cur - base) < min_delta_ms:
+            regression = False
+        rows.append({"metric": name, "baseline": base, "current": cur, "change": change, "regression": regression})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교 (회귀 검출)")
+    parser.add_argument("baseline", help="기준 결과 JSON")
+    parser.add_argument("current", help="비교할 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="허용 악화 비율 (기본 0.10 = 10%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ms 지표에서 무시할 절대 차이")
+    parser.add_argument("--only", default=None, help="이 문자열을 포함하는 지표만 비교 (예: p95_ms)")
+    args = parser.parse_args()
+
+    baseline = load_metrics(Path(args.baseline))
+    current = load_metrics(Path(args.current))
+    if args.only:
+        baseline = {k: v for k, v in baseline.items() if args.only in k}
+    rows = compare(baseline, current, args.threshold, args.min_delta_ms)
+    if not rows:
+        raise SystemExit("비교할 공통 지표가 없습니다.")
+
+    width = max(len(r["metric"]) for r in rows)
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"{r['metric']:<{width}}  {r['baseline']:>12.4f} → {r['current']:>12.4f}  {r['change']:+8.1%}  {flag}")
+
+    regressions = [r for r in rows if r["regression"]]
+    print(f"\n{len(rows)}개 지표 비교, 회귀 {len(regressions)}개 (임계값 {args.threshold:.0%})")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
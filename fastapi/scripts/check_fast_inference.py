@@ -0,0 +1,80 @@
+# 고속(NumPy) 추론 경로와 sklearn predict_proba 경로의 확률 일치 검증 (학습과 같은 검증 split 사용)
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.model_loader import FEATURE_LABELS, FEATURE_RANGES  # noqa: E402
+from app.predictor import SCENARIO_NAMES, _scenario_config, compiled_scenario, predict_proba_raw  # noqa: E402
+
+
+def _validation_raw(csv_path: Path, feature_names: list[str]) -> np.ndarray:
+    df = pd.read_csv(csv_path)
+    if "당뇨" not in df.columns:
+        raise ValueError("CSV에 타깃 컬럼 '당뇨'가 없습니다.")
+    y = df["당뇨"]
+    for c in ["혈당", "혈압", "피부두께", "인슐린", "BMI"]:
+        if c in df.columns:
+            df[c] = df[c].replace(0, np.nan)
+    x = df[[FEATURE_LABELS[f] for f in feature_names]]
+    x_temp, _x_test, y_temp, _y_test = train_test_split(x, y, test_size=0.2, stratify=y, random_state=42)
+    _x_train, x_valid, _y_train, _y_valid = train_test_split(
+        x_temp, y_temp, test_size=0.25, stratify=y_temp, random_state=42
+    )
+    return x_valid.to_numpy(dtype=float)
+
+
+def _synthetic_raw(n: int, feature_names: list[str], seed: int) -> np.ndarray:
+    rs = np.random.RandomState(seed)
+    raw = np.column_stack([rs.uniform(*FEATURE_RANGES[f], n) for f in feature_names]).round(1)
+    raw[rs.rand(*raw.shape) < 0.15] = 0.0  # 미입력/0 입력 섞기
+    return raw
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="고속 추론 경로 ↔ sklearn 경로 확률 일치 검증")
+    parser.add_argument("--csv", default="/Users/cheng80/Desktop/diabetes_python/Data/당뇨.csv")
+    parser.add_argument("--synthetic", type=int, default=0, help="CSV 대신 사용할 임의 샘플 수")
+    parser.add_argument("--tol", type=float, default=1e-9)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not args.synthetic and not Path(args.csv).exists():
+        raise FileNotFoundError(f"CSV 파일이 없습니다: {args.csv} (--synthetic N 사용 가능)")
+
+    passed_all = True
+    for key in SCENARIO_NAMES:
+        if compiled_scenario(key) is None:
+            print(f"[{key}] 고속 경로 미지원 → sklearn 경로 사용 (SKIP)")
+            continue
+        feature_names = _scenario_config(key)["feature_names"]
+        if args.synthetic:
+            raw = _synthetic_raw(args.synthetic, feature_names, args.seed)
+        else:
+            raw = _validation_raw(Path(args.csv), feature_names)
+        fast, _ = predict_proba_raw(key, raw, fast=True)
+        if _scenario_config(key)["mode"] == "detail":
+            # KNNImputer는 k번째 이웃이 동률일 때 배치 구성에 따라 선택이 달라지므로,
+            # 기존 /predict와 같이 행 단위 sklearn 결과를 기준으로 비교
+            slow = np.concatenate([predict_proba_raw(key, raw[i : i + 1], fast=False)[0] for i in range(len(raw))])
+        else:
+            slow, _ = predict_proba_raw(key, raw, fast=False)
+        max_diff = float(np.max(np.abs(fast - slow)))
+        passed = max_diff <= args.tol
+        passed_all = passed_all and passed
+        print(f"[{key}] rows={len(raw)}, max_abs_diff={max_diff:.3e} -> {'PASS' if passed else 'FAIL'}")
+
+    print("PASS" if passed_all else "FAIL")
+    if not passed_all:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# 모델 디렉터리의 sklearn 아티팩트를 고속 추론 배열 번들(compiled_scenarios.npz)로 컴파일
+#
+# 번들은 모델 버전(model_scenarios_meta.json version 또는 아티팩트 해시)과 함께 저장되며,
+# 서버는 같은 버전일 때만 사용한다(DIABETES_COMPILED_BUNDLE). 아티팩트를 바꾸면 다시 실행할 것.
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.fast_inference import bundle_arrays, compile_scenario  # noqa: E402
+from app.model_loader import (  # noqa: E402
+    APP_DIR,
+    COMPILED_BUNDLE_FILENAME,
+    COMPILED_BUNDLE_FORMAT,
+    ModelSet,
+)
+from app.predictor import SCENARIO_NAMES, _scenario_config  # noqa: E402
+
+
+def write_bundle(model_dir: Path, out: Path | None = None) -> Path:
+    """model_dir 아티팩트를 시나리오별로 컴파일해 번들로 저장하고 경로를 돌려준다
+
+    시나리오 아티팩트만 사용하므로 런타임 기본 모델(model_sugar/model_no_sugar)이 없는 디렉터리도 컴파일한다.
+    """
+    models = ModelSet(model_dir, mmap_mode=None, require_runtime=False)
+    arrays: dict[str, np.ndarray] = {
+        "version": np.array(models.version),
+        "format": np.array(COMPILED_BUNDLE_FORMAT),
+    }
+    for key in SCENARIO_NAMES:
+        started = time.perf_counter()
+        compiled = compile_scenario(_scenario_config(key, models), name=key)
+        scenario = bundle_arrays(compiled, key) if compiled is not None else None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if scenario is None:
+            print(f"[SKIP] {key}: 고속 경로 미지원 구성 (서버에서 sklearn 아티팩트로 처리)")
+            continue
+        arrays.update(scenario)
+        size = sum(a.nbytes for a in scenario.values())
+        print(f"[OK] {key}: 배열 {len(scenario)}개, {size / 1024:.1f} KB, 컴파일 {elapsed_ms:.0f} ms")
+
+    out = out or models.base_dir / COMPILED_BUNDLE_FILENAME
+    # 압축하지 않음: 기동 시 로드 시간이 우선 (크기는 수십~수백 KB 수준). 임시 파일에 쓴 뒤 교체
+    tmp = out.with_name(out.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, out)
+    print(f"저장: {out} (버전 {models.version}, {out.stat().st_size / 1024:.1f} KB)")
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="sklearn 아티팩트 → 고속 추론 배열 번들(.npz)")
+    parser.add_argument("--model-dir", default=str(APP_DIR), help="아티팩트 디렉터리 (기본: app/)")
+    parser.add_argument("--out", default=None, help=f"출력 경로 (기본: <model-dir>/{COMPILED_BUNDLE_FILENAME})")
+    args = parser.parse_args()
+    write_bundle(Path(args.model_dir), Path(args.out) if args.out else None)
+
+
+if __name__ == "__main__":
+    main()
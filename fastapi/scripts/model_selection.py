@@ -0,0 +1,139 @@
+# 교차 검증 + successive halving 모델 선택: 후보 하이퍼파라미터 설정 × 전처리된 fold를 프로세스 풀에서 평가
+#
+# 단계(rung)마다 살아남은 설정을 fold 몇 개로만 평가하고 평균 정확도 하위 설정을 탈락시킨 뒤, 남은 설정에 fold를
+# factor배 늘려 준다. 이미 평가한 fold 점수는 다음 단계에서 재사용하므로 격자가 커져도 계산량은 대략
+# (설정 수 × 첫 단계 fold 수) × 단계 수로 묶인다. 모든 시나리오의 같은 단계 작업은 한 번에 풀로 보낸다.
+from __future__ import annotations
+
+import math
+import time
+from typing import NamedTuple
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid
+
+HALVING_FACTOR = 3
+MIN_FOLDS = 1
+# 마지막 단계까지 남길 최소 설정 수 (soft voting 앙상블 멤버 수)
+MIN_SURVIVORS = 3
+
+# fold = (fit 쪽 전처리 결과, fit 타깃, 평가 쪽 전처리 결과, 평가 타깃)
+Fold = tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+class Config(NamedTuple):
+    family: str
+    params: dict
+    estimator: object  # 미학습 estimator (family 기본값 + params)
+
+    @property
+    def name(self) -> str:
+        if not self.params:
+            return self.family
+        return f"{self.family}(" + ", ".join(f"{k}={v}" for k, v in sorted(self.params.items())) + ")"
+
+
+def expand_grids(grids: list[tuple[str, object, dict]]) -> list[Config]:
+    """[(후보 이름, 기본 estimator, {파라미터: 값 목록})] → 격자의 모든 설정 (정의 순서 유지)"""
+    return [
+        Config(family, params, clone(base).set_params(**params))
+        for family, base, grid in grids
+        for params in ParameterGrid(grid)
+    ]
+
+
+def _score_fold(estimator, x_fit, y_fit, x_eval, y_eval) -> tuple[float, float]:
+    """설정 1개 × fold 1개 → (평가 정확도, 학습 시간). joblib.Memory 키는 미학습 estimator와 fold 데이터 해시"""
+    started = time.perf_counter()
+    model = clone(estimator).fit(x_fit, y_fit)
+    fit_seconds = time.perf_counter() - started
+    return float(model.score(x_eval, y_eval)), fit_seconds
+
+
+def score_folds(jobs: int, memory: joblib.Memory | None, tasks: list[tuple[object, Fold]]) -> list[tuple[float, float]]:
+    """[(estimator, fold)] → [(정확도, 학습 시간)] (입력 순서). 캐시된 항목은 바로 읽고 나머지만 프로세스 풀에서 학습"""
+    score = memory.cache(_score_fold) if memory is not None else _score_fold
+    results: list = [None] * len(tasks)
+    pending = []
+    for i, (estimator, fold) in enumerate(tasks):
+        if memory is not None and score.check_call_in_cache(estimator, *fold):
+            results[i] = score(estimator, *fold)
+        else:
+            pending.append(i)
+    if pending:
+        n_jobs = min(joblib.effective_n_jobs(jobs), len(pending))
+        scored = joblib.Parallel(n_jobs=n_jobs)(joblib.delayed(score)(tasks[i][0], *tasks[i][1]) for i in pending)
+        for i, result in zip(pending, scored):
+            results[i] = result
+    return results
+
+
+def successive_halving(
+    configs: list[Config],
+    folds: dict[str, list[Fold]],
+    jobs: int,
+    memory: joblib.Memory | None,
+    factor: int = HALVING_FACTOR,
+    min_folds: int = MIN_FOLDS,
+    min_survivors: int = MIN_SURVIVORS,
+) -> tuple[dict[str, dict], list[dict]]:
+    """시나리오별로 configs를 folds에서 successive halving → ({시나리오: {"survivors", "history"}}, 단계별 기록)
+
+    survivors: 전체 fold로 평가된 마지막 단계 설정 [(Config, fold 점수 배열)] (평균 정확도 내림차순, 동점이면 정의 순서)
+    history: 모든 설정의 평가 fold 수 / 평균 정확도 (탈락 단계 확인용)
+    """
+    n_folds = min(len(f) for f in folds.values())
+    scores = {key: [[] for _ in configs] for key in folds}
+    alive = {key: list(range(len(configs))) for key in folds}
+    rungs = []
+    resource = max(1, min(min_folds, n_folds))
+    while True:
+        tasks, owners = [], []
+        for key, indices in alive.items():
+            for i in indices:
+                for f in range(len(scores[key][i]), resource):
+                    tasks.append((configs[i].estimator, folds[key][f]))
+                    owners.append((key, i))
+        started = time.perf_counter()
+        fit_seconds = 0.0
+        for (key, i), (score, seconds) in zip(owners, score_folds(jobs, memory, tasks)):
+            scores[key][i].append(score)
+            fit_seconds += seconds
+        rungs.append({
+            "folds": resource,
+            "configs_per_scenario": {key: len(indices) for key, indices in alive.items()},
+            "fits": len(tasks),
+            "fit_seconds": round(fit_seconds, 4),
+            "wall_seconds": round(time.perf_counter() - started, 4),
+        })
+        if resource >= n_folds:
+            break
+        for key, indices in alive.items():
+            keep = max(min_survivors, math.ceil(len(indices) / factor))
+            ranked = sorted(indices, key=lambda i: -np.mean(scores[key][i]))
+            alive[key] = sorted(ranked[:keep])
+        resource = min(n_folds, resource * factor)
+
+    results = {}
+    for key, indices in alive.items():
+        ranked = sorted(indices, key=lambda i: -np.mean(scores[key][i]))
+        results[key] = {
+            "survivors": [(configs[i], np.asarray(scores[key][i])) for i in ranked],
+            "history": [
+                {"name": c.name, "folds": len(scores[key][i]), "mean_accuracy": round(float(np.mean(scores[key][i])), 6)}
+                for i, c in enumerate(configs)
+            ],
+        }
+    return results, rungs
+
+
+def cross_validate(
+    estimators: dict[str, object], folds: dict[str, list[Fold]], jobs: int, memory: joblib.Memory | None
+) -> dict[str, np.ndarray]:
+    """시나리오별 estimator 1개를 모든 fold에서 평가 → {시나리오: fold 점수 배열} (앙상블 평가용)"""
+    keys = list(estimators)
+    tasks = [(estimators[key], fold) for key in keys for fold in folds[key]]
+    results = iter(score_folds(jobs, memory, tasks))
+    return {key: np.array([next(results)[0] for _ in folds[key]]) for key in keys}
@@ -0,0 +1,39 @@
+# 학습/검증 공용 데이터셋 준비: 원본 CSV → 정리된 컬럼 배열 + split 인덱스 + 원본 해시 npz (app/dataset.py)
+#
+# 학습/검증 스크립트는 준비된 파일이 없거나 원본이 바뀌면 자동으로 준비하므로, 미리 만들어 두거나 강제로 다시 만들 때 사용한다.
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.dataset import SPLITS, default_cache_path, load_prepared, prepare_dataset  # noqa: E402
+
+CSV_PATH = Path("/Users/cheng80/Desktop/diabetes_python/Data/당뇨.csv")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="학습/검증 공용 데이터셋(npz) 준비")
+    parser.add_argument("--csv", default=str(CSV_PATH))
+    parser.add_argument("--out", default=None, help="저장 경로 (기본: .cache/dataset/<CSV 이름>.npz)")
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv)
+    out = Path(args.out) if args.out else default_cache_path(csv_path)
+    started = time.perf_counter()
+    prepare_dataset(csv_path, out)
+    prepare_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    data = load_prepared(csv_path, out)
+    load_s = time.perf_counter() - started
+    sizes = ", ".join(f"{name}={len(data.splits[name])}" for name in SPLITS)
+    print(f"저장 완료: {out} ({out.stat().st_size / 1e6:.1f}MB, 준비 {prepare_s:.2f}s, 로드 {load_s * 1000:.1f}ms)")
+    print(f"행 {len(data.frame)}개 ({sizes}), 원본 sha256={data.source_sha256[:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# 대용량 CSV/Parquet 일괄 예측 CLI: 입력을 고정 크기 청크로 스트리밍 → 시나리오(A/B/C/C_NS)별 벡터화 예측
+# → 프로세스 풀 병렬 처리 → 결과를 입력 순서대로 즉시 기록 (입력 크기와 무관하게 메모리 사용량 유지)
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.model_loader import FEATURE_LABELS, MODELS  # noqa: E402
+from app.predictor import (  # noqa: E402
+    INPUT_FEATURES,
+    SCENARIO_FEATURES,
+    SCENARIO_NAMES,
+    compiled_scenario,
+    predict_proba_raw,
+    resolve_scenarios,
+)
+
+# train_four_scenarios.py와 같은 한글 컬럼명 + 행별 입력모드(선택)
+INPUT_COLUMNS = [FEATURE_LABELS[f] for f in INPUT_FEATURES]
+MODE_COLUMN = "입력모드"
+# 결과 컬럼 (/predict 응답 필드명과 동일)
+OUTPUT_COLUMNS = ["scenario", "used_model", "prediction", "probability", "label", "model_version", "error"]
+# CSV 입력은 문자열 그대로 읽으므로, pandas read_csv가 기본으로 결측 처리하던 표기는 미입력으로 본다
+MISSING_VALUES = frozenset({"", "NA", "N/A", "NaN", "nan", "null", "NULL", "None"})
+
+
+def _read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise SystemExit("Parquet 입력에는 pyarrow가 필요합니다: pip install pyarrow") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        # 청크마다 dtype을 따로 추론하면 같은 컬럼이 청크별로 120 / 120.0처럼 다르게 기록되므로 입력은 문자열 그대로 읽어
+        # 결과 파일에 바이트 단위로 옮기고, 숫자 변환은 예측용 행렬에만 한다
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+class _Writer:
+    """CSV는 append, Parquet는 row group 단위로 청크마다 바로 기록"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._parquet = None
+        self._started = False
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            df.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def _numeric_values(chunk: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """입력 컬럼 → (값 행렬(빈 칸은 NaN), 행별 형식 오류 메시지)
+
+    숫자로 읽을 수 없는 칸은 미입력으로 처리하지 않고 그 행을 오류로 보고한다 (/predict의 422와 같은 취지).
+    """
+    n = len(chunk)
+    values = np.full((n, len(INPUT_COLUMNS)), np.nan)
+    errors = np.full(n, None, dtype=object)
+    for j, (c, f) in enumerate(zip(INPUT_COLUMNS, INPUT_FEATURES)):
+        if c not in chunk.columns:
+            continue
+        column = chunk[c].reset_index(drop=True)
+        if column.dtype == object or pd.api.types.is_string_dtype(column.dtype):
+            text = column.astype("string").str.strip()
+            blank = (text.isna() | text.isin(MISSING_VALUES)).to_numpy(dtype=bool)
+            numeric = pd.to_numeric(text.mask(blank), errors="coerce")
+        else:  # Parquet 숫자 컬럼
+            blank = column.isna().to_numpy()
+            numeric = pd.to_numeric(column, errors="coerce")
+        values[:, j] = numeric.to_numpy(dtype=float, na_value=np.nan)
+        invalid = numeric.isna().to_numpy() & ~blank & pd.isna(errors)  # 행마다 첫 번째 오류 칸만 보고
+        for i in np.flatnonzero(invalid):
+            errors[i] = f"{c}({f}) 값이 숫자가 아닙니다: {column.iloc[i]!r}"
+    return values, errors
+
+
+def score_chunk(chunk: pd.DataFrame, default_mode: str) -> pd.DataFrame:
+    """입력 청크 → 입력 컬럼 + 예측 결과 컬럼. 행별 검증 오류는 error 컬럼에 기록"""
+    n = len(chunk)
+    values, format_errors = _numeric_values(chunk)
+    if MODE_COLUMN in chunk.columns:
+        modes = [m if isinstance(m, str) and m.strip() else default_mode for m in chunk[MODE_COLUMN]]
+    else:
+        modes = [default_mode] * n
+    keys, errors = resolve_scenarios(values, modes)
+    # 숫자 형식 오류는 값 검증보다 먼저 보고 (/predict도 422 형식 검증이 400 값 검증보다 앞섬)
+    bad_format = ~pd.isna(format_errors)
+    keys[bad_format] = ""
+    errors[bad_format] = format_errors[bad_format]
+
+    models = MODELS.current
+    probability = np.full(n, np.nan)
+    prediction = np.full(n, -1, dtype=np.int64)
+    for key in SCENARIO_NAMES:
+        rows = np.flatnonzero(keys == key)
+        if not len(rows):
+            continue
+        cols = [INPUT_FEATURES.index(f) for f in SCENARIO_FEATURES[key]]
+        raw = np.nan_to_num(values[np.ix_(rows, cols)], nan=0.0)  # 미입력은 0.0 (/predict와 동일)
+        probs, threshold = predict_proba_raw(key, raw, models=models, cached=False)
+        probability[rows] = np.round(probs, 4)
+        prediction[rows] = probs >= threshold
+
+    ok = keys != ""
+    out = chunk.reset_index(drop=True).copy()
+    out["scenario"] = pd.Series(keys, dtype="string").where(ok)
+    out["used_model"] = pd.Series([SCENARIO_NAMES.get(k) for k in keys], dtype="string")
+    out["prediction"] = pd.Series(prediction, dtype="Int64").where(ok)
+    out["probability"] = probability
+    out["label"] = pd.Series(np.where(prediction == 1, "당뇨 위험", "정상 범위"), dtype="string").where(ok)
+    out["model_version"] = pd.Series([models.version] * n, dtype="string")
+    out["error"] = pd.Series(errors, dtype="string")
+    return out
+
+
+def _init_worker() -> None:
+    # 워커마다 시작 시 한 번 모델 로드 + 고속 추론 객체 생성
+    for key in SCENARIO_NAMES:
+        compiled_scenario(key)
+
+
+def _peak_rss_bytes() -> dict[str, int]:
+    # Linux ru_maxrss 단위는 KB. children은 종료된 워커 중 최대값
+    return {
+        "main": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "workers": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CSV/Parquet 일괄 당뇨 예측 (한글 컬럼: 임신횟수/혈당/BMI/나이)")
+    parser.add_argument("input", help="입력 파일 (.csv 또는 .parquet)")
+    parser.add_argument("output", help="결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument("--mode", default="detail", choices=["detail", "simple"], help="입력모드 컬럼이 없거나 빈 행의 기본값")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=1, help="예측 프로세스 수 (1: 현재 프로세스에서 처리)")
+    parser.add_argument("--report", default=None, help="처리 통계 JSON 저장 경로")
+    args = parser.parse_args()
+
+    in_path, out_path = Path(args.input), Path(args.output)
+    if not in_path.exists():
+        raise FileNotFoundError(f"입력 파일이 없습니다: {in_path}")
+
+    started = time.perf_counter()
+    writer = _Writer(out_path)
+    rows = failed = chunks = 0
+
+    def consume(result: pd.DataFrame) -> None:
+        nonlocal rows, failed, chunks
+        writer.write(result)
+        rows += len(result)
+        failed += int(result["error"].notna().sum())
+        chunks += 1
+
+    try:
+        if args.workers <= 1:
+            _init_worker()
+            for chunk in _read_chunks(in_path, args.chunk_size):
+                consume(score_chunk(chunk, args.mode))
+        else:
+            # 처리 중인 청크 수를 workers * 2로 제한해 읽기가 앞서 나가도 메모리가 늘지 않게 한다
+            with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+                pending: deque = deque()
+                for chunk in _read_chunks(in_path, args.chunk_size):
+                    pending.append(pool.submit(score_chunk, chunk, args.mode))
+                    if len(pending) >= args.workers * 2:
+                        consume(pending.popleft().result())
+                while pending:
+                    consume(pending.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "input": str(in_path),
+        "output": str(out_path),
+        "rows": rows,
+        "failed": failed,
+        "chunks": chunks,
+        "workers": args.workers,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "model_version": MODELS.current.version,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# 서빙 비용을 고려한 모델 선택: 후보별 단건/배치 추론 지연과 직렬화 크기 측정, 예산 안 최고 정확도 선택, 파레토 프런트,
+# soft voting 앙상블 → 작은 학생 모델(로지스틱 회귀) 지식 증류
+#
+# 지연은 서버의 sklearn 경로와 같은 predict_proba(NumPy 입력) 호출 기준이다. 고속 경로가 지원하는 모델(LR/SVC/그 soft voting,
+# 간편 시나리오 표)은 서버에서 이보다 빠르므로 예산 판단에는 보수적인 값이다.
+from __future__ import annotations
+
+import io
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+
+SINGLE_CALLS = 200
+SINGLE_WARMUP = 20
+BATCH_ROWS = 1000
+BATCH_REPEATS = 5
+# 증류 학생 모델이 교사(앙상블)의 검증 정확도에서 이만큼까지 낮아도 채택
+DISTILL_TOLERANCE = 0.01
+
+
+def serialized_kb(model) -> float:
+    """joblib.dump(무압축) 크기 (학습 스크립트가 저장하는 아티팩트 크기와 같음)"""
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return buffer.tell() / 1024
+
+
+def measure(model, x_sample) -> dict[str, float]:
+    """단건(한 행씩 SINGLE_CALLS회) p50/p99, 배치(BATCH_ROWS행) 지연, 직렬화 크기"""
+    x = np.asarray(x_sample, dtype=float)
+    rows = x[np.arange(SINGLE_WARMUP + SINGLE_CALLS) % len(x)]
+    batch = x[np.arange(BATCH_ROWS) % len(x)]
+    single = []
+    with warnings.catch_warnings():
+        # 간편 시나리오 모델은 DataFrame으로 학습해 NumPy 입력 시 피처 이름 경고가 남 (서버와 같은 입력 형태로 측정)
+        warnings.simplefilter("ignore", UserWarning)
+        for i in range(len(rows)):
+            started = time.perf_counter()
+            model.predict_proba(rows[i : i + 1])
+            single.append(time.perf_counter() - started)
+        batch_seconds = []
+        for _ in range(BATCH_REPEATS):
+            started = time.perf_counter()
+            model.predict_proba(batch)
+            batch_seconds.append(time.perf_counter() - started)
+    single_ms = np.asarray(single[SINGLE_WARMUP:]) * 1000.0
+    batch_ms = float(np.median(batch_seconds)) * 1000.0
+    return {
+        "single_p50_ms": round(float(np.percentile(single_ms, 50)), 4),
+        "single_p99_ms": round(float(np.percentile(single_ms, 99)), 4),
+        "batch_ms": round(batch_ms, 4),
+        "batch_row_us": round(batch_ms * 1000.0 / BATCH_ROWS, 4),
+        "size_kb": round(serialized_kb(model), 1),
+    }
+
+
+def within_budget(entry: dict, max_p99_ms: float, max_size_kb: float) -> bool:
+    """예산 0은 제한 없음"""
+    serving = entry["serving"]
+    return (not max_p99_ms or serving["single_p99_ms"] <= max_p99_ms) and (
+        not max_size_kb or serving["size_kb"] <= max_size_kb
+    )
+
+
+def pareto_front(entries: list[dict]) -> list[str]:
+    """교차 검증 정확도(높을수록) · 단건 p99 · 크기(낮을수록) 어느 쪽으로도 다른 후보에 지배되지 않는 후보 이름"""
+
+    def costs(entry: dict) -> tuple[float, float, float]:
+        return (-entry["cv_mean"], entry["serving"]["single_p99_ms"], entry["serving"]["size_kb"])
+
+    front = []
+    for entry in entries:
+        mine = costs(entry)
+        dominated = any(
+            all(o <= m for o, m in zip(costs(other), mine)) and costs(other) != mine for other in entries
+        )
+        if not dominated:
+            front.append(entry["name"])
+    return front
+
+
+def distill(teacher, x_train, student=None):
+    """교사의 양성 확률을 soft label로 학생 모델 학습 (행을 양성/음성으로 복제하고 확률을 가중치로 → 교차 엔트로피 최소화)
+
+    기본 학생은 고속 추론 경로가 지원하는 로지스틱 회귀. x_train이 DataFrame(간편 시나리오 등급)이면 학생도 같은 컬럼 이름으로
+    학습해, 교사처럼 DataFrame을 넘기는 경로(CompiledSimpleScenario.from_model, 검증 grade_frame)에서 피처 이름 경고가 나지 않게 한다.
+    """
+    soft = teacher.predict_proba(x_train)[:, 1]
+    student = clone(student) if student is not None else LogisticRegression(C=1.0, max_iter=1000)
+    n = len(x_train)
+    if isinstance(x_train, pd.DataFrame):
+        doubled = pd.concat([x_train, x_train], ignore_index=True)
+    else:
+        x = np.asarray(x_train, dtype=float)
+        doubled = np.vstack([x, x])
+    return student.fit(
+        doubled,
+        np.r_[np.ones(n, dtype=int), np.zeros(n, dtype=int)],
+        sample_weight=np.r_[soft, 1.0 - soft],
+    )
@@ -0,0 +1,125 @@
+# 검증 확률로 분류 threshold 최적화: 확률을 한 번 정렬하고 모든 구분점을 누적 TP/FP로 훑어 정확한 최적값을 찾는다
+#
+# 구분점 j는 "확률 상위 j개 그룹(같은 확률은 한 그룹)을 양성으로 예측"에 해당하며, 그 예측을 내는 threshold 구간
+# (lower, upper]의 가운데 값을 대표 threshold로 쓴다. 격자 탐색과 달리 구간 사이에 숨은 최적값을 놓치지 않고,
+# 정렬 O(n log n) + 누적합 O(n)으로 목표 함수 여러 개를 한 번에 계산한다.
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+OBJECTIVES = ("accuracy", "f1", "youden", "recall_at_precision")
+DEFAULT_OBJECTIVE = "accuracy"
+DEFAULT_MIN_PRECISION = 0.7
+# 기존 학습 스크립트의 격자 탐색 범위 (검증 셋이 작아 극단적인 threshold로 과적합되는 것을 막음)
+DEFAULT_BOUNDS = (0.30, 0.70)
+# 목표값이 같은 구분점이 여러 개면 이 값에 가장 가까운 threshold를 고름
+TIE_BREAK_CENTER = 0.5
+
+
+class ThresholdCurve(NamedTuple):
+    """구분점별 누적 혼동행렬. 길이는 (서로 다른 확률 수 + 1), 0번은 전부 음성, 마지막은 전부 양성"""
+
+    lower: np.ndarray  # 구간 하한 (이 값보다 커야 함, 마지막은 -inf)
+    upper: np.ndarray  # 구간 상한 (이 값 이하, 0번은 +inf)
+    tp: np.ndarray
+    fp: np.ndarray
+    positives: int
+    negatives: int
+
+    @property
+    def thresholds(self) -> np.ndarray:
+        """구분점별 대표 threshold (구간 가운데, 양 끝 구간은 [0, 1] 안쪽 가운데)"""
+        return _midpoints(self.lower, self.upper, 0.0, 1.0)
+
+
+def threshold_curve(probs, y_true) -> ThresholdCurve:
+    probs = np.asarray(probs, dtype=float)
+    y = np.asarray(y_true).astype(bool)
+    order = np.argsort(-probs, kind="mergesort")
+    ranked = probs[order]
+    # 같은 확률은 한 threshold로 나눌 수 없으므로 그룹의 마지막 위치에서만 끊는다
+    ends = np.r_[np.flatnonzero(ranked[1:] != ranked[:-1]), len(ranked) - 1] if len(ranked) else np.array([], int)
+    tp = np.r_[0, np.cumsum(y[order])[ends]].astype(np.int64)
+    fp = np.r_[0, ends + 1 - tp[1:]].astype(np.int64)
+    distinct = ranked[ends]
+    positives = int(y.sum())
+    return ThresholdCurve(
+        lower=np.r_[distinct, -np.inf],
+        upper=np.r_[np.inf, distinct],
+        tp=tp,
+        fp=fp,
+        positives=positives,
+        negatives=int(len(y) - positives),
+    )
+
+
+def _midpoints(lower: np.ndarray, upper: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    a = np.maximum(lower, lo)
+    b = np.minimum(upper, hi)
+    return (a + b) / 2.0
+
+
+def _feasible(lower: np.ndarray, upper: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """구간 (lower, upper]와 [lo, hi]가 겹치는 구분점"""
+    a = np.maximum(lower, lo)
+    b = np.minimum(upper, hi)
+    return (a < b) | ((a == b) & (lower < a))
+
+
+def objective_scores(curve: ThresholdCurve, objective: str, min_precision: float = DEFAULT_MIN_PRECISION) -> np.ndarray:
+    """구분점별 목표값 (recall_at_precision은 정밀도 조건을 못 맞추는 구분점이 NaN)"""
+    tp = curve.tp.astype(float)
+    fp = curve.fp.astype(float)
+    fn = curve.positives - tp
+    tn = curve.negatives - fp
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if objective == "accuracy":
+            return (tp + tn) / max(1, curve.positives + curve.negatives)
+        if objective == "f1":
+            return np.where(tp > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+        if objective == "youden":
+            return tp / max(1, curve.positives) - fp / max(1, curve.negatives)
+        if objective == "recall_at_precision":
+            precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+            return np.where(precision >= min_precision, tp / max(1, curve.positives), np.nan)
+    raise ValueError(f"지원하지 않는 threshold 목표: {objective} (가능: {', '.join(OBJECTIVES)})")
+
+
+def optimize_threshold(
+    probs,
+    y_true,
+    objective: str = DEFAULT_OBJECTIVE,
+    min_precision: float = DEFAULT_MIN_PRECISION,
+    bounds: tuple[float, float] = DEFAULT_BOUNDS,
+) -> tuple[float, float, ThresholdCurve]:
+    """bounds 안에서 objective가 최대인 threshold → (threshold, 목표값, 전체 곡선)"""
+    lo, hi = bounds
+    curve = threshold_curve(probs, y_true)
+    scores = objective_scores(curve, objective, min_precision)
+    allowed = _feasible(curve.lower, curve.upper, lo, hi) & ~np.isnan(scores)
+    if not allowed.any():
+        raise ValueError(
+            f"threshold 범위 [{lo}, {hi}]에서 목표 {objective}를 만족하는 구분점이 없습니다"
+            + (f" (정밀도 ≥ {min_precision})" if objective == "recall_at_precision" else "")
+        )
+    candidates = np.flatnonzero(allowed)
+    best = scores[candidates].max()
+    ties = candidates[scores[candidates] == best]
+    thresholds = _midpoints(curve.lower[ties], curve.upper[ties], lo, hi)
+    pick = int(np.argmin(np.abs(thresholds - TIE_BREAK_CENTER)))
+    return float(thresholds[pick]), float(best), curve
+
+
+def curve_summary(curve: ThresholdCurve, objective: str, min_precision: float = DEFAULT_MIN_PRECISION) -> dict:
+    """메타 JSON에 기록할 전체 곡선 (구분점별 대표 threshold, 누적 TP/FP, 목표값)"""
+    scores = objective_scores(curve, objective, min_precision)
+    return {
+        "positives": curve.positives,
+        "negatives": curve.negatives,
+        "thresholds": [round(float(t), 6) for t in curve.thresholds],
+        "tp": curve.tp.tolist(),
+        "fp": curve.fp.tolist(),
+        "score": [None if np.isnan(s) else round(float(s), 6) for s in scores],
+    }
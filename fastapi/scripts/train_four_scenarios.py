@@ -2,6 +2,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
+import time
+from datetime import datetime
 from pathlib import Path
 
 import joblib
@@ -13,16 +17,40 @@ from sklearn.ensemble import (
     RandomForestClassifier,
     VotingClassifier,
 )
+from sklearn.base import clone
 from sklearn.impute import KNNImputer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import RepeatedStratifiedKFold
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.neural_network import MLPClassifier
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import StandardScaler
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.grading import grade  # noqa: E402
+from app.dataset import load_prepared  # noqa: E402
+from compile_artifacts import write_bundle  # noqa: E402
+from model_selection import (  # noqa: E402
+    HALVING_FACTOR,
+    MIN_FOLDS,
+    MIN_SURVIVORS,
+    cross_validate,
+    expand_grids,
+    successive_halving,
+)
+from serving_budget import DISTILL_TOLERANCE, distill, measure, pareto_front, within_budget  # noqa: E402
+from thresholds import (  # noqa: E402
+    DEFAULT_BOUNDS,
+    DEFAULT_MIN_PRECISION,
+    DEFAULT_OBJECTIVE,
+    OBJECTIVES,
+    curve_summary,
+    optimize_threshold,
+)
+
 
 KOR_COL = {
     "pregnancies": "임신횟수",
@@ -31,6 +59,10 @@ KOR_COL = {
     "age": "나이",
 }
 
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "train"
+ENSEMBLE_NAME = "Voting Ensemble (Top 3 Mix)"
+DISTILLED_NAME = "Distilled LR (Voting Ensemble)"
+
 SCENARIOS = {
     "A": {"name": "a_detail_sugar", "features_eng": ["pregnancies", "glucose", "bmi", "age"], "mode": "detailed"},
     "B": {"name": "b_detail_no_sugar", "features_eng": ["pregnancies", "bmi", "age"], "mode": "detailed"},
@@ -39,31 +71,41 @@ SCENARIOS = {
 }
 
 
-def _candidate_models():
-    return [
-        ("LR", LogisticRegression(C=0.01, random_state=42, max_iter=1000)),
-        ("KNN", KNeighborsClassifier(n_neighbors=15)),
-        ("RF", RandomForestClassifier(n_estimators=100, max_depth=3, random_state=42)),
-        ("GB", GradientBoostingClassifier(n_estimators=30, max_depth=2, random_state=42)),
-        ("Ada", AdaBoostClassifier(n_estimators=100, learning_rate=0.1, random_state=42)),
-        ("SVM", SVC(C=1, probability=True, random_state=42)),
-        ("MLP", MLPClassifier(hidden_layer_sizes=(50,), max_iter=1000, random_state=42)),
-        ("DT", DecisionTreeClassifier(max_depth=3, random_state=42)),
-    ]
+def _dump(obj, path: Path) -> None:
+    # 임시 파일에 쓴 뒤 교체: 서버가 메모리 매핑 중인 기존 파일(inode)을 덮어쓰지 않는다
+    tmp = path.with_name(path.name + ".tmp")
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
 
 
-def _to_grade(v: float, q1: float, q2: float, q3: float) -> int:
-    # 노트북 동작과 동일하게 NaN은 else로 떨어져 4가 되도록 유지
-    if v <= q1:
-        return 1
-    if v <= q2:
-        return 2
-    if v <= q3:
-        return 3
-    return 4
+def _candidate_grids():
+    """(후보 이름, 기본 estimator, 하이퍼파라미터 격자). 격자의 모든 조합이 successive halving 대상 (기존 고정 설정 포함)"""
+    return [
+        ("LR", LogisticRegression(C=0.01, random_state=42, max_iter=1000), {"C": [0.001, 0.01, 0.1, 1.0]}),
+        ("KNN", KNeighborsClassifier(n_neighbors=15), {"n_neighbors": [5, 15, 31]}),
+        ("RF", RandomForestClassifier(n_estimators=100, max_depth=3, random_state=42), {"max_depth": [3, 5]}),
+        (
+            "GB",
+            GradientBoostingClassifier(n_estimators=30, max_depth=2, random_state=42),
+            {"n_estimators": [30, 100], "max_depth": [2, 3]},
+        ),
+        (
+            "Ada",
+            AdaBoostClassifier(n_estimators=100, learning_rate=0.1, random_state=42),
+            {"learning_rate": [0.1, 0.5]},
+        ),
+        ("SVM", SVC(C=1, probability=True, random_state=42), {"C": [0.3, 1, 3]}),
+        (
+            "MLP",
+            MLPClassifier(hidden_layer_sizes=(50,), max_iter=1000, random_state=42),
+            {"alpha": [0.0001, 0.01]},
+        ),
+        ("DT", DecisionTreeClassifier(max_depth=3, random_state=42), {"max_depth": [3, 5]}),
+    ]
 
 
-def _preprocess_detailed(x_train: pd.DataFrame, x_valid: pd.DataFrame, x_test: pd.DataFrame):
+def _preprocess_detailed(x_train: pd.DataFrame, *others: pd.DataFrame):
+    """x_train 기준 clip → 표준화 → KNN 보간 학습, others에 같은 변환 적용 (입력 DataFrame을 clip으로 수정)"""
     clip_bounds: dict[str, list[float]] = {}
     for col in x_train.columns:
         q1, q3 = x_train[col].quantile([0.25, 0.75])
@@ -71,63 +113,225 @@ def _preprocess_detailed(x_train: pd.DataFrame, x_valid: pd.DataFrame, x_test: p
         low, up = q1 - 1.5 * iqr, q3 + 1.5 * iqr
         clip_bounds[col] = [float(low), float(up)]
         x_train[col] = x_train[col].clip(low, up)
-        x_valid[col] = x_valid[col].clip(low, up)
-        x_test[col] = x_test[col].clip(low, up)
+        for x in others:
+            x[col] = x[col].clip(low, up)
 
     scaler = StandardScaler()
     imputer = KNNImputer(n_neighbors=5)
     x_train_pre = imputer.fit_transform(scaler.fit_transform(x_train))
-    x_valid_pre = imputer.transform(scaler.transform(x_valid))
-    x_test_pre = imputer.transform(scaler.transform(x_test))
-    return x_train_pre, x_valid_pre, x_test_pre, scaler, imputer, clip_bounds
+    others_pre = [imputer.transform(scaler.transform(x)) for x in others]
+    return x_train_pre, others_pre, scaler, imputer, clip_bounds
 
 
-def _preprocess_simple(x_train: pd.DataFrame, x_valid: pd.DataFrame, x_test: pd.DataFrame):
+def _preprocess_simple(x_train: pd.DataFrame, *others: pd.DataFrame):
+    """x_train 분위수로 x_train/others 등급화"""
     quantiles: dict[str, list[float]] = {}
     x_train_g = x_train.copy()
-    x_valid_g = x_valid.copy()
-    x_test_g = x_test.copy()
+    others_g = [x.copy() for x in others]
     for col in x_train.columns:
         q1, q2, q3 = x_train[col].quantile([0.25, 0.5, 0.75])
         quantiles[col] = [float(q1), float(q2), float(q3)]
-        x_train_g[col] = x_train[col].apply(lambda v: _to_grade(v, q1, q2, q3))
-        x_valid_g[col] = x_valid[col].apply(lambda v: _to_grade(v, q1, q2, q3))
-        x_test_g[col] = x_test[col].apply(lambda v: _to_grade(v, q1, q2, q3))
-    return x_train_g, x_valid_g, x_test_g, quantiles
-
-
-def _select_winner(x_train_pre, y_train, x_valid_pre, y_valid):
-    perf = []
-    fitted = {}
-    for name, model in _candidate_models():
-        model.fit(x_train_pre, y_train)
-        perf.append({"name": name, "score": float(model.score(x_valid_pre, y_valid))})
-        fitted[name] = model
-    perf.sort(key=lambda x: x["score"], reverse=True)
-    top3 = perf[:3]
-    ensemble = VotingClassifier(
-        estimators=[(m["name"], fitted[m["name"]]) for m in top3],
-        voting="soft",
-    )
-    ensemble.fit(x_train_pre, y_train)
-    perf.append({"name": "Voting Ensemble (Top 3 Mix)", "score": float(ensemble.score(x_valid_pre, y_valid))})
-    perf.sort(key=lambda x: x["score"], reverse=True)
-    winner_name = perf[0]["name"]
-    if winner_name == "Voting Ensemble (Top 3 Mix)":
-        return ensemble, winner_name, perf
-    return fitted[winner_name], winner_name, perf
+        # 노트북 동작과 동일하게 NaN은 4등급 (app/grading.py)
+        x_train_g[col] = grade(x_train[col], quantiles[col])
+        for x, x_g in zip(others, others_g):
+            x_g[col] = grade(x[col], quantiles[col])
+    return x_train_g, others_g, quantiles
+
+
+def _prepare_scenario(x: pd.DataFrame, y: pd.Series, mode: str, splits: dict[str, np.ndarray]) -> dict:
+    """준비된 데이터셋의 train/valid/test 행으로 나눠 전처리 (joblib.Memory로 데이터/모드/split 해시 기준 캐시)"""
+    started = time.perf_counter()
+    x_train, x_valid, x_test = (x.iloc[splits[name]] for name in ("train", "valid", "test"))
+    y_train, y_valid, y_test = (y.iloc[splits[name]] for name in ("train", "valid", "test"))
+
+    if mode == "detailed":
+        x_train_pre, (x_valid_pre, x_test_pre), scaler, imputer, clip_bounds = _preprocess_detailed(
+            x_train.copy(), x_valid.copy(), x_test.copy()
+        )
+        quantiles = None
+    else:
+        x_train_pre, (x_valid_pre, x_test_pre), quantiles = _preprocess_simple(
+            x_train.copy(), x_valid.copy(), x_test.copy()
+        )
+        scaler = None
+        imputer = None
+        clip_bounds = None
+
+    return {
+        "x_train_pre": x_train_pre,
+        "x_valid_pre": x_valid_pre,
+        "x_test_pre": x_test_pre,
+        "y_train": y_train,
+        "y_valid": y_valid,
+        "y_test": y_test,
+        "scaler": scaler,
+        "imputer": imputer,
+        "clip_bounds": clip_bounds,
+        "quantiles": quantiles,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _prepare_folds(
+    x: pd.DataFrame, y: pd.Series, mode: str, train_rows: np.ndarray, n_splits: int, n_repeats: int
+) -> list[tuple]:
+    """train 행의 반복 층화 K-fold → fold별 전처리 결과 (fit 쪽으로 clip/표준화/보간 또는 분위수를 학습해 평가 쪽에 적용)
+
+    후보 설정마다 다시 계산하지 않도록 시나리오당 한 번 만들고 joblib.Memory로 캐시한다 (데이터/모드/split/fold 설정 해시).
+    """
+    x_train, y_train = x.iloc[train_rows], y.iloc[train_rows].to_numpy()
+    cv = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=42)
+    folds = []
+    for fit_rows, eval_rows in cv.split(x_train, y_train):
+        x_fit, x_eval = x_train.iloc[fit_rows].copy(), x_train.iloc[eval_rows].copy()
+        if mode == "detailed":
+            x_fit_pre, (x_eval_pre,), *_ = _preprocess_detailed(x_fit, x_eval)
+        else:
+            x_fit_pre, (x_eval_pre,), _ = _preprocess_simple(x_fit, x_eval)
+        folds.append((np.asarray(x_fit_pre), y_train[fit_rows], np.asarray(x_eval_pre), y_train[eval_rows]))
+    return folds
+
+
+def _fit_candidate(estimator, x_train_pre, y_train, x_valid_pre, y_valid):
+    """후보 모델 1개 학습 → (학습된 모델, 검증 정확도, 학습 시간)
+
+    joblib.Memory 캐시 키는 미학습 estimator(파라미터, random_state)와 데이터의 해시이므로
+    후보 하나의 설정만 바꾸면 그 후보만 다시 학습된다.
+    """
+    started = time.perf_counter()
+    model = clone(estimator).fit(x_train_pre, y_train)
+    fit_seconds = time.perf_counter() - started
+    return model, float(model.score(x_valid_pre, y_valid)), fit_seconds
+
+
+def _fit_args(estimator, prep: dict) -> tuple:
+    return estimator, prep["x_train_pre"], prep["y_train"], prep["x_valid_pre"], prep["y_valid"]
+
+
+def _run_fit(memory: joblib.Memory | None, key: str, name: str, estimator, prep: dict):
+    """캐시가 있으면 읽고 없으면 학습 → (시나리오, 후보 이름, 모델, 검증 정확도, 시간 정보)"""
+    args = _fit_args(estimator, prep)
+    fit = memory.cache(_fit_candidate) if memory is not None else _fit_candidate
+    cached = memory is not None and fit.check_call_in_cache(*args)
+    started = time.perf_counter()
+    model, score, fit_seconds = fit(*args)
+    timing = {
+        "fit_seconds": round(fit_seconds, 4),
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "cached": bool(cached),
+    }
+    return key, name, model, score, timing
+
+
+def _run_fits(jobs: int, memory: joblib.Memory | None, tasks: list[tuple]) -> list[tuple]:
+    """tasks: [(시나리오, 후보 이름, 미학습 estimator, 전처리 결과)]
+
+    캐시된 항목은 현재 프로세스에서 바로 읽고, 나머지만 프로세스 풀에서 학습한다 (결과는 입력 순서 유지).
+    """
+    fit = memory.cache(_fit_candidate) if memory is not None else None
+    pending = [
+        i for i, (_key, _name, estimator, prep) in enumerate(tasks)
+        if fit is None or not fit.check_call_in_cache(*_fit_args(estimator, prep))
+    ]
+    results: list = [None] * len(tasks)
+    for i, task in enumerate(tasks):
+        if i not in pending:
+            results[i] = _run_fit(memory, *task)
+    if pending:
+        n_jobs = min(joblib.effective_n_jobs(jobs), len(pending))
+        fitted = joblib.Parallel(n_jobs=n_jobs)(joblib.delayed(_run_fit)(memory, *tasks[i]) for i in pending)
+        for i, result in zip(pending, fitted):
+            results[i] = result
+    return results
+
+
+def _ensemble_members(survivors: list[tuple]) -> list:
+    """교차 검증 상위 설정 중 앙상블 멤버 3개 (서로 다른 후보를 우선, 모자라면 같은 후보의 다른 설정으로 채움)"""
+    ranked = [config for config, _ in survivors]
+    members, families = [], set()
+    for config in ranked:
+        if config.family not in families:
+            members.append(config)
+            families.add(config.family)
+    members += [config for config in ranked if config not in members]
+    return members[:MIN_SURVIVORS]
+
+
+def _cv_entry(name: str, scores: np.ndarray, valid_accuracy: float, params: dict | None = None) -> dict:
+    entry = {
+        "name": name,
+        "cv_mean": float(np.mean(scores)),
+        "cv_std": float(np.std(scores)),
+        "folds": int(len(scores)),
+        "valid_accuracy": valid_accuracy,
+    }
+    if params is not None:
+        entry["params"] = {k: list(v) if isinstance(v, tuple) else v for k, v in params.items()}
+    return entry
+
+
+def _distill_ensemble(perf: list[dict], fitted: dict, prep: dict, tolerance: float) -> dict:
+    """앙상블을 로지스틱 회귀 학생으로 증류. 검증 정확도가 교사 - tolerance 이상이면 perf의 앙상블 항목을 학생으로 교체
+
+    학생은 교사를 대신하므로 교사의 교차 검증 점수를 그대로 쓰고, 지연/크기와 검증 정확도만 새로 잰다.
+    """
+    teacher = next(entry for entry in perf if entry["name"] == ENSEMBLE_NAME)
+    student = distill(fitted[ENSEMBLE_NAME], prep["x_train_pre"])
+    student_valid = float(accuracy_score(prep["y_valid"], student.predict(prep["x_valid_pre"])))
+    accepted = student_valid >= teacher["valid_accuracy"] - tolerance
+    info = {
+        "teacher": ENSEMBLE_NAME,
+        "student": DISTILLED_NAME,
+        "teacher_valid_accuracy": teacher["valid_accuracy"],
+        "student_valid_accuracy": student_valid,
+        "tolerance": tolerance,
+        "accepted": accepted,
+        "student_serving": measure(student, prep["x_valid_pre"]),
+    }
+    if accepted:
+        fitted[DISTILLED_NAME] = student
+        perf[perf.index(teacher)] = {
+            **teacher,
+            "name": DISTILLED_NAME,
+            "valid_accuracy": student_valid,
+            "serving": info["student_serving"],
+            "distilled_from": ENSEMBLE_NAME,
+        }
+    return info
+
 
+def _select_winner(fitted: dict, perf: list[dict], max_p99_ms: float, max_size_kb: float):
+    """서빙 예산(단건 p99, 크기) 안의 생존 설정 + 앙상블 중 교차 검증 평균 정확도 최고 모델
+    (동점이면 생존 순위, 앙상블은 마지막). 예산을 맞추는 후보가 없으면 경고 후 예산 없이 선택"""
+    perf = sorted(perf, key=lambda x: x["cv_mean"], reverse=True)
+    eligible = [entry for entry in perf if within_budget(entry, max_p99_ms, max_size_kb)]
+    if not eligible:
+        print(f"[WARN] 서빙 예산(p99 ≤ {max_p99_ms}ms, 크기 ≤ {max_size_kb}KB)을 맞추는 후보가 없어 정확도로만 선택합니다")
+    winner = (eligible or perf)[0]
+    return fitted[winner["name"]], winner, perf, bool(eligible)
 
-def _optimize_threshold(model, x_valid_pre, y_valid):
+
+def _optimize_threshold(model, x_valid_pre, y_valid, args) -> tuple[float, dict]:
+    """검증 확률의 모든 구분점 중 목표 최대 threshold → (threshold, 메타 기록용 목표/곡선)"""
     probs = model.predict_proba(x_valid_pre)[:, 1]
-    best_th, best_acc = 0.5, -1.0
-    for th in np.arange(0.3, 0.7, 0.01):
-        preds = (probs >= th).astype(int)
-        acc = accuracy_score(y_valid, preds)
-        if acc > best_acc:
-            best_acc = acc
-            best_th = float(th)
-    return best_th
+    bounds = _threshold_bounds(args.threshold_range)
+    threshold, score, curve = optimize_threshold(
+        probs, y_valid, objective=args.threshold_objective, min_precision=args.min_precision, bounds=bounds
+    )
+    objective = {"name": args.threshold_objective, "score": score, "bounds": list(bounds)}
+    if args.threshold_objective == "recall_at_precision":
+        objective["min_precision"] = args.min_precision
+    return threshold, {
+        "threshold_objective": objective,
+        "threshold_curve": curve_summary(curve, args.threshold_objective, args.min_precision),
+    }
+
+
+def _threshold_bounds(text: str) -> tuple[float, float]:
+    lo, hi = (float(v) for v in text.split(","))
+    if not 0.0 <= lo <= hi <= 1.0:
+        raise ValueError(f"--threshold-range는 0 ≤ 하한 ≤ 상한 ≤ 1 이어야 합니다: {text}")
+    return lo, hi
 
 
 def _metrics(model, x_data, y_data, th):
@@ -144,71 +348,174 @@ def _metrics(model, x_data, y_data, th):
 def main() -> None:
     parser = argparse.ArgumentParser(description="최종 리포트 셀(run_best_model_and_report) 기준 4시나리오 학습")
     parser.add_argument("--csv", default="/Users/cheng80/Desktop/diabetes_python/Data/당뇨.csv")
+    parser.add_argument("--dataset", default=None, help="준비된 데이터셋 npz (기본: .cache/dataset/<CSV 이름>.npz)")
+    parser.add_argument("--rebuild-dataset", action="store_true", help="준비된 데이터셋을 무시하고 CSV에서 다시 준비")
     parser.add_argument("--out-dir", default=str(Path(__file__).resolve().parents[1] / "app"))
     parser.add_argument("--overwrite-runtime", action="store_true")
+    parser.add_argument("--version", default=None, help="메타에 기록할 모델 버전 (기본: 학습 시각 YYYYMMDD-HHMMSS)")
+    parser.add_argument("--jobs", type=int, default=-1, help="후보 모델 학습 프로세스 수 (-1: CPU 수, 1: 순차)")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="전처리/후보 학습 결과 캐시 디렉터리")
+    parser.add_argument("--no-cache", action="store_true", help="캐시 사용 안 함")
+    parser.add_argument("--cv-splits", type=int, default=5, help="모델 선택 교차 검증 fold 수 (train 행 기준)")
+    parser.add_argument("--cv-repeats", type=int, default=2, help="반복 층화 K-fold 반복 횟수")
+    parser.add_argument(
+        "--halving-factor", type=int, default=HALVING_FACTOR, help="successive halving 단계마다 남기는 비율의 역수"
+    )
+    parser.add_argument("--min-folds", type=int, default=MIN_FOLDS, help="첫 단계에서 설정마다 평가할 fold 수")
+    parser.add_argument("--max-p99-ms", type=float, default=0.0, help="서빙 예산: 후보 단건 predict_proba p99(ms), 0이면 제한 없음")
+    parser.add_argument("--max-size-kb", type=float, default=0.0, help="서빙 예산: 모델 직렬화 크기(KB), 0이면 제한 없음")
+    parser.add_argument("--distill", action="store_true", help="앙상블을 로지스틱 회귀 학생 모델로 증류해 후보로 사용")
+    parser.add_argument(
+        "--distill-tolerance",
+        type=float,
+        default=DISTILL_TOLERANCE,
+        help="증류 학생 채택 기준: 교사 검증 정확도 대비 허용 하락폭",
+    )
+    parser.add_argument("--threshold-objective", choices=OBJECTIVES, default=DEFAULT_OBJECTIVE, help="검증 셋 threshold 최적화 목표")
+    parser.add_argument(
+        "--min-precision",
+        type=float,
+        default=DEFAULT_MIN_PRECISION,
+        help="recall_at_precision 목표의 최소 정밀도",
+    )
+    parser.add_argument(
+        "--threshold-range",
+        default=",".join(f"{v:.2f}" for v in DEFAULT_BOUNDS),
+        help="threshold 탐색 범위 '하한,상한' (0,1이면 제한 없음)",
+    )
     args = parser.parse_args()
 
-    csv_path = Path(args.csv)
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    if not csv_path.exists():
-        raise FileNotFoundError(f"CSV 파일이 없습니다: {csv_path}")
 
-    df = pd.read_csv(csv_path)
-    if "당뇨" not in df.columns:
-        raise ValueError("CSV에 타깃 컬럼 '당뇨'가 없습니다.")
-    y = df["당뇨"]
+    total_started = time.perf_counter()
+    # 정리된 데이터(0 → NaN)와 split 행 인덱스는 검증 스크립트와 같은 준비된 데이터셋에서 읽음
+    data = load_prepared(Path(args.csv), Path(args.dataset) if args.dataset else None, rebuild=args.rebuild_dataset)
+    df, y = data.frame, data.target
+
+    # joblib.Memory: 함수 인자(데이터, 모드, estimator 파라미터/seed) 해시가 같으면 디스크 캐시 재사용
+    memory = None if args.no_cache else joblib.Memory(args.cache_dir, verbose=0)
+    prepare = memory.cache(_prepare_scenario) if memory is not None else _prepare_scenario
+
+    # 1) 시나리오별 split + 전처리
+    preps: dict[str, dict] = {}
+    report: dict = {
+        "dataset_sha256": data.source_sha256,
+        "dataset_path": str(data.path),
+        "dataset_load_seconds": round(time.perf_counter() - total_started, 4),
+        "jobs": joblib.effective_n_jobs(args.jobs),
+        "scenarios": {},
+    }
+    for key, cfg in SCENARIOS.items():
+        features_kor = [KOR_COL[f] for f in cfg["features_eng"]]
+        x = df[features_kor].copy()
+        started = time.perf_counter()
+        cached = memory is not None and prepare.check_call_in_cache(x, y, cfg["mode"], data.splits)
+        preps[key] = prepare(x, y, cfg["mode"], data.splits)
+        report["scenarios"][key] = {
+            "preprocess": {
+                "seconds": round(preps[key]["seconds"], 4),
+                "wall_seconds": round(time.perf_counter() - started, 4),
+                "cached": bool(cached),
+            },
+            "candidates": {},
+        }
 
-    cols_zero = ["혈당", "혈압", "피부두께", "인슐린", "BMI"]
-    for c in cols_zero:
-        if c in df.columns:
-            df[c] = df[c].replace(0, np.nan)
+    # 2) 시나리오별 train 행 반복 층화 K-fold 전처리 (후보 설정들이 공유)
+    prepare_folds = memory.cache(_prepare_folds) if memory is not None else _prepare_folds
+    folds: dict[str, list[tuple]] = {}
+    started = time.perf_counter()
+    for key, cfg in SCENARIOS.items():
+        x = df[[KOR_COL[f] for f in cfg["features_eng"]]]
+        fold_args = (x, y, cfg["mode"], data.splits["train"], args.cv_splits, args.cv_repeats)
+        cached = memory is not None and prepare_folds.check_call_in_cache(*fold_args)
+        fold_started = time.perf_counter()
+        folds[key] = prepare_folds(*fold_args)
+        report["scenarios"][key]["folds"] = {
+            "wall_seconds": round(time.perf_counter() - fold_started, 4),
+            "cached": bool(cached),
+        }
+    report["folds_wall_seconds"] = round(time.perf_counter() - started, 4)
 
-    metadata: dict[str, dict] = {"scenarios": {}}
+    # 3) 모든 시나리오 × 후보 설정 successive halving (단계별 작업을 하나의 프로세스 풀에서 평가)
+    configs = expand_grids(_candidate_grids())
+    started = time.perf_counter()
+    halving, rungs = successive_halving(
+        configs, folds, args.jobs, memory, factor=args.halving_factor, min_folds=args.min_folds
+    )
+    report["selection"] = {
+        "cv_splits": args.cv_splits,
+        "cv_repeats": args.cv_repeats,
+        "halving_factor": args.halving_factor,
+        "configs": len(configs),
+        "rungs": rungs,
+        "fits": sum(rung["fits"] for rung in rungs),
+        "exhaustive_fits": len(configs) * len(SCENARIOS) * args.cv_splits * args.cv_repeats,
+        "wall_seconds": round(time.perf_counter() - started, 4),
+    }
+    for key in SCENARIOS:
+        report["scenarios"][key]["halving"] = halving[key]["history"]
+
+    # 4) 시나리오별 상위 3개(가능하면 서로 다른 후보) soft voting 앙상블도 같은 fold로 교차 검증
+    started = time.perf_counter()
+    members = {key: _ensemble_members(halving[key]["survivors"]) for key in SCENARIOS}
+    ensembles = {
+        key: VotingClassifier(estimators=[(c.name, clone(c.estimator)) for c in members[key]], voting="soft")
+        for key in SCENARIOS
+    }
+    ensemble_cv = cross_validate(ensembles, folds, args.jobs, memory)
+    report["selection"]["ensemble_wall_seconds"] = round(time.perf_counter() - started, 4)
+
+    # 5) 마지막 단계 생존 설정 + 앙상블을 train 전체로 학습 (VotingClassifier.fit은 멤버를 clone 후 재학습)
+    started = time.perf_counter()
+    tasks = [(key, c.name, c.estimator, preps[key]) for key in SCENARIOS for c, _ in halving[key]["survivors"]]
+    tasks += [(key, ENSEMBLE_NAME, ensembles[key], preps[key]) for key in SCENARIOS]
+    results = _run_fits(args.jobs, memory, tasks)
+    report["candidates_wall_seconds"] = round(time.perf_counter() - started, 4)
+    fitted: dict[str, dict] = {key: {} for key in SCENARIOS}
+    valid_scores: dict[str, dict] = {key: {} for key in SCENARIOS}
+    for key, name, model, score, timing in results:
+        fitted[key][name] = model
+        valid_scores[key][name] = score
+        report["scenarios"][key]["candidates"][name] = {"score": score, **timing}
+
+    metadata: dict = {"version": args.version or datetime.now().strftime("%Y%m%d-%H%M%S"), "scenarios": {}}
 
     for key, cfg in SCENARIOS.items():
         name = cfg["name"]
         mode = cfg["mode"]
         features_eng = cfg["features_eng"]
         features_kor = [KOR_COL[f] for f in features_eng]
-        x = df[features_kor].copy()
-
-        x_temp, x_test, y_temp, y_test = train_test_split(
-            x, y, test_size=0.2, stratify=y, random_state=42
-        )
-        x_train, x_valid, y_train, y_valid = train_test_split(
-            x_temp, y_temp, test_size=0.25, stratify=y_temp, random_state=42
-        )
-
-        if mode == "detailed":
-            x_train_pre, x_valid_pre, x_test_pre, scaler, imputer, clip_bounds = _preprocess_detailed(
-                x_train.copy(), x_valid.copy(), x_test.copy()
-            )
-            quantiles = None
-        else:
-            x_train_pre, x_valid_pre, x_test_pre, quantiles = _preprocess_simple(
-                x_train.copy(), x_valid.copy(), x_test.copy()
-            )
-            scaler = None
-            imputer = None
-            clip_bounds = None
-
-        model, winner_name, perf = _select_winner(x_train_pre, y_train, x_valid_pre, y_valid)
-        threshold = _optimize_threshold(model, x_valid_pre, y_valid)
-
-        train_m = _metrics(model, x_train_pre, y_train, threshold)
-        valid_m = _metrics(model, x_valid_pre, y_valid, threshold)
-        test_m = _metrics(model, x_test_pre, y_test, threshold)
-
-        joblib.dump(model, out_dir / f"{name}_model.joblib")
-        if scaler is not None:
-            joblib.dump(scaler, out_dir / f"{name}_scaler.joblib")
-        if imputer is not None:
-            joblib.dump(imputer, out_dir / f"{name}_imputer.joblib")
-        if clip_bounds is not None:
-            joblib.dump(clip_bounds, out_dir / f"{name}_clip_bounds.joblib")
-        if quantiles is not None:
-            joblib.dump(quantiles, out_dir / f"{name}_quantiles.joblib")
+        prep = preps[key]
+
+        started = time.perf_counter()
+        perf = [
+            _cv_entry(config.name, scores, valid_scores[key][config.name], config.params)
+            for config, scores in halving[key]["survivors"]
+        ]
+        perf.append(_cv_entry(ENSEMBLE_NAME, ensemble_cv[key], valid_scores[key][ENSEMBLE_NAME]))
+        # 서빙 비용: 후보별 단건/배치 지연과 크기 측정 → (선택) 앙상블 증류 → 예산 안에서 선택
+        for entry in perf:
+            entry["serving"] = measure(fitted[key][entry["name"]], prep["x_valid_pre"])
+        distillation = _distill_ensemble(perf, fitted[key], prep, args.distill_tolerance) if args.distill else None
+        model, winner, ranking, budget_met = _select_winner(fitted[key], perf, args.max_p99_ms, args.max_size_kb)
+        winner_name = winner["name"]
+        threshold, threshold_meta = _optimize_threshold(model, prep["x_valid_pre"], prep["y_valid"], args)
+
+        train_m = _metrics(model, prep["x_train_pre"], prep["y_train"], threshold)
+        valid_m = _metrics(model, prep["x_valid_pre"], prep["y_valid"], threshold)
+        test_m = _metrics(model, prep["x_test_pre"], prep["y_test"], threshold)
+
+        _dump(model, out_dir / f"{name}_model.joblib")
+        if prep["scaler"] is not None:
+            _dump(prep["scaler"], out_dir / f"{name}_scaler.joblib")
+        if prep["imputer"] is not None:
+            _dump(prep["imputer"], out_dir / f"{name}_imputer.joblib")
+        if prep["clip_bounds"] is not None:
+            _dump(prep["clip_bounds"], out_dir / f"{name}_clip_bounds.joblib")
+        if prep["quantiles"] is not None:
+            _dump(prep["quantiles"], out_dir / f"{name}_quantiles.joblib")
+        report["scenarios"][key]["finalize_seconds"] = round(time.perf_counter() - started, 4)
 
         metadata["scenarios"][key] = {
             "artifact_name": name,
@@ -217,31 +524,61 @@ def main() -> None:
             "features_kor": features_kor,
             "winner_model": winner_name,
             "threshold": threshold,
+            **threshold_meta,
             "metrics": {"train": train_m, "valid": valid_m, "test": test_m},
-            "candidates_valid_accuracy": perf,
+            "winner_params": winner.get("params", {}),
+            "serving": winner["serving"],
+            "serving_budget": {"max_single_p99_ms": args.max_p99_ms, "max_size_kb": args.max_size_kb, "met": budget_met},
+            "pareto_front": pareto_front(ranking),
+            "candidates_cv_accuracy": ranking,
+            "candidates_valid_accuracy": sorted(
+                ({"name": m["name"], "score": m["valid_accuracy"]} for m in ranking),
+                key=lambda m: m["score"],
+                reverse=True,
+            ),
         }
+        if distillation is not None:
+            metadata["scenarios"][key]["distillation"] = distillation
 
         print(
-            f"[{key}] winner={winner_name}, threshold={threshold:.2f}, "
-            f"test_acc={test_m['accuracy']:.4f}"
+            f"[{key}] winner={winner_name}, threshold={threshold:.4f} ({args.threshold_objective}), "
+            f"test_acc={test_m['accuracy']:.4f}, p99={winner['serving']['single_p99_ms']:.3f}ms, "
+            f"size={winner['serving']['size_kb']:.1f}KB"
         )
 
-    if args.overwrite_runtime:
+    # 런타임 기본 모델이 없는 새 디렉터리(버전별 디렉터리 → 핫 리로드)도 서버가 그대로 로드할 수 있도록 A/B 모델로 채운다
+    runtime_missing = not all((out_dir / f).exists() for f in ("model_sugar.joblib", "model_no_sugar.joblib"))
+    if args.overwrite_runtime or runtime_missing:
         a_model = joblib.load(out_dir / "a_detail_sugar_model.joblib")
         b_model = joblib.load(out_dir / "b_detail_no_sugar_model.joblib")
-        joblib.dump(a_model, out_dir / "model_sugar.joblib")
-        joblib.dump(b_model, out_dir / "model_no_sugar.joblib")
+        _dump(a_model, out_dir / "model_sugar.joblib")
+        _dump(b_model, out_dir / "model_no_sugar.joblib")
         metadata["compat"] = {
             "model_sugar.joblib": "A",
             "model_no_sugar.joblib": "B",
         }
 
-    (out_dir / "model_scenarios_meta.json").write_text(
+    meta_tmp = out_dir / "model_scenarios_meta.json.tmp"
+    meta_tmp.write_text(
         json.dumps(metadata, ensure_ascii=False, indent=2),
         encoding="utf-8",
     )
-    print("저장 완료: model_scenarios_meta.json")
+    os.replace(meta_tmp, out_dir / "model_scenarios_meta.json")
+    print(f"저장 완료: model_scenarios_meta.json (version={metadata['version']})")
 
+    report["version"] = metadata["version"]
+    report["total_wall_seconds"] = round(time.perf_counter() - total_started, 4)
+    (out_dir / "model_training_report.json").write_text(
+        json.dumps(report, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    print(
+        f"학습 시간 리포트: model_training_report.json "
+        f"(total={report['total_wall_seconds']:.1f}s, candidates={report['candidates_wall_seconds']:.1f}s, "
+        f"jobs={report['jobs']})"
+    )
+    # 같은 버전용 고속 추론 번들 (서버가 sklearn 없이 기동). 리포트를 먼저 남겨 컴파일 실패와 무관하게 학습 기록 보존
+    write_bundle(out_dir)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,21 @@
+# pytest 공용 설정: 서버 패키지(app)와 학습 스크립트 모듈(scripts/)을 import 경로에 추가, API 테스트 클라이언트
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+@pytest.fixture
+def client():
+    """API 테스트 클라이언트 (lifespan 없이: 모델은 첫 요청 때 app/ 아티팩트에서 로드)"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
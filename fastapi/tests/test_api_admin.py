@@ -0,0 +1,107 @@
+# 관리자 API(모델, 프로파일러): 토큰 미설정 시 403, 토큰 불일치 시 401, 모델 버전 교체(검증 통과 시만)와 롤백
+from __future__ import annotations
+
+import shutil
+import time
+
+import pytest
+
+from app import settings
+from app.model_loader import APP_DIR, MODELS
+
+TOKEN = "test-admin-token"
+MODEL_ROUTES = [
+    ("get", "/admin/models", None),
+    ("post", "/admin/models/reload", {}),
+    ("post", "/admin/models/rollback", None),
+]
+PROFILER_ROUTES = [
+    ("get", "/admin/profiler", None),
+    ("post", "/admin/profiler/start", {}),
+    ("post", "/admin/profiler/stop", None),
+    ("get", "/admin/profiler/folded", None),
+]
+
+
+def _call(client, method: str, path: str, body, token: str | None = None):
+    headers = {"X-Admin-Token": token} if token is not None else {}
+    return getattr(client, method)(path, headers=headers, **({"json": body} if body is not None else {}))
+
+
+@pytest.fixture
+def admin(client, monkeypatch):
+    """토큰을 설정한 클라이언트. 테스트가 바꾼 현재/직전 모델 버전은 끝나면 되돌린다"""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(MODELS, "_current", MODELS.current)
+    monkeypatch.setattr(MODELS, "_previous", MODELS.previous)
+    return client
+
+
+def _wait_reload(client) -> dict:
+    deadline = time.monotonic() + 60
+    while True:
+        status = _call(client, "get", "/admin/models", None, TOKEN).json()
+        if status["reload"]["status"] != "loading" or time.monotonic() > deadline:
+            return status
+        time.sleep(0.05)
+
+
+@pytest.mark.parametrize("method,path,body", MODEL_ROUTES + PROFILER_ROUTES)
+def test_denied_without_configured_token(client, monkeypatch, method, path, body):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert _call(client, method, path, body).status_code == 403
+    assert _call(client, method, path, body, "").status_code == 403
+    assert _call(client, method, path, body, "anything").status_code == 403
+
+
+@pytest.mark.parametrize("method,path,body", MODEL_ROUTES + PROFILER_ROUTES)
+def test_wrong_or_missing_token(admin, method, path, body):
+    assert _call(admin, method, path, body).status_code == 401
+    assert _call(admin, method, path, body, TOKEN + "x").status_code == 401
+
+
+def test_status_with_token(admin):
+    body = _call(admin, "get", "/admin/models", None, TOKEN).json()
+    assert body["current"]["version"] == MODELS.current.version
+    assert _call(admin, "get", "/admin/profiler", None, TOKEN).status_code == 200
+
+
+def test_reload_rejects_bad_versions(admin, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_ROOT", str(tmp_path))
+    assert _call(admin, "post", "/admin/models/reload", {"버전": "../app"}, TOKEN).status_code == 400
+    assert _call(admin, "post", "/admin/models/reload", {"버전": "missing"}, TOKEN).status_code == 404
+
+
+def test_swap_and_rollback(admin, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_ROOT", str(tmp_path))
+    shutil.copytree(APP_DIR, tmp_path / "v2", ignore=shutil.ignore_patterns("*.py", "__pycache__"))
+    original = MODELS.current
+
+    response = _call(admin, "post", "/admin/models/reload", {"버전": "v2"}, TOKEN)
+    assert response.status_code == 202
+    status = _wait_reload(admin)
+    assert status["reload"]["status"] == "swapped"
+    assert status["reload"]["report"]["passed_all"]
+    assert status["current"]["path"] == str(tmp_path / "v2")
+    assert status["previous"]["path"] == str(original.base_dir)
+    assert admin.post("/predict", json={"혈당": 120, "BMI": 30, "나이": 40}).status_code == 200
+
+    status = _call(admin, "post", "/admin/models/rollback", None, TOKEN).json()
+    assert MODELS.current is original
+    assert status["previous"]["path"] == str(tmp_path / "v2")
+
+
+def test_failed_reload_keeps_current(admin, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_ROOT", str(tmp_path))
+    (tmp_path / "broken").mkdir()
+    original = MODELS.current
+
+    assert _call(admin, "post", "/admin/models/reload", {"버전": "broken"}, TOKEN).status_code == 202
+    status = _wait_reload(admin)
+    assert status["reload"]["status"] == "failed"
+    assert MODELS.current is original
+
+
+def test_rollback_without_previous(admin, monkeypatch):
+    monkeypatch.setattr(MODELS, "_previous", None)
+    assert _call(admin, "post", "/admin/models/rollback", None, TOKEN).status_code == 409
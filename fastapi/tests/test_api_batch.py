@@ -0,0 +1,66 @@
+# /predict/batch: 행별 형식/값 오류, 항목 배열 본문, 항목 수 제한, 차트 없는 배치의 prediction_id 미발급
+from __future__ import annotations
+
+from app import predictor, settings
+
+ROW_A = {"입력모드": "detail", "나이": 50, "BMI": 33.6, "혈당": 148}
+ROW_CNS = {"입력모드": "simple", "BMI": 30}
+
+
+def test_row_errors_do_not_fail_the_batch(client):
+    items = [ROW_A, {"입력모드": "simple", "나이": 500}, {"혈당": "abc"}, "not an object", ROW_CNS]
+    response = client.post("/predict/batch", json={"items": items})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 5 and body["failed"] == 3
+    codes = [r["status_code"] for r in body["results"]]
+    assert codes == [200, 400, 422, 422, 200]
+    assert [r["index"] for r in body["results"]] == list(range(5))
+    assert "나이" in body["results"][1]["error"]
+    assert body["results"][2]["error"].startswith("입력 형식 오류 - 혈당")
+    assert body["results"][4]["result"]["used_model"] == predictor.SCENARIO_NAMES["C_NS"]
+
+
+def test_results_match_single_predict(client):
+    batch = client.post("/predict/batch", json={"items": [ROW_A, ROW_CNS]}).json()["results"]
+    for row, item in zip([ROW_A, ROW_CNS], batch):
+        single = client.post("/predict", json=row).json()
+        assert item["result"]["probability"] == single["probability"]
+        assert item["result"]["prediction"] == single["prediction"]
+
+
+def test_bare_array_body(client):
+    response = client.post("/predict/batch", json=[ROW_A, {"혈당": "abc"}])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2 and body["failed"] == 1
+
+
+def test_invalid_body_is_422(client):
+    assert client.post("/predict/batch", json={"items": {"a": 1}}).status_code == 422
+    assert client.post("/predict/batch", json="rows").status_code == 422
+
+
+def test_item_limit(client, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_ITEMS", 3)
+    assert client.post("/predict/batch", json=[ROW_A] * 3).status_code == 200
+    response = client.post("/predict/batch", json=[ROW_A] * 4)
+    assert response.status_code == 413
+    assert client.post("/predict/batch", json={"items": [ROW_A] * 4}).status_code == 413
+
+
+def test_batch_without_chart_keeps_recent_predictions(client, monkeypatch):
+    monkeypatch.setattr(predictor, "RECENT_PREDICTIONS_SIZE", 4)
+    prediction_id = client.post("/predict", json=ROW_A).json()["prediction_id"]
+    body = client.post("/predict/batch", json=[ROW_A, ROW_CNS] * 5).json()
+    assert all(r["result"]["prediction_id"] is None for r in body["results"])
+    assert client.get(f"/predict/{prediction_id}/chart", params={"format": "spec"}).status_code == 200
+
+
+def test_batch_with_chart_issues_prediction_ids(client):
+    body = client.post("/predict/batch", json={"items": [ROW_A, ROW_CNS], "차트포함": True, "차트형식": "spec"}).json()
+    for r in body["results"]:
+        assert r["result"]["chart_data"] is not None
+        chart = client.get(f"/predict/{r['result']['prediction_id']}/chart", params={"format": "spec"})
+        assert chart.status_code == 200
+        assert chart.json()["chart_data"] == r["result"]["chart_data"]
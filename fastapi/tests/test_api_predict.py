@@ -0,0 +1,74 @@
+# /predict 상세 모드 결측 입력: 고속 경로(패턴별 KD-tree 보간)와 sklearn KNNImputer 경로가 같은 응답을 내는지, 차트 조회 실행기
+from __future__ import annotations
+
+import threading
+from itertools import combinations
+
+import pytest
+
+from app import settings
+
+DETAIL_VALUES = {"임신횟수": 3, "혈당": 148, "BMI": 33.6, "나이": 50}
+
+
+def _detail_payloads() -> list[dict]:
+    """입력 항목의 모든 부분집합(미입력 = 결측) + 0 입력(결측으로 처리)"""
+    payloads = []
+    names = list(DETAIL_VALUES)
+    for size in range(1, len(names) + 1):
+        for subset in combinations(names, size):
+            payloads.append({"입력모드": "detail", **{name: DETAIL_VALUES[name] for name in subset}})
+    payloads.append({"입력모드": "detail", "임신횟수": 0, "혈당": 120, "BMI": 0, "나이": 33})
+    payloads.append({"입력모드": "detail", "임신횟수": 0, "BMI": 0, "나이": 81})
+    return payloads
+
+
+def _predict_all(client, payloads: list[dict]) -> list[dict]:
+    return [client.post("/predict", json=p) for p in payloads]
+
+
+@pytest.mark.parametrize("endpoint", ["predict", "batch"])
+def test_missing_inputs_fast_path_matches_sklearn(client, monkeypatch, endpoint):
+    payloads = _detail_payloads()
+
+    def run(fast: bool) -> list:
+        monkeypatch.setattr(settings, "FAST_INFERENCE", fast)
+        if endpoint == "batch":
+            results = client.post("/predict/batch", json=payloads).json()["results"]
+            return [(r["status_code"], r["result"] and r["result"]["probability"]) for r in results]
+        responses = _predict_all(client, payloads)
+        return [(r.status_code, r.json().get("probability")) for r in responses]
+
+    fast, slow = run(True), run(False)
+    assert fast == slow
+    # 시나리오 A/B 모두 결측 행이 실제로 예측되었는지
+    assert sum(1 for status, _ in fast if status == 200) >= 8
+
+
+def test_missing_inputs_select_detail_scenarios(client):
+    used = {
+        r.json()["used_model"]
+        for r in _predict_all(client, _detail_payloads())
+        if r.status_code == 200
+    }
+    assert len(used) == 2 and all("상세" in name for name in used)
+
+
+@pytest.mark.parametrize("chart_format,field", [("svg", "chart_svg"), ("spec", "chart_data")])
+def test_chart_formats_render_on_chart_executor(client, monkeypatch, chart_format, field):
+    from app import main
+
+    threads = []
+    original = main.chart_for_prediction
+
+    def spy(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(main, "chart_for_prediction", spy)
+    prediction_id = client.post("/predict", json=DETAIL_VALUES).json()["prediction_id"]
+    response = client.get(f"/predict/{prediction_id}/chart", params={"format": chart_format})
+    assert response.status_code == 200
+    assert response.json()[field]
+    assert threads and all(name.startswith("chart-worker") for name in threads)
+    assert client.get("/predict/unknown/chart", params={"format": chart_format}).status_code == 404
@@ -0,0 +1,166 @@
+# 고속(NumPy) 추론 경로(app/fast_inference.py)가 sklearn predict_proba와 같은 확률을 내는지
+# (LR/SVC/soft voting, 상세·간편 시나리오 전체, 컴파일 번들 왕복)
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.impute import KNNImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from app.fast_inference import (
+    CompiledDetailScenario,
+    CompiledSimpleScenario,
+    bundle_arrays,
+    compile_estimator,
+    compile_scenario,
+    load_bundled_scenario,
+)
+from app.grading import grade_matrix
+from app.model_loader import FEATURE_LABELS, FEATURE_RANGES, FEATURES_DETAIL_SUGAR, FEATURES_SIMPLE_SUGAR
+
+TOL = 1e-9
+
+
+def _data(n: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rs = np.random.RandomState(seed)
+    x = rs.randn(n, 4)
+    y = (x @ [1.0, -0.5, 0.8, 0.3] + 0.7 * rs.randn(n) > 0).astype(int)
+    return x, y
+
+
+def _estimators() -> dict[str, object]:
+    return {
+        "lr": LogisticRegression(C=0.5, max_iter=1000),
+        "svc_rbf": SVC(probability=True, random_state=0),
+        "svc_linear": SVC(kernel="linear", probability=True, random_state=0),
+        "svc_poly": SVC(kernel="poly", degree=3, coef0=1.0, probability=True, random_state=0),
+        "soft_voting": VotingClassifier(
+            [
+                ("lr", LogisticRegression(max_iter=1000)),
+                ("svc", SVC(probability=True, random_state=0)),
+                ("svc_lin", SVC(kernel="linear", C=0.1, probability=True, random_state=0)),
+            ],
+            voting="soft",
+            weights=[2.0, 1.0, 0.5],
+        ),
+    }
+
+
+@pytest.mark.parametrize("name", list(_estimators()))
+def test_compiled_estimator_matches_sklearn(name):
+    x, y = _data(300, 0)
+    model = _estimators()[name].fit(x, y)
+    compiled = compile_estimator(model)
+    assert compiled is not None
+    rs = np.random.RandomState(1)
+    # 학습 분포 + 멀리 떨어진 입력(확률이 0/1 근처로 포화되는 구간)
+    xq = np.vstack([rs.randn(500, 4), rs.randn(50, 4) * 10])
+    np.testing.assert_allclose(compiled.predict_proba(xq), model.predict_proba(xq)[:, 1], rtol=0, atol=TOL)
+
+
+def test_unsupported_estimators_are_not_compiled():
+    x, y = _data(100, 2)
+    assert compile_estimator(RandomForestClassifier(n_estimators=5, random_state=0).fit(x, y)) is None
+    assert compile_estimator(SVC(probability=False).fit(x, y)) is None
+    hard = VotingClassifier([("lr", LogisticRegression()), ("svc", SVC())], voting="hard").fit(x, y)
+    assert compile_estimator(hard) is None
+
+
+def _raw_inputs(feature_names: list[str], n: int, seed: int) -> np.ndarray:
+    """FEATURE_RANGES 안의 값 + 미입력(0/NaN) + 정수 격자 값 + 범위 밖 값"""
+    rs = np.random.RandomState(seed)
+    raw = np.column_stack([rs.uniform(*FEATURE_RANGES[f], n) for f in feature_names]).round(1)
+    ints = rs.rand(*raw.shape) < 0.3
+    raw[ints] = np.round(raw[ints])
+    raw[rs.rand(*raw.shape) < 0.15] = 0.0
+    raw[rs.rand(*raw.shape) < 0.05] = np.nan
+    raw[rs.rand(*raw.shape) < 0.02] *= 3.0
+    raw[: len(feature_names) + 2] = 0.0  # 전부 미입력
+    for j in range(len(feature_names)):
+        raw[j, j] = raw[-1, j] if raw[-1, j] else 25.0  # 한 항목만 입력 (결과표 경로)
+    return raw
+
+
+def _fit_detail(feature_names: list[str], model, seed: int) -> dict:
+    """학습 스크립트와 같은 상세 전처리: 0 → NaN, IQR clip, 표준화, KNN 보간"""
+    rs = np.random.RandomState(seed)
+    cols = [FEATURE_LABELS[f] for f in feature_names]
+    raw = pd.DataFrame(
+        np.column_stack([rs.uniform(*FEATURE_RANGES[f], 400) for f in feature_names]).round(1), columns=cols
+    )
+    raw = raw.mask(rs.rand(*raw.shape) < 0.1)
+    y = (raw.fillna(raw.mean()).rank(pct=True).sum(axis=1) + rs.randn(400) * 0.5 > len(cols) / 2).astype(int)
+    clip_bounds = {}
+    for c in cols:
+        q1, q3 = raw[c].quantile([0.25, 0.75])
+        clip_bounds[c] = (float(q1 - 1.5 * (q3 - q1)), float(q3 + 1.5 * (q3 - q1)))
+        raw[c] = raw[c].clip(*clip_bounds[c])
+    scaler = StandardScaler().fit(raw)
+    imputer = KNNImputer(n_neighbors=5).fit(scaler.transform(raw))
+    model.fit(imputer.transform(scaler.transform(raw)), y)
+    return {
+        "mode": "detail",
+        "feature_names": feature_names,
+        "model": model,
+        "scaler": scaler,
+        "imputer": imputer,
+        "clip_bounds": clip_bounds,
+    }
+
+
+def _sklearn_detail(cfg: dict, raw: np.ndarray) -> np.ndarray:
+    """서버의 sklearn 경로와 같은 계산 (KNN 동률 선택이 단건 요청과 같도록 행 단위)"""
+    cols = [FEATURE_LABELS[f] for f in cfg["feature_names"]]
+    x = raw.copy()
+    x[x == 0.0] = np.nan
+    for j, c in enumerate(cols):
+        x[:, j] = np.clip(x[:, j], *cfg["clip_bounds"][c])
+    out = []
+    for row in x:
+        scaled = cfg["scaler"].transform(pd.DataFrame(row[None, :], columns=cols))
+        out.append(cfg["model"].predict_proba(cfg["imputer"].transform(scaled))[0, 1])
+    return np.array(out)
+
+
+@pytest.mark.parametrize("name", ["lr", "svc_rbf", "soft_voting"])
+def test_detail_scenario_and_bundle_match_sklearn(name):
+    cfg = _fit_detail(FEATURES_DETAIL_SUGAR, _estimators()[name], seed=3)
+    compiled = compile_scenario(cfg, name="test")
+    assert isinstance(compiled, CompiledDetailScenario)
+    raw = _raw_inputs(FEATURES_DETAIL_SUGAR, 400, seed=4)
+    expected = _sklearn_detail(cfg, raw)
+    np.testing.assert_allclose(compiled.predict_proba(raw, cached=False), expected, rtol=0, atol=TOL)
+    # 결과 캐시를 거친 두 번째 호출도 같은 값
+    compiled.predict_proba(raw)
+    np.testing.assert_allclose(compiled.predict_proba(raw), expected, rtol=0, atol=TOL)
+
+    bundled = load_bundled_scenario(bundle_arrays(compiled, "A"), "A", lambda: cfg["imputer"])
+    np.testing.assert_allclose(bundled.predict_proba(raw, cached=False), expected, rtol=0, atol=TOL)
+
+
+def test_simple_scenario_matches_sklearn():
+    cols = [FEATURE_LABELS[f] for f in FEATURES_SIMPLE_SUGAR]
+    rs = np.random.RandomState(5)
+    quantiles = {
+        c: sorted(np.quantile(rs.uniform(*FEATURE_RANGES[f], 200), [0.25, 0.5, 0.75]).round(1).tolist())
+        for f, c in zip(FEATURES_SIMPLE_SUGAR, cols)
+    }
+    q_list = [quantiles[c] for c in cols]
+    train = pd.DataFrame(rs.randint(1, 5, (300, len(cols))).astype(float), columns=cols)
+    model = _estimators()["soft_voting"].fit(train, (train.sum(axis=1) + rs.randn(300) > 10).astype(int))
+    compiled = compile_scenario(
+        {"mode": "simple", "feature_names": FEATURES_SIMPLE_SUGAR, "model": model, "quantiles": quantiles}
+    )
+    assert isinstance(compiled, CompiledSimpleScenario)
+
+    raw = _raw_inputs(FEATURES_SIMPLE_SUGAR, 300, seed=6)
+    raw[:4] = np.array(q_list).T[[0, 1, 2, 2]]  # 분위수 경계값 그대로
+    raw[4] = np.array(q_list)[:, 2] + 1e-9
+    expected = model.predict_proba(pd.DataFrame(grade_matrix(raw, q_list).astype(float), columns=cols))[:, 1]
+    np.testing.assert_allclose(compiled.predict_proba(raw), expected, rtol=0, atol=TOL)
+    bundled = load_bundled_scenario(bundle_arrays(compiled, "C"), "C", lambda: None)
+    np.testing.assert_allclose(bundled.predict_proba(raw), expected, rtol=0, atol=TOL)
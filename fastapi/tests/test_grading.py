@@ -0,0 +1,64 @@
+# 분위수 등급화(app/grading.py)가 기존 if-체인 등급과 같은지: 경계값, 중복 분위수, NaN → 4
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.grading import grade, grade_frame, grade_matrix
+
+
+def _grade_if_chain(v: float, q: list[float]) -> int:
+    """학습 노트북의 원래 등급 규칙"""
+    if v <= q[0]:
+        return 1
+    if v <= q[1]:
+        return 2
+    if v <= q[2]:
+        return 3
+    return 4
+
+
+QUANTILES = [
+    [1.0, 3.0, 6.0],
+    [99.0, 117.0, 140.25],
+    [27.3, 32.0, 36.6],
+    [2.0, 2.0, 5.0],  # 중복 분위수 (값이 몰린 컬럼)
+    [0.0, 0.0, 0.0],
+]
+
+
+@pytest.mark.parametrize("q", QUANTILES)
+def test_grade_matches_if_chain_on_boundaries_and_random(q):
+    rs = np.random.RandomState(0)
+    q_arr = np.asarray(q)
+    values = np.r_[
+        q_arr,
+        np.nextafter(q_arr, -np.inf),
+        np.nextafter(q_arr, np.inf),
+        -np.inf,
+        np.inf,
+        rs.uniform(q_arr.min() - 10, q_arr.max() + 10, 500),
+    ]
+    expected = np.array([_grade_if_chain(v, q) for v in values])
+    np.testing.assert_array_equal(grade(values, q), expected)
+
+
+def test_nan_is_grade_4():
+    assert grade([np.nan], [1.0, 2.0, 3.0]).tolist() == [4]
+    assert grade(np.full(3, np.nan), [0.0, 0.0, 0.0]).tolist() == [4, 4, 4]
+
+
+def test_grade_matrix_and_frame_match_per_column():
+    rs = np.random.RandomState(1)
+    cols = ["임신횟수", "혈당", "BMI"]
+    quantiles = dict(zip(cols, QUANTILES[:3]))
+    raw = np.column_stack([rs.choice(np.r_[q, rs.uniform(0, 200, 50)], 300) for q in quantiles.values()])
+    raw[rs.rand(*raw.shape) < 0.2] = np.nan
+    expected = np.array([[_grade_if_chain(v, quantiles[c]) for v, c in zip(row, cols)] for row in raw])
+
+    np.testing.assert_array_equal(grade_matrix(raw, list(quantiles.values())), expected)
+    frame = grade_frame(pd.DataFrame(raw, columns=cols, index=np.arange(300) * 2), quantiles)
+    assert list(frame.columns) == cols
+    assert (frame.index == np.arange(300) * 2).all()
+    np.testing.assert_array_equal(frame.to_numpy(), expected)
@@ -0,0 +1,79 @@
+# 패턴별 KD-tree 보간(app/imputation.py)이 KNNImputer와 같은 결과를 내는지: 모든 결측 패턴, 학습 데이터 결측, 동률 이웃
+from __future__ import annotations
+
+from itertools import product
+
+import numpy as np
+import pytest
+from sklearn.impute import KNNImputer
+
+from app.imputation import KNNImputeIndex, supports
+
+
+def _with_missing(x: np.ndarray, rate: float, rs: np.random.RandomState) -> np.ndarray:
+    x = x.copy()
+    x[rs.rand(*x.shape) < rate] = np.nan
+    return x
+
+
+def _all_patterns(n_features: int, rows_per_pattern: int, sample, rs) -> np.ndarray:
+    """모든 결측 패턴(전부 결측/결측 없음 포함)에 대해 rows_per_pattern 행씩"""
+    blocks = []
+    for present in product([False, True], repeat=n_features):
+        block = sample(rows_per_pattern)
+        block[:, ~np.array(present)] = np.nan
+        blocks.append(block)
+    x = np.vstack(blocks)
+    return x[rs.permutation(len(x))]
+
+
+def _rowwise(imputer: KNNImputer, x: np.ndarray) -> np.ndarray:
+    """단건 요청과 같은 기준: 행마다 KNNImputer.transform (동률 선택이 배치 구성에 좌우되지 않게)"""
+    return np.vstack([imputer.transform(row[None, :]) for row in x])
+
+
+@pytest.mark.parametrize("k", [1, 5])
+def test_continuous_data_matches_knn_imputer(k):
+    rs = np.random.RandomState(0)
+    fit_x = _with_missing(rs.randn(300, 4), 0.1, rs)
+    imputer = KNNImputer(n_neighbors=k).fit(fit_x)
+    assert supports(imputer)
+    index = KNNImputeIndex.from_imputer(imputer)
+
+    x = _all_patterns(4, 25, lambda n: rs.randn(n, 4) * 1.5, rs)
+    np.testing.assert_allclose(index.transform(x), _rowwise(imputer, x), rtol=0, atol=1e-12)
+
+
+def test_tied_neighbors_fall_back_to_knn_imputer():
+    rs = np.random.RandomState(1)
+    # 정수 격자 값: k번째 이웃 거리의 동률이 흔함
+    fit_x = _with_missing(rs.randint(0, 4, (200, 3)).astype(float), 0.15, rs)
+    imputer = KNNImputer(n_neighbors=5).fit(fit_x)
+    index = KNNImputeIndex.from_imputer(imputer)
+
+    x = _all_patterns(3, 40, lambda n: rs.randint(0, 4, (n, 3)).astype(float), rs)
+    np.testing.assert_allclose(index.transform(x), _rowwise(imputer, x), rtol=0, atol=1e-12)
+    assert index._fallback_imputer is not None, "동률 행이 생기지 않아 fallback 경로가 검증되지 않음"
+
+
+def test_precomputed_single_column_tables_match():
+    rs = np.random.RandomState(2)
+    fit_x = _with_missing(rs.randn(250, 4), 0.1, rs)
+    imputer = KNNImputer(n_neighbors=5).fit(fit_x)
+    index = KNNImputeIndex.from_imputer(imputer)
+    grid = np.round(np.linspace(-3, 3, 61), 1)
+    for col in range(4):
+        index.precompute(col, grid)
+
+    x = np.full((4 * len(grid), 4), np.nan)
+    for col in range(4):
+        x[col * len(grid) : (col + 1) * len(grid), col] = grid
+    np.testing.assert_allclose(index.transform(x), _rowwise(imputer, x), rtol=0, atol=1e-12)
+
+
+def test_unsupported_settings_are_rejected():
+    fit_x = np.random.RandomState(3).randn(20, 2)
+    assert not supports(KNNImputer(weights="distance").fit(fit_x))
+    assert not supports(KNNImputer(add_indicator=True).fit(fit_x))
+    with pytest.raises(ValueError):
+        KNNImputeIndex.from_imputer(KNNImputer(weights="distance").fit(fit_x))
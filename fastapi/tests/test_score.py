@@ -0,0 +1,67 @@
+# 일괄 예측 CLI(scripts/score.py): 입력 컬럼이 청크와 무관하게 그대로 기록되는지, 숫자가 아닌 칸이 행 오류로 남는지
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from score import INPUT_COLUMNS, MODE_COLUMN, _read_chunks, _Writer, score_chunk
+
+# 임신횟수, 혈당, BMI, 나이 순서 (INPUT_COLUMNS와 같음)
+ROWS = [
+    "2,120,33.6,50",
+    "3,300,30,40",
+    "0,85.0,26.6,31",
+    ",,28.1,21",
+    "1,abc,23.3,29",
+    "NA,89,28.1,21",
+]
+
+
+def _score_file(tmp_path, rows: list[str], chunk_size: int) -> tuple[list[str], pd.DataFrame]:
+    src, dst = tmp_path / "in.csv", tmp_path / "out.csv"
+    src.write_text("\n".join([",".join(INPUT_COLUMNS), *rows]) + "\n", encoding="utf-8")
+    writer = _Writer(dst)
+    try:
+        for chunk in _read_chunks(src, chunk_size):
+            writer.write(score_chunk(chunk, "detail"))
+    finally:
+        writer.close()
+    return dst.read_text(encoding="utf-8").splitlines(), pd.read_csv(dst, dtype={"error": str})
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 100])
+def test_input_columns_pass_through_unchanged(tmp_path, chunk_size):
+    lines, _ = _score_file(tmp_path, ROWS, chunk_size)
+    assert lines[0].startswith(",".join(INPUT_COLUMNS) + ",")
+    assert len(lines) == len(ROWS) + 1
+    for original, written in zip(ROWS, lines[1:]):
+        assert written.startswith(original + ",")
+
+
+def test_non_numeric_cell_is_row_error(tmp_path):
+    _, out = _score_file(tmp_path, ROWS, 2)
+    bad = out.iloc[4]
+    assert pd.isna(bad["scenario"]) and pd.isna(bad["prediction"])
+    assert "혈당" in bad["error"] and "'abc'" in bad["error"]
+    # 빈 칸 / NA는 미입력: 혈당이 없으면 B 시나리오로 예측
+    assert out.iloc[3]["scenario"] == "B" and pd.isna(out.iloc[3]["error"])
+    assert out.iloc[5]["scenario"] == "A" and pd.isna(out.iloc[5]["error"])
+    # 숫자인 범위 밖 값은 /predict의 400과 같은 값 검증 오류
+    assert "범위" in out.iloc[1]["error"]
+    assert list(out["error"].notna()) == [False, True, False, False, True, False]
+
+
+def test_scores_do_not_depend_on_chunking(tmp_path):
+    _, whole = _score_file(tmp_path, ROWS, 100)
+    _, split = _score_file(tmp_path, ROWS, 1)
+    pd.testing.assert_frame_equal(whole, split)
+
+
+def test_mode_column_blank_uses_default(tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text(
+        ",".join([*INPUT_COLUMNS, MODE_COLUMN]) + "\n2,120,33.6,50,\n2,120,33.6,50,simple\n", encoding="utf-8"
+    )
+    (chunk,) = _read_chunks(src, 10)
+    out = score_chunk(chunk, "detail")
+    assert list(out["scenario"]) == ["A", "C"]
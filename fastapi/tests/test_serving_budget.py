@@ -0,0 +1,49 @@
+# 증류(scripts/serving_budget.py): 학생 모델이 교사 입력 형태(DataFrame 컬럼 이름)를 따르고 교사 확률을 근사하는지
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from app.fast_inference import CompiledSimpleScenario
+from app.grading import grade_frame
+from app.model_loader import FEATURE_LABELS, FEATURES_SIMPLE_SUGAR
+from serving_budget import distill
+
+COLS = [FEATURE_LABELS[f] for f in FEATURES_SIMPLE_SUGAR]
+
+
+def _graded(n: int, seed: int) -> tuple[pd.DataFrame, np.ndarray]:
+    rs = np.random.RandomState(seed)
+    x = pd.DataFrame(rs.randint(1, 5, size=(n, len(COLS))).astype(float), columns=COLS)
+    y = (x.to_numpy() @ [0.3, 1.0, 0.6, 0.4] + rs.randn(n) > 5.5).astype(int)
+    return x, y
+
+
+def test_dataframe_student_keeps_feature_names():
+    x, y = _graded(400, 0)
+    teacher = LogisticRegression(C=0.3).fit(x, y)
+    quantiles = {c: [1.5, 2.5, 3.5] for c in COLS}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # 피처 이름 불일치 경고가 나면 실패
+        student = distill(teacher, x)
+        compiled = CompiledSimpleScenario.from_model(FEATURES_SIMPLE_SUGAR, student, quantiles)
+        student.predict_proba(grade_frame(x, quantiles))
+    assert list(student.feature_names_in_) == COLS
+    raw = x.to_numpy()
+    np.testing.assert_allclose(compiled.predict_proba(raw, cached=False), student.predict_proba(x)[:, 1], atol=1e-12)
+
+
+@pytest.mark.parametrize("as_frame", [True, False])
+def test_student_approximates_teacher(as_frame):
+    x, y = _graded(400, 1)
+    x_in = x if as_frame else x.to_numpy()
+    teacher = LogisticRegression(C=0.3).fit(x_in, y)
+    student = distill(teacher, x_in)
+    assert not as_frame or hasattr(student, "feature_names_in_")
+    # LR 교사를 LR 학생으로 증류하면 확률이 거의 같아야 함
+    gap = np.abs(student.predict_proba(x_in)[:, 1] - teacher.predict_proba(x_in)[:, 1])
+    assert gap.max() < 0.02
@@ -0,0 +1,69 @@
+# 정렬 sweep threshold 최적화(scripts/thresholds.py)가 가능한 모든 threshold 전수 탐색과 같은 최적값을 내는지
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+from thresholds import DEFAULT_BOUNDS, OBJECTIVES, optimize_threshold, threshold_curve
+
+MIN_PRECISION = 0.6
+
+
+def _score(objective: str, y: np.ndarray, pred: np.ndarray) -> float:
+    if objective == "accuracy":
+        return accuracy_score(y, pred)
+    if objective == "f1":
+        return f1_score(y, pred, zero_division=0)
+    recall = recall_score(y, pred, zero_division=0)
+    if objective == "youden":
+        return recall - float(np.mean(pred[y == 0])) if (y == 0).any() else recall
+    return recall if precision_score(y, pred, zero_division=0) >= MIN_PRECISION else np.nan
+
+
+def _brute_force(probs: np.ndarray, y: np.ndarray, objective: str, bounds) -> float:
+    """[lo, hi] 안의 threshold가 만들 수 있는 예측은 확률값 p(≥ p) 또는 바로 위(> p)에서만 바뀐다 → 양 끝과 함께 전부 평가"""
+    lo, hi = bounds
+    inside = probs[(probs >= lo) & (probs <= hi)]
+    candidates = np.r_[lo, hi, inside, np.nextafter(inside, np.inf)]
+    candidates = candidates[(candidates >= lo) & (candidates <= hi)]
+    scores = np.array([_score(objective, y, (probs >= t).astype(int)) for t in np.unique(candidates)])
+    return float(np.max(scores[~np.isnan(scores)])) if (~np.isnan(scores)).any() else np.nan
+
+
+def _cases():
+    rs = np.random.RandomState(7)
+    for n in (1, 2, 15, 200):
+        y = rs.randint(0, 2, n)
+        yield n, rs.rand(n), y  # 서로 다른 확률
+        yield n, np.round(rs.rand(n), 1), y  # 동률 그룹이 많은 확률
+        yield n, np.clip(rs.rand(n) * 0.4 + 0.3 * y, 0, 1).round(2), y  # bounds 경계에 걸친 값
+    yield 50, np.r_[np.full(25, 0.3), np.full(25, 0.7)], np.r_[np.zeros(25, int), np.ones(25, int)]
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+@pytest.mark.parametrize("bounds", [DEFAULT_BOUNDS, (0.0, 1.0), (0.45, 0.55)])
+def test_sweep_matches_brute_force(objective, bounds):
+    for _n, probs, y in _cases():
+        expected = _brute_force(probs, y, objective, bounds)
+        if np.isnan(expected):
+            with pytest.raises(ValueError):
+                optimize_threshold(probs, y, objective, MIN_PRECISION, bounds)
+            continue
+        th, score, _curve = optimize_threshold(probs, y, objective, MIN_PRECISION, bounds)
+        assert bounds[0] <= th <= bounds[1]
+        assert score == pytest.approx(expected, abs=1e-12)
+        # 고른 threshold를 그대로 적용한 예측도 같은 목표값
+        assert _score(objective, y, (probs >= th).astype(int)) == pytest.approx(score, abs=1e-12)
+
+
+def test_curve_counts_match_direct_confusion():
+    rs = np.random.RandomState(3)
+    probs = np.round(rs.rand(300), 2)
+    y = rs.randint(0, 2, 300)
+    curve = threshold_curve(probs, y)
+    for t, tp, fp in zip(curve.thresholds, curve.tp, curve.fp):
+        pred = probs >= t
+        assert tp == int((pred & (y == 1)).sum())
+        assert fp == int((pred & (y == 0)).sum())
+    assert curve.tp[-1] == curve.positives and curve.fp[-1] == curve.negatives
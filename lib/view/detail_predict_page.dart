@@ -100,7 +100,13 @@ class _DetailPredictPageState extends State<DetailPredictPage> {
     try {
       final url = '${CustomCommonUtil.getApiBaseUrlSync()}/predict';
 
-      final body = {'입력모드': 'detail', '나이': _age, 'BMI': _bmi, '임신횟수': _pregVal};
+      final body = {
+        '입력모드': 'detail',
+        '차트포함': true,
+        '나이': _age,
+        'BMI': _bmi,
+        '임신횟수': _pregVal,
+      };
 
       if (_sugarCtrl.text.trim().isNotEmpty) {
         body['혈당'] = int.parse(_sugarCtrl.text.trim());
@@ -77,6 +77,7 @@ class _SimplePredictPageState extends State<SimplePredictPage> {
 
       final body = {
         '입력모드': 'simple',
+        '차트포함': true,
         '나이': _age,
         'BMI': _bmi,
         '임신횟수': (pregRange.$1 + pregRange.$2) / 2.0,